@@ -11,7 +11,19 @@ from flask_cors import CORS
 from app.utils.logger import setup_logger
 from app.utils.error_handler import register_error_handlers
 from app.utils.db_init import init_db_indexes
+from app.services.write_queue import init_write_queue
 from app.helpers.request_logger import setup_request_logging
+from app.helpers.compression import setup_response_compression
+from app.helpers.upload_limits import setup_upload_limits
+from app.services.version_service import init_versioning
+from app.services.event_stream import init_event_hub
+from app.services.query_cache import init_query_cache
+from app.services.user_cache import init_user_cache
+from app.services.password_hasher import init_password_hasher
+from app.services.safe_browsing import init_safe_browsing
+from app.services.rate_limiter import init_rate_limiter
+from app.services.token_revocation import init_token_revocation
+from app.services.dedup_service import init_duplicate_index
 
 def create_app():
 
@@ -29,7 +41,11 @@ def create_app():
     # ✅ Setup Logging, Middleware & Error Handling
     setup_logger(app)
     setup_request_logging(app)
+    setup_response_compression(app)
+    setup_upload_limits(app)
     register_error_handlers(app)
+    init_password_hasher(app)
+    init_safe_browsing(app)
     
     app.register_blueprint(admin_bp, url_prefix="/api/admin")
 
@@ -51,6 +67,26 @@ def create_app():
         # ✅ Initialize Indexes
         init_db_indexes(app.db, app.logger)
 
+        # ✅ Background writer for audit/timeline entries
+        init_write_queue(app)
+
+        # ✅ Write version counters (ETags, cache invalidation)
+        init_versioning(app)
+        init_query_cache(app)
+        init_user_cache(app)
+
+        # ✅ Token-bucket rate limits for expensive endpoints
+        init_rate_limiter(app)
+
+        # ✅ Revoked JWTs (logout), checked in memory on every request
+        init_token_revocation(app)
+
+        # ✅ Near-duplicate report index (MinHash LSH bands in memory)
+        init_duplicate_index(app)
+
+        # ✅ Live incident events (change stream or in-process fallback)
+        init_event_hub(app)
+
         app.logger.info("MongoDB CONNECTED SUCCESSFULLY")
 
     except Exception as e:
@@ -7,6 +7,88 @@ class Config:
     MONGO_URI = os.getenv("MONGO_URI")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 
+    # Analyst work queue claim lease
+    WORK_QUEUE_LEASE_SECONDS = int(os.getenv("WORK_QUEUE_LEASE_SECONDS", 900))
+
+    # Write version counter sync interval across workers
+    VERSION_SYNC_SECONDS = float(os.getenv("VERSION_SYNC_SECONDS", 1.0))
+
+    # Admin read query cache (entries also drop on write version bumps)
+    QUERY_CACHE_TTL_SECONDS = int(os.getenv("QUERY_CACHE_TTL_SECONDS", 30))
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", 512))
+
+    # Auth user lookup cache
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+
+    # Password hashing pool (requests past MAX_PENDING get 503 + Retry-After)
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+    PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", 1))
+
+    # Token-bucket rate limits ("memory" per worker, or "mongo" shared)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "memory")
+
+    # Revoked-token list refresh interval across workers
+    REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", 2.0))
+
+    # Near-duplicate reports (MinHash LSH) reuse their canonical's analysis
+    DUPLICATE_SIMILARITY = float(os.getenv("DUPLICATE_SIMILARITY", 0.85))
+    # Canonicals held in memory per worker: the newest of the last N days, at most SIZE
+    DUPLICATE_INDEX_SIZE = int(os.getenv("DUPLICATE_INDEX_SIZE", 50000))
+    DUPLICATE_INDEX_DAYS = int(os.getenv("DUPLICATE_INDEX_DAYS", 30))
+    DUPLICATE_SYNC_SECONDS = float(os.getenv("DUPLICATE_SYNC_SECONDS", 5.0))
+
+    # Scam campaign clustering (scripts/cluster_campaigns.py)
+    CAMPAIGN_SIMILARITY = float(os.getenv("CAMPAIGN_SIMILARITY", 0.6))
+    CAMPAIGN_ACTIVE_DAYS = int(os.getenv("CAMPAIGN_ACTIVE_DAYS", 90))
+    CAMPAIGN_BATCH_SIZE = int(os.getenv("CAMPAIGN_BATCH_SIZE", 1000))
+    # Newest incidents the campaign vocabulary is fitted on
+    CAMPAIGN_VOCABULARY_SAMPLE = int(os.getenv("CAMPAIGN_VOCABULARY_SAMPLE", 20000))
+
+    # Report analysis deadline (slow stages are skipped or cut short)
+    REPORT_DEADLINE_MS = int(os.getenv("REPORT_DEADLINE_MS", 8000))
+
+    # Safe Browsing URL reputation (circuit breaker opens after FAILURE_THRESHOLD
+    # consecutive failures and probes again after RESET_SECONDS)
+    SAFE_BROWSING_API_KEY = os.getenv("SAFE_BROWSING_API_KEY")
+    SAFE_BROWSING_URL = os.getenv("SAFE_BROWSING_URL", "https://safebrowsing.googleapis.com/v4/threatMatches:find")
+    SAFE_BROWSING_TIMEOUT_SECONDS = float(os.getenv("SAFE_BROWSING_TIMEOUT_SECONDS", 2.0))
+    SAFE_BROWSING_MAX_CONCURRENCY = int(os.getenv("SAFE_BROWSING_MAX_CONCURRENCY", 8))
+    SAFE_BROWSING_RETRIES = int(os.getenv("SAFE_BROWSING_RETRIES", 1))
+    SAFE_BROWSING_FAILURE_THRESHOLD = int(os.getenv("SAFE_BROWSING_FAILURE_THRESHOLD", 5))
+    SAFE_BROWSING_RESET_SECONDS = float(os.getenv("SAFE_BROWSING_RESET_SECONDS", 30.0))
+
+    # OCR: tall screenshots are read as overlapping strips on OCR_WORKERS threads
+    OCR_TILING = os.getenv("OCR_TILING", "true").lower() == "true"
+    OCR_TILE_HEIGHT = int(os.getenv("OCR_TILE_HEIGHT", 1600))
+    OCR_TILE_OVERLAP = int(os.getenv("OCR_TILE_OVERLAP", 120))
+    OCR_WORKERS = int(os.getenv("OCR_WORKERS", 0)) or None
+    # "auto" (pooled tesserocr engines when installed), "tesserocr" or "subprocess"
+    OCR_BACKEND = os.getenv("OCR_BACKEND", "auto")
+    # Images with more pixels are not decoded (decompression bombs, huge scans)
+    OCR_MAX_IMAGE_PIXELS = int(os.getenv("OCR_MAX_IMAGE_PIXELS", 32_000_000))
+    # Pixels OCR'd per report; later images are skipped
+    OCR_MAX_REPORT_PIXELS = int(os.getenv("OCR_MAX_REPORT_PIXELS", 64_000_000))
+
+    # Uploads: request and per-file caps enforced while the body is read;
+    # files spill from memory to a temporary file above UPLOAD_SPOOL_KB
+    MAX_CONTENT_LENGTH = int(os.getenv("UPLOAD_MAX_REQUEST_MB", 40)) * 1024 * 1024
+    UPLOAD_MAX_FILE_MB = int(os.getenv("UPLOAD_MAX_FILE_MB", 10))
+    UPLOAD_MAX_FILES = int(os.getenv("UPLOAD_MAX_FILES", 10))
+    UPLOAD_SPOOL_KB = int(os.getenv("UPLOAD_SPOOL_KB", 512))
+
+    # Server-sent events keepalive interval
+    SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+    # Open streams per worker; each holds a thread/greenlet until the client leaves
+    SSE_MAX_STREAMS = int(os.getenv("SSE_MAX_STREAMS", 32))
+
+    # Closed-incident archival
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 90))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+    ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", 0.5))
+
     if not MONGO_URI:
         raise ValueError("❌ MONGO_URI is not set in the .env file")
 
@@ -16,6 +16,7 @@ class AuditEvents:
     REVIEW_COMPLETED = "REVIEW_COMPLETED"
     STATUS_CHANGED = "STATUS_CHANGED"
     REVIEW_MODIFIED = "REVIEW_MODIFIED"
+    INCIDENT_CLAIMED = "INCIDENT_CLAIMED"
 
     # Admin
     USER_VIEWED = "USER_VIEWED"
@@ -16,3 +16,4 @@ class AuthMessages:
     USERNAME_REQUIRED = "Username is required"
     PASSWORD_REQUIRED = "Password is required"
     INVALID_ROLE = "Invalid role provided"
+    TRY_AGAIN_LATER = "Server busy, try again shortly"
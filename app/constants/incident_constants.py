@@ -36,6 +36,41 @@ class AdminMessages:
     STATUS_UPDATED = "Status updated"
     INCIDENT_CREATED = "Incident created"
     INCIDENT_DELETED = "Incident deleted"
+    INVALID_STATUS = "Invalid status"
+    INVALID_TRANSITION = "Transition not allowed from current status"
+    STALE_TRANSITION = "Incident was modified by someone else, reload and retry"
+    QUEUE_EMPTY = "No incidents waiting in the queue"
+    LEASE_LOST = "Claim expired or held by another analyst"
+    LEASE_RELEASED = "Incident returned to the queue"
+    SEARCH_QUERY_REQUIRED = "Search query (q) required"
+    INVALID_DATE = "Invalid date, use YYYY-MM-DD"
+    TOO_MANY_STREAMS = "Too many open event streams on this server, retry shortly"
+    INVALID_VERSION = "version / If-Match must be an incident version (its ETag)"
+    INVALID_PAGINATION = "page and limit must be positive integers"
+    INVALID_IOC = "No indicator (URL, domain, phone, email, UPI ID, IP or hash) found in value"
+
+class IncidentStatus:
+    OPEN = "open"
+    UNDER_REVIEW = "under_review"
+    RESOLVED = "resolved"
+    CLOSED = "closed"
+
+# Workflow state machine: status -> statuses it may move to
+WORKFLOW_TRANSITIONS = {
+    IncidentStatus.OPEN: [IncidentStatus.UNDER_REVIEW, IncidentStatus.RESOLVED, IncidentStatus.CLOSED],
+    IncidentStatus.UNDER_REVIEW: [IncidentStatus.OPEN, IncidentStatus.RESOLVED, IncidentStatus.CLOSED],
+    IncidentStatus.RESOLVED: [IncidentStatus.UNDER_REVIEW, IncidentStatus.CLOSED],
+    IncidentStatus.CLOSED: [IncidentStatus.UNDER_REVIEW]
+}
+
+# Statuses written before the state machine existed -> workflow status
+LEGACY_STATUSES = {
+    "pending": IncidentStatus.OPEN,
+    "new": IncidentStatus.OPEN,
+    "in_progress": IncidentStatus.UNDER_REVIEW,
+    "escalated": IncidentStatus.UNDER_REVIEW,
+    "reviewed": IncidentStatus.RESOLVED
+}
 
 PLAYBOOK = {
     "Malicious Link": {
@@ -108,6 +143,38 @@ PLAYBOOK = {
     }
 }
 
+# Incidents store {"key": <threat type>, "v": PLAYBOOK_VERSION}; text is expanded at read time
+PLAYBOOK_VERSION = 1
+PLAYBOOK_VERSIONS = {
+    1: PLAYBOOK
+}
+
+class RiskReasons:
+    """Compact risk reason codes stored on incidents as "code" or "code:param"."""
+    HIGH_KEYWORD = "kh"
+    MEDIUM_KEYWORD = "km"
+    LOW_KEYWORD = "kl"
+    URL_DETECTED = "url"
+    MALICIOUS_URL = "murl"
+    EVIDENCE = "ev"
+    FEAR_TONE = "sfear"
+    URGENCY_TONE = "surg"
+    STAGE_SKIPPED = "sk"
+    STAGE_DEGRADED = "dg"
+
+RISK_REASON_TEXT = {
+    RiskReasons.HIGH_KEYWORD: "high risk keyword: {}",
+    RiskReasons.MEDIUM_KEYWORD: "medium risk keyword: {}",
+    RiskReasons.LOW_KEYWORD: "low risk indicator: {}",
+    RiskReasons.URL_DETECTED: "URL detected",
+    RiskReasons.MALICIOUS_URL: "malicious URL identified: {}",
+    RiskReasons.EVIDENCE: "evidence provided",
+    RiskReasons.FEAR_TONE: "strong negative / fear tone detected",
+    RiskReasons.URGENCY_TONE: "mild urgency tone detected",
+    RiskReasons.STAGE_SKIPPED: "analysis skipped to meet the report deadline: {}",
+    RiskReasons.STAGE_DEGRADED: "analysis cut short by the report deadline: {}"
+}
+
 class ThreatTypes:
     PHISHING = "Phishing"
     MALWARE = "Malware"
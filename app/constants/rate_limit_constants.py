@@ -0,0 +1,21 @@
+class RateLimitMessages:
+    TOO_MANY_REQUESTS = "Too many requests, slow down"
+
+
+class RateLimits:
+    """
+    Token buckets per route: (capacity, tokens refilled per second).
+    Each route is limited per client IP and per identity.
+    """
+    REPORT = "report"
+    LOGIN = "login"
+    INCIDENTS_ALL = "incidents_all"
+
+    BUCKETS = {
+        REPORT: (20, 20 / 60),          # bursts of 20 cost units, 20 per minute
+        LOGIN: (10, 10 / 60),           # 10 attempts, then one every 6s
+        INCIDENTS_ALL: (5, 1 / 30),     # full dumps: 5, then one every 30s
+    }
+
+    # Extra cost of each image uploaded with a report (OCR)
+    REPORT_IMAGE_COST = 4
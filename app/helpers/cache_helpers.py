@@ -0,0 +1,40 @@
+from functools import wraps
+from flask import request, current_app, make_response, Response
+from flask_jwt_extended import get_jwt
+from app.services.version_service import current_versions
+from app.utils.json_encoder import wants_ndjson
+
+
+def _cache_key():
+    params = tuple(sorted((k, v) for k, values in request.args.lists() for v in values))
+    # Same query, different body: JSON array or NDJSON (negotiated via Accept)
+    return (request.endpoint, params, get_jwt().get("role"), wants_ndjson())
+
+
+def _is_ok(value):
+    return value[1] == 200
+
+
+def cached_query(*scopes, ttl=None):
+    """
+    Decorator caching a GET handler's 200 response in the app query cache,
+    invalidated when any of `scopes` is bumped. Use after @role_required.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = getattr(current_app, "query_cache", None)
+            versions = current_versions(*scopes)
+            if cache is None or versions is None:
+                return fn(*args, **kwargs)
+
+            def compute():
+                response = make_response(fn(*args, **kwargs))
+                return (response.get_data(), response.status_code, response.mimetype)
+
+            body, status, mimetype = cache.get_or_compute(_cache_key(), versions, compute, ttl, store_if=_is_ok)
+            response = Response(body, status=status, mimetype=mimetype)
+            response.vary.add("Accept")
+            return response
+        return wrapper
+    return decorator
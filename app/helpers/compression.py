@@ -0,0 +1,70 @@
+import gzip
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ("application/json", "application/x-ndjson")
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _stream_compressed(chunks, encoding):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=4)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def setup_response_compression(app, min_size=1024):
+    """
+    Registers an after_request hook that gzip/brotli-compresses large JSON
+    bodies (streamed bodies are compressed chunk by chunk).
+    """
+
+    @app.after_request
+    def compress_response(response):
+        if response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        if "Content-Encoding" in response.headers:
+            return response
+
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _stream_compressed(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < min_size:
+                return response
+            if encoding == "br":
+                response.set_data(brotli.compress(body, quality=5))
+            else:
+                response.set_data(gzip.compress(body, compresslevel=6))
+
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
@@ -0,0 +1,51 @@
+import math
+from functools import wraps
+from flask import request, jsonify, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from app.constants.rate_limit_constants import RateLimitMessages
+
+
+def jwt_subject():
+    """Identity of the JWT on the request, if any."""
+    verify_jwt_in_request(optional=True)
+    return get_jwt_identity()
+
+
+def spend_rate_limit(name, cost=1, identity=jwt_subject):
+    """
+    Spend `cost` tokens from the `name` bucket of both the client IP and the
+    request identity. Returns a 429 response with Retry-After when either
+    bucket is empty, else None.
+    """
+    limiter = getattr(current_app, "rate_limiter", None)
+    if limiter is None or cost <= 0:
+        return None
+
+    subjects = [f"ip:{request.remote_addr}"]
+    subject = identity() if identity else None
+    if subject:
+        subjects.append(f"id:{subject}")
+
+    allowed, retry_after = limiter.check(name, subjects, cost)
+    if allowed:
+        return None
+    response = jsonify({"msg": RateLimitMessages.TOO_MANY_REQUESTS})
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response, 429
+
+
+def rate_limit(name, cost=1, identity=jwt_subject):
+    """
+    Decorator spending `cost` tokens from the `name` bucket before the handler
+    runs (see spend_rate_limit). The cost must not depend on the request body:
+    the decorator runs before it is parsed.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            refused = spend_rate_limit(name, cost, identity)
+            if refused:
+                return refused
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,56 @@
+from tempfile import SpooledTemporaryFile
+from flask import Request, current_app
+from PIL import Image
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# Non-file form fields (narrative, IOCs, ...) are always held in memory
+MAX_FORM_MEMORY_BYTES = 1024 * 1024
+
+
+class CappedSpooledFile(SpooledTemporaryFile):
+    """Upload buffer: in memory up to `max_size`, then on disk; fails past `max_bytes`."""
+
+    def __init__(self, max_size, max_bytes, filename=None):
+        super().__init__(max_size=max_size)
+        self.max_bytes = max_bytes
+        self.filename = filename
+        self.written = 0
+
+    def write(self, data):
+        self.written += len(data)
+        if self.max_bytes and self.written > self.max_bytes:
+            self.close()
+            raise RequestEntityTooLarge(
+                f"File '{self.filename}' exceeds the {self.max_bytes // (1024 * 1024)} MB upload limit"
+            )
+        return super().write(data)
+
+
+class UploadLimitedRequest(Request):
+    """
+    Multipart files are streamed into per-file spool buffers while the body is
+    read, so an oversized file or request, or one file too many, is rejected
+    (413) before it is held in memory. The whole body is capped by
+    MAX_CONTENT_LENGTH and the number of files by UPLOAD_MAX_FILES.
+    """
+    max_form_memory_size = MAX_FORM_MEMORY_BYTES
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        max_files = config.get("UPLOAD_MAX_FILES", 10)
+        self._file_count = getattr(self, "_file_count", 0) + 1
+        if max_files and self._file_count > max_files:
+            raise RequestEntityTooLarge(f"At most {max_files} files can be uploaded at once")
+        return CappedSpooledFile(
+            max_size=config.get("UPLOAD_SPOOL_KB", 512) * 1024,
+            max_bytes=config.get("UPLOAD_MAX_FILE_MB", 10) * 1024 * 1024,
+            filename=filename
+        )
+
+
+def setup_upload_limits(app):
+    """Stream uploads under size caps and bound what Pillow will decode."""
+    app.request_class = UploadLimitedRequest
+
+    # Pillow refuses to open images over twice this many pixels anywhere in the app
+    Image.MAX_IMAGE_PIXELS = app.config.get("OCR_MAX_IMAGE_PIXELS", Image.MAX_IMAGE_PIXELS)
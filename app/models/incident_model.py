@@ -17,6 +17,12 @@ class IncidentModel:
     - threat_type: Classified threat type
     - evidence_hash: SHA256 integrity hash
     - evidence_hash_md5: MD5 integrity hash (hybrid verification)
-    - status: open | in_progress | closed
+    - status: open | under_review | resolved | closed (see WORKFLOW_TRANSITIONS)
+
+    History is not embedded; see TimelineModel.
     """
     COLLECTION = "incidents"
+
+    # Legacy documents may still carry an embedded `history` array;
+    # `ocr_terms` only feeds the search index
+    READ_PROJECTION = {"history": 0, "ocr_terms": 0}
@@ -0,0 +1,14 @@
+"""
+Incident Timeline Model Definition
+"""
+
+class TimelineModel:
+    """
+    Schema for a timeline bucket document in MongoDB
+    - incident_id: ObjectId of the owning incident
+    - events: List of {action, by, time} (at most TIMELINE_BUCKET_SIZE)
+    - count: Number of events in the bucket
+    - start: Time of the first event in the bucket
+    - end: Time of the last event in the bucket
+    """
+    COLLECTION = "incident_timeline"
@@ -1,72 +1,127 @@
-from flask import Blueprint, request, jsonify, current_app
+import queue
+from flask import Blueprint, request, jsonify, current_app, Response, abort
 from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from bson.objectid import ObjectId
-from datetime import datetime
-from bson.json_util import dumps
-from app.constants.incident_constants import AdminMessages
+from datetime import datetime, timedelta
+from app.utils.json_encoder import json_response, stream_documents, to_json
+from app.constants.incident_constants import AdminMessages, IncidentStatus
 from app.constants.auth_constants import AuthRoles
 from app.utils.security import generate_evidence_hashes, build_evidence_string
 from app.helpers.rbac_helpers import role_required
-from app.services.audit_service import log_activity, get_audit_logs
+from app.services.audit_service import log_activity, enqueue_activity, get_audit_logs
 from app.constants.audit_constants import AuditEvents
 from app.services.monitoring_service import get_system_metrics
+from app.services.timeline_service import get_timeline, insert_incident_with_event
+from app.services.workflow_service import apply_transition, cascade_review
+from app.services.work_queue_service import claim_next, renew_lease, release_lease, queue_fields
+from app.models.incident_model import IncidentModel
+from app.services.incident_codec import expand_incident
+from app.services.archive_service import find_incident
+from app.services.version_service import VersionScopes, bump_versions
+from app.helpers.conditional_helpers import conditional_get
+from app.helpers.cache_helpers import cached_query
+from app.helpers.rate_limit_helpers import rate_limit
+from app.constants.rate_limit_constants import RateLimits
+from app.services.event_stream import publish_incident_event, EventTypes, HubFull
+from app.services.search_service import search_incidents
+from app.services.ioc_extractor import extract_iocs
+from app.services.ioc_service import index_incident_iocs, remove_incident_iocs, lookup_ioc, shared_ioc_counts
+from app.services.campaign_service import top_campaigns
 
 admin_bp = Blueprint("admin", __name__)
 
+MAX_PAGE_LIMIT = 200
 
-#🧾 HISTORY LOGGER (Incident Internal Timeline)
-def add_history(incident_id, action, actor):
-    db = current_app.db
-    db.incidents.update_one(
-        {"_id": ObjectId(incident_id)},
-        {"$push": {
-            "history": {
-                "action": action,
-                "by": actor,
-                "time": datetime.utcnow()
-            }
-        }}
-    )
+
+def _pagination(default_limit):
+    """(page, limit) from the query string, or None when either is not a positive integer."""
+    try:
+        page = int(request.args.get("page", 1))
+        limit = int(request.args.get("limit", default_limit))
+    except ValueError:
+        return None
+    if page < 1 or limit < 1:
+        return None
+    return page, min(limit, MAX_PAGE_LIMIT)
 
 
 #🚨 INCIDENTS PENDING REVIEW
 @admin_bp.route("/incidents/pending", methods=["GET"])
 @jwt_required()
 @role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+@conditional_get(VersionScopes.INCIDENTS)
 def get_pending_incidents():
 
     db = current_app.db
+    # Duplicates are reviewed through their canonical incident
     incidents = db.incidents.find(
-        {"analyst_reviewed": False}
+        {"analyst_reviewed": False, "canonical_incident_id": {"$exists": False}},
+        IncidentModel.READ_PROJECTION
     ).sort("created_at", -1)
 
-    return dumps(incidents), 200
+    return stream_documents(incidents, transform=expand_incident)
 
 
 # 🚨 HIGH-RISK ALERT QUEUE
 @admin_bp.route("/incidents/high-risk", methods=["GET"])
 @jwt_required()
 @role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+@conditional_get(VersionScopes.INCIDENTS)
+@cached_query(VersionScopes.INCIDENTS)
 def get_high_risk_incidents():
 
     db = current_app.db
     incidents = db.incidents.find({
         "risk_level": "HIGH",
-        "analyst_reviewed": False
-    }).sort("created_at", -1)
+        "analyst_reviewed": False,
+        "canonical_incident_id": {"$exists": False}
+    }, IncidentModel.READ_PROJECTION).sort("created_at", -1)
 
-    return dumps(incidents), 200
+    return stream_documents(incidents, transform=expand_incident)
 
 
 #  📄 VIEW ALL INCIDENTS (ADMIN/ANALYST DASHBOARD)
 @admin_bp.route("/incidents/all", methods=["GET"])
 @jwt_required()
 @role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+@rate_limit(RateLimits.INCIDENTS_ALL)
 def get_all_incidents():
 
     db = current_app.db
-    incidents = db.incidents.find().sort("created_at", -1)
-    return dumps(incidents), 200
+    incidents = db.incidents.find({}, IncidentModel.READ_PROJECTION).sort("created_at", -1)
+    return stream_documents(incidents, transform=expand_incident)
+
+
+# 🔎 FULL-TEXT INCIDENT SEARCH
+@admin_bp.route("/incidents/search", methods=["GET"])
+@jwt_required()
+@role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+def search_incident_reports():
+
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"msg": AdminMessages.SEARCH_QUERY_REQUIRED}), 400
+
+    try:
+        date_from = request.args.get("from")
+        date_to = request.args.get("to")
+        date_from = datetime.strptime(date_from, "%Y-%m-%d") if date_from else None
+        # `to` is inclusive
+        date_to = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1) if date_to else None
+    except ValueError:
+        return jsonify({"msg": AdminMessages.INVALID_DATE}), 400
+
+    result = search_incidents(
+        current_app.db,
+        q,
+        page=request.args.get("page", 1, type=int),
+        limit=request.args.get("limit", 20, type=int),
+        risk_level=request.args.get("risk_level"),
+        status=request.args.get("status"),
+        date_from=date_from,
+        date_to=date_to
+    )
+    return json_response(result)
 
 
 # 📄 SINGLE INCIDENT DETAILS
@@ -77,14 +132,67 @@ def get_incident_detail(incident_id):
 
     db = current_app.db
     try:
-        incident = db.incidents.find_one({"_id": ObjectId(incident_id)})
+        incident = find_incident(db, ObjectId(incident_id))
     except:
         return jsonify({"msg": AdminMessages.INVALID_ID}), 400
 
     if not incident:
         return jsonify({"msg": AdminMessages.NOT_FOUND}), 404
 
-    return dumps(incident), 200
+    incident["shared_iocs"] = shared_ioc_counts(db, incident)
+    response = json_response(expand_incident(incident))
+    # Echo as If-Match on a transition to make it conditional on this version
+    response.set_etag(str(incident.get("version", 0)))
+    return response
+
+
+# 🧷 WHICH REPORTS MENTION THIS INDICATOR
+@admin_bp.route("/iocs/lookup", methods=["GET"])
+@jwt_required()
+@role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+def lookup_indicator():
+
+    iocs = extract_iocs(request.args.get("value", ""))
+    if not iocs:
+        return jsonify({"msg": AdminMessages.INVALID_IOC}), 400
+
+    db = current_app.db
+    results = []
+    for ioc in iocs:
+        result = lookup_ioc(db, ioc["key"])
+        result.update(type=ioc["type"], value=ioc["value"])
+        results.append(result)
+
+    return json_response({"iocs": results})
+
+
+def _expected_version(data):
+    """
+    Optimistic-concurrency version sent by the client: `version` in the body,
+    or If-Match echoing the incident's ETag ("3", W/"3" or a bare 3).
+    """
+    if "version" in data:
+        try:
+            return int(data["version"])
+        except (TypeError, ValueError):
+            abort(400, description=AdminMessages.INVALID_VERSION)
+
+    header = request.headers.get("If-Match")
+    if header is None or request.if_match.star_tag:
+        return None
+    for tag in request.if_match.as_set(include_weak=True):
+        if tag.isdigit():
+            return int(tag)
+    # Not an incident version tag (e.g. a list ETag): the precondition cannot hold
+    abort(412, description=AdminMessages.INVALID_VERSION)
+
+
+def _versioned(result, status_code):
+    """Transition response carrying the new version as the incident ETag."""
+    response = jsonify(result)
+    if "version" in result:
+        response.set_etag(str(result["version"]))
+    return response, status_code
 
 
 #▶ START REVIEW
@@ -93,26 +201,29 @@ def get_incident_detail(incident_id):
 @role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
 def start_review(incident_id):
 
+    data = request.get_json(silent=True) or {}
     actor = get_jwt_identity()
-    db = current_app.db
-    db.incidents.update_one(
-        {"_id": ObjectId(incident_id)},
-        {"$set": {
-            "status": "under_review",
-            "review_started_at": datetime.utcnow()
-        }}
-    )
 
-    add_history(incident_id, "Review started", actor)
-    
-    log_activity(
-        actor=actor,
-        event_type=AuditEvents.REVIEW_STARTED,
-        details={"incident_id": incident_id},
+    try:
+        incident_oid = ObjectId(incident_id)
+    except:
+        return jsonify({"msg": AdminMessages.INVALID_ID}), 400
+
+    result, status_code = apply_transition(
+        incident_oid,
+        IncidentStatus.UNDER_REVIEW,
+        actor,
+        action="Review started",
+        audit_event=AuditEvents.REVIEW_STARTED,
+        fields={"review_started_at": datetime.utcnow()},
+        expected_version=_expected_version(data),
         role=get_jwt().get("role")
     )
 
-    return jsonify({"msg": AdminMessages.REVIEW_STARTED}), 200
+    if status_code != 200:
+        return jsonify(result), status_code
+
+    return _versioned({"msg": AdminMessages.REVIEW_STARTED, **result}, 200)
 
 
 
@@ -124,10 +235,10 @@ def review_incident(incident_id):
 
     data = request.json
     analyst = get_jwt_identity()
+    status = data.get("status", IncidentStatus.RESOLVED)
 
     update_fields = {
         "analyst_reviewed": True,
-        "status": data.get("status", "resolved"),
         "analyst_name": analyst,
         "reviewed_at": datetime.utcnow(),
         "threat_type": data.get("threat_type"),
@@ -141,32 +252,30 @@ def review_incident(incident_id):
     if "risk_score" in data:
         update_fields["risk_score"] = data["risk_score"]
 
-    db = current_app.db
     try:
-        result = db.incidents.update_one(
-            {"_id": ObjectId(incident_id)},
-            {"$set": update_fields}
-        )
+        incident_oid = ObjectId(incident_id)
     except:
         return jsonify({"msg": "Invalid ID"}), 400
 
-    if result.matched_count == 0:
-        return jsonify({"msg": "Incident not found"}), 404
+    result, status_code = apply_transition(
+        incident_oid,
+        status,
+        analyst,
+        action="Incident reviewed and verified",
+        audit_event=AuditEvents.REVIEW_COMPLETED,
+        fields=update_fields,
+        expected_version=_expected_version(data),
+        role=get_jwt().get("role"),
+        audit_details={"status": status, "threat_type": update_fields["threat_type"]}
+    )
 
-    add_history(incident_id, "Incident reviewed and verified", analyst)
+    if status_code != 200:
+        return jsonify(result), status_code
 
-    log_activity(
-        actor=analyst,
-        event_type=AuditEvents.REVIEW_COMPLETED,
-        details={
-            "incident_id": incident_id,
-            "status": update_fields["status"],
-            "threat_type": update_fields["threat_type"]
-        },
-        role=get_jwt().get("role")
-    )
+    # ♻️ Same verdict for every duplicate of this report
+    result["duplicates_reviewed"] = cascade_review(incident_oid, status, update_fields, analyst)
 
-    return jsonify({"msg": AdminMessages.REVIEW_SUCCESS}), 200
+    return _versioned({"msg": AdminMessages.REVIEW_SUCCESS, **result}, 200)
 
 
 #🔄 UPDATE STATUS
@@ -175,31 +284,84 @@ def review_incident(incident_id):
 @role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
 def update_incident_status(incident_id):
 
-    status = request.json.get("status")
+    data = request.json
+    status = data.get("status")
     actor = get_jwt_identity()
 
     if not status:
         return jsonify({"msg": "Status required"}), 400
 
-    db = current_app.db
-    db.incidents.update_one(
-        {"_id": ObjectId(incident_id)},
-        {"$set": {
-            "status": status,
-            "updated_at": datetime.utcnow()
-        }}
+    try:
+        incident_oid = ObjectId(incident_id)
+    except:
+        return jsonify({"msg": AdminMessages.INVALID_ID}), 400
+
+    result, status_code = apply_transition(
+        incident_oid,
+        status,
+        actor,
+        action=f"Status changed to {status}",
+        audit_event=AuditEvents.STATUS_CHANGED,
+        expected_version=_expected_version(data),
+        role=get_jwt().get("role"),
+        audit_details={"new_status": status}
     )
 
-    add_history(incident_id, f"Status changed to {status}", actor)
+    if status_code != 200:
+        return jsonify(result), status_code
+
+    return _versioned({"msg": AdminMessages.STATUS_UPDATED, **result}, 200)
 
-    log_activity(
-        actor=actor,
-        event_type=AuditEvents.STATUS_CHANGED,
-        details={"incident_id": incident_id, "new_status": status},
-        role=get_jwt().get("role")
-    )
 
-    return jsonify({"msg": AdminMessages.STATUS_UPDATED}), 200
+#📥 CLAIM NEXT INCIDENT FROM THE WORK QUEUE
+@admin_bp.route("/queue/claim", methods=["POST"])
+@jwt_required()
+@role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+def claim_incident():
+
+    actor = get_jwt_identity()
+    result, status_code = claim_next(actor)
+    expand_incident(result.get("incident"))
+
+    if result.get("incident"):
+        enqueue_activity(
+            actor=actor,
+            event_type=AuditEvents.INCIDENT_CLAIMED,
+            details={"incident_id": str(result["incident"]["_id"])},
+            role=get_jwt().get("role")
+        )
+
+    return json_response(result, status_code)
+
+
+#⏳ RENEW CLAIM LEASE
+@admin_bp.route("/queue/<incident_id>/renew", methods=["PUT"])
+@jwt_required()
+@role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+def renew_claim(incident_id):
+
+    try:
+        incident_oid = ObjectId(incident_id)
+    except:
+        return jsonify({"msg": AdminMessages.INVALID_ID}), 400
+
+    result, status_code = renew_lease(incident_oid, get_jwt_identity())
+    return json_response(result, status_code)
+
+
+#↩ RELEASE CLAIM
+@admin_bp.route("/queue/<incident_id>/release", methods=["PUT"])
+@jwt_required()
+@role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+def release_claim(incident_id):
+
+    try:
+        incident_oid = ObjectId(incident_id)
+    except:
+        return jsonify({"msg": AdminMessages.INVALID_ID}), 400
+
+    result, status_code = release_lease(incident_oid, get_jwt_identity())
+    return jsonify(result), status_code
 
 
 #🧾 VIEW INCIDENT HISTORY
@@ -208,16 +370,23 @@ def update_incident_status(incident_id):
 @role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
 def get_history(incident_id):
 
+    pagination = _pagination(50)
+    if pagination is None:
+        return jsonify({"msg": AdminMessages.INVALID_PAGINATION}), 400
+    page, limit = pagination
+
     db = current_app.db
-    incident = db.incidents.find_one(
-        {"_id": ObjectId(incident_id)},
-        {"history": 1}
-    )
+    try:
+        incident_oid = ObjectId(incident_id)
+    except:
+        return jsonify({"msg": AdminMessages.INVALID_ID}), 400
 
-    if not incident:
+    result = get_timeline(db, incident_oid, page=page, limit=limit)
+
+    if result["total"] == 0 and not db.incidents.count_documents({"_id": incident_oid}, limit=1):
         return jsonify({"msg": "Not found"}), 404
 
-    return dumps(incident.get("history", [])), 200
+    return json_response(result)
 
 
 #➕ ADMIN CREATE INCIDENT
@@ -238,27 +407,31 @@ def create_incident_admin():
     )
     hashes = generate_evidence_hashes(combined_data)
 
+    created_at = datetime.utcnow()
+    iocs = extract_iocs(data.get("description"), data.get("ioc_indicators"))
+
     incident = {
         "title": data.get("title"),
         "description": data.get("description"),
         "platform": data.get("platform"),
         "incident_date": data.get("incident_date"),
         "ioc_indicators": data.get("ioc_indicators", ""),
+        "ioc_keys": [ioc["key"] for ioc in iocs],
         "reported_by": "ADMIN",
-        "created_at": datetime.utcnow(),
-        "status": "open",
+        "created_at": created_at,
+        "status": IncidentStatus.OPEN,
+        "version": 0,
         "analyst_reviewed": False,
         "evidence_hash": hashes["sha256"],
         "evidence_hash_md5": hashes["md5"],
-        "history": [{
-            "action": "Incident created by admin",
-            "by": actor,
-            "time": datetime.utcnow()
-        }]
+        **queue_fields(created_at)
     }
 
     db = current_app.db
-    db.incidents.insert_one(incident)
+    insert_incident_with_event(db, incident, "Incident created by admin", actor)
+    index_incident_iocs(db, incident["_id"], iocs, getattr(current_app, "write_queue", None), created_at)
+    bump_versions(VersionScopes.INCIDENTS)
+    publish_incident_event(EventTypes.INCIDENT_CREATED, incident)
 
     log_activity(
         actor=actor,
@@ -282,6 +455,10 @@ def delete_incident(incident_id):
     if result.deleted_count == 0:
         return jsonify({"msg": "Not found"}), 404
 
+    remove_incident_iocs(db, ObjectId(incident_id))
+
+    bump_versions(VersionScopes.INCIDENTS)
+
     log_activity(
         actor=get_jwt_identity(),
         event_type=AuditEvents.INCIDENT_DELETED,
@@ -290,10 +467,66 @@ def delete_incident(incident_id):
     )
 
     return jsonify({"msg": AdminMessages.INCIDENT_DELETED}), 200
+
+
+# 📡 LIVE INCIDENT EVENTS (SERVER-SENT EVENTS)
+@admin_bp.route("/stream/incidents", methods=["GET"])
+@jwt_required()
+@role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+def stream_incident_events():
+
+    hub = current_app.event_hub
+    risk_level = request.args.get("risk_level")
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    heartbeat = current_app.config.get("SSE_HEARTBEAT_SECONDS", 15)
+
+    try:
+        subscriber, backlog = hub.subscribe(last_event_id)
+    except HubFull:
+        response = jsonify({"msg": AdminMessages.TOO_MANY_STREAMS})
+        response.headers["Retry-After"] = str(heartbeat)
+        return response, 503
+
+    def format_event(event_id, event):
+        lines = []
+        if event_id:
+            lines.append(f"id: {event_id}")
+        lines.append(f"event: {event['type']}")
+        lines.append("data: " + to_json(event).decode("utf-8"))
+        return "\n".join(lines) + "\n\n"
+
+    def wanted(event):
+        return not risk_level or event["type"] == EventTypes.RESET or event.get("risk_level") == risk_level
+
+    def generate():
+        try:
+            yield f"retry: 2000\n: mode={hub.mode}\n\n"
+            for event_id, event in backlog:
+                if wanted(event):
+                    yield format_event(event_id, event)
+            while not subscriber.dropped:
+                try:
+                    event_id, event = subscriber.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if wanted(event):
+                    yield format_event(event_id, event)
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+
 # stats
 @admin_bp.route("/stats", methods=["GET"])
 @jwt_required()
 @role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+@conditional_get(VersionScopes.INCIDENTS)
+@cached_query(VersionScopes.INCIDENTS)
 def get_admin_stats():
 
     db = current_app.db
@@ -315,6 +548,8 @@ def get_admin_stats():
 @admin_bp.route("/escalations", methods=["GET"])
 @jwt_required()
 @role_required(AuthRoles.ADMIN, AuthRoles.CERT_ANALYST)
+@conditional_get(VersionScopes.INCIDENTS)
+@cached_query(VersionScopes.INCIDENTS)
 def get_escalations():
 
     db = current_app.db
@@ -339,6 +574,7 @@ def get_escalations():
 @admin_bp.route("/users", methods=["GET"])
 @jwt_required()
 @role_required(AuthRoles.ADMIN)
+@cached_query(VersionScopes.USERS)
 def get_admin_users():
 
     db = current_app.db
@@ -361,8 +597,10 @@ def get_admin_users():
 @jwt_required()
 @role_required(AuthRoles.ADMIN)
 def get_admin_audit_logs():
-    page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 20))
+    pagination = _pagination(20)
+    if pagination is None:
+        return jsonify({"msg": AdminMessages.INVALID_PAGINATION}), 400
+    page, limit = pagination
     event_type = request.args.get("event_type")
     
     filters = {}
@@ -379,7 +617,7 @@ def get_admin_audit_logs():
         role=AuthRoles.ADMIN
     )
     
-    return dumps(result), 200
+    return json_response(result)
 
 # system-health
 @admin_bp.route("/system-health", methods=["GET"])
@@ -389,6 +627,20 @@ def get_system_health_metrics():
     metrics = get_system_metrics()
     return jsonify(metrics), 200
 
+# campaigns
+@admin_bp.route("/campaigns", methods=["GET"])
+@jwt_required()
+@role_required(AuthRoles.ADMIN, AuthRoles.ANALYST, AuthRoles.CERT_ANALYST)
+@conditional_get(VersionScopes.INCIDENTS)
+def get_top_campaigns():
+
+    campaigns = top_campaigns(
+        current_app.db,
+        limit=min(request.args.get("limit", 20, type=int), 100),
+        days=request.args.get("days", 30, type=int)
+    )
+    return json_response(campaigns)
+
 # threat-intel
 @admin_bp.route("/threat-intel", methods=["GET"])
 @jwt_required()
@@ -1,14 +1,30 @@
 from flask import Blueprint, request, jsonify, current_app
-from werkzeug.security import generate_password_hash
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from pymongo.errors import DuplicateKeyError
 from app.constants.auth_constants import AuthMessages, AuthRoles
 from app.services.auth_service import authenticate_user, get_user_profile
 from app.services.audit_service import log_activity
 from app.constants.audit_constants import AuditEvents
+from app.services.version_service import VersionScopes, bump_versions
+from app.services.user_cache import invalidate_user
+from app.services.password_hasher import HasherBusy, hash_password
+from app.helpers.rate_limit_helpers import rate_limit
+from app.services.token_revocation import revoke_token
+from app.constants.rate_limit_constants import RateLimits
 
 auth_bp = Blueprint("auth", __name__)
 
 
+def _busy_response():
+    response = jsonify({"msg": AuthMessages.TRY_AGAIN_LATER})
+    response.headers["Retry-After"] = str(current_app.config.get("PASSWORD_HASH_RETRY_AFTER_SECONDS", 1))
+    return response, 503
+
+
+def _login_subject():
+    return (request.get_json(silent=True) or {}).get("serviceId")
+
+
 @auth_bp.route("/register", methods=["POST"])
 def register():
     db = current_app.db
@@ -25,16 +41,23 @@ def register():
     if role not in AuthRoles.VALID_ROLES:
         return jsonify({"msg": AuthMessages.INVALID_ROLE}), 400
 
-    if db.users.find_one({"username": serviceId}):
+    try:
+        hashed = hash_password(password)
+    except HasherBusy:
+        return _busy_response()
+
+    # The unique username index rejects duplicates in the same round trip
+    try:
+        db.users.insert_one({
+            "username": serviceId,
+            "password": hashed,
+            "role": role
+        })
+    except DuplicateKeyError:
         return jsonify({"msg": AuthMessages.USER_ALREADY_EXISTS}), 409
 
-    hashed = generate_password_hash(password)
-
-    db.users.insert_one({
-        "username": serviceId,
-        "password": hashed,
-        "role": role
-    })
+    invalidate_user(serviceId)
+    bump_versions(VersionScopes.USERS)
 
     log_activity(
         actor=serviceId,
@@ -47,6 +70,7 @@ def register():
 
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit(RateLimits.LOGIN, identity=_login_subject)
 def login():
     data = request.get_json()
     serviceId = data.get("serviceId")
@@ -54,6 +78,8 @@ def login():
     password = data.get("password")
 
     result, status_code = authenticate_user(serviceId, password, affiliation)
+    if status_code == 503:
+        return _busy_response()
     return jsonify(result), status_code
 
 
@@ -69,6 +95,7 @@ def me():
 @jwt_required()
 def logout():
     user = get_jwt_identity()
+    revoke_token(get_jwt())
     
     log_activity(
         actor=user,
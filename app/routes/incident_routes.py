@@ -2,12 +2,23 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from bson import ObjectId
-from app.services.risk_engine import calculate_risk_score, detect_threat_type
-from app.constants.incident_constants import PLAYBOOK, IncidentMessages, SUPPORTED_PLATFORMS
+from app.services.risk_engine import analyze_report
+from app.constants.incident_constants import PLAYBOOK, IncidentMessages, IncidentStatus, SUPPORTED_PLATFORMS
 from app.utils.security import generate_evidence_hashes, build_evidence_string, verify_evidence_integrity
 from app.services.audit_service import log_activity
 from app.constants.audit_constants import AuditEvents
-from app.services.ocr_service import extract_text_from_images
+from app.services.timeline_service import insert_incident_with_event
+from app.services.work_queue_service import queue_fields
+from app.services.incident_codec import playbook_ref, compress_text, ocr_terms, expand_incident
+from app.services.archive_service import find_incident, find_user_incidents
+from app.services.version_service import VersionScopes, bump_versions
+from app.helpers.conditional_helpers import conditional_get
+from app.services.event_stream import publish_incident_event, EventTypes
+from app.helpers.rate_limit_helpers import rate_limit, spend_rate_limit
+from app.services.ioc_extractor import extract_iocs
+from app.services.ioc_service import index_incident_iocs
+from app.services.dedup_service import report_signature, attachments_digest, find_canonical, register_canonical, VERDICT_FIELDS
+from app.constants.rate_limit_constants import RateLimits
 
 incident_bp = Blueprint("incident", __name__)
 
@@ -15,6 +26,7 @@ incident_bp = Blueprint("incident", __name__)
 #✅ REPORT INCIDENT (UPDATED FOR NEW FORM)
 @incident_bp.route("/report", methods=["POST"])
 @jwt_required()
+@rate_limit(RateLimits.REPORT)
 def report_incident():
 
     db = current_app.db
@@ -22,6 +34,12 @@ def report_incident():
     data = request.form if request.form else request.get_json()
     files = request.files.getlist("files")
 
+    # 🖼️ OCR makes every image far more expensive than the text; charged once
+    # the (size-capped) upload has been parsed
+    refused = spend_rate_limit(RateLimits.REPORT, RateLimits.REPORT_IMAGE_COST * len(files))
+    if refused:
+        return refused
+
     if not data:
         return jsonify({"msg": IncidentMessages.INVALID_REQUEST}), 400
 
@@ -46,39 +64,48 @@ def report_incident():
     if platform == "Other" and custom_platform:
         final_platform = custom_platform
 
-    # 🔍 OCR: Extract text from uploaded images
+    # 🧬 Near-duplicate check (narrative + IOC + identical files, before any OCR/ML work)
+    fingerprint = report_signature(narrative + " " + ioc_indicators, attachments_digest(files))
+    canonical, duplicate_similarity = find_canonical(db, fingerprint)
+
     ocr_text = ""
     ocr_results = []
-    if files:
-        ocr_text, ocr_results = extract_text_from_images(files)
-        current_app.logger.info(f"OCR extracted {len(ocr_text)} chars from {len(files)} file(s)")
-
-    # 🔎 Combine text for analysis (narrative + IOC + OCR extracted text)
-    combined_text = narrative + " " + ioc_indicators
-    if ocr_text:
-        combined_text += " " + ocr_text
-
-    # 🤖 Risk scoring (now includes OCR text)
-    risk_score, risk_level, risk_reasons = calculate_risk_score(
-        combined_text, narrative, ioc_indicators + " " + ocr_text
-    )
-
-    # 🌐 Detect URL presence (now includes OCR text)
-    malicious_url_found = "http" in (ioc_indicators + " " + ocr_text).lower()
-
-    # urgency detection
-    urgency_score = 15 if any(word in narrative.lower() for word in ["urgent", "immediately", "now"]) else 0
+    if canonical:
+        # ♻️ Same scam already analysed: reuse its results
+        risk_score = canonical.get("risk_score", 0)
+        risk_level = canonical.get("risk_level", "LOW")
+        risk_reasons = canonical.get("risk_reasons", [])
+        threat_type = canonical.get("threat_type_suggested")
+        confidence = canonical.get("classification_confidence")
+        ocr_results = [
+            {"filename": f.filename, "status": "skipped", "reason": "Duplicate report"}
+            for f in files if f and f.filename
+        ]
+    else:
+        # 🔍 OCR + 🤖 risk scoring + 🧠 threat detection within the report deadline
+        analysis = analyze_report(
+            narrative, ioc_indicators, files, current_app.config.get("REPORT_DEADLINE_MS")
+        )
+        ocr_text, ocr_results = analysis.ocr_text, analysis.ocr_results
+        if files:
+            current_app.logger.info(f"OCR extracted {len(ocr_text)} chars from {len(files)} file(s)")
 
-    # 🧠 Threat type detection (now includes confidence)
-    threat_type, confidence = detect_threat_type(combined_text, malicious_url_found, urgency_score)
+        risk_score, risk_level, risk_reasons = analysis.risk()
+        threat_type, confidence = analysis.threat()
 
     # 📘 Safety guidance
     guidance = PLAYBOOK.get(threat_type, PLAYBOOK["Suspicious Message"])
 
+    # 🧷 Indicators (numbers, UPI IDs, domains, ...) for cross-report lookups
+    iocs = extract_iocs(narrative, ioc_indicators, ocr_text)
+
     # 🔐 Evidence integrity hash (Hybrid: SHA-256 + MD5)
     combined_data = build_evidence_string(platform, incident_date, narrative, ioc_indicators)
     hashes = generate_evidence_hashes(combined_data)
 
+    created_at = datetime.utcnow()
+    flagged = risk_level.lower() == "high"
+
     incident = {
         # metadata
         "platform": final_platform,
@@ -87,26 +114,27 @@ def report_incident():
 
         # narrative & IOC
         "ioc_indicators": ioc_indicators,
+        "ioc_keys": [ioc["key"] for ioc in iocs],
         "narrative": narrative,
 
         # reporter info
         "reported_by": current_user,
-        "created_at": datetime.utcnow(),
+        "created_at": created_at,
 
         # AI analysis
         "risk_score": risk_score,
         "risk_level": risk_level,
         "risk_reasons": risk_reasons,
-        "flagged": risk_level.lower() == "high",
+        "flagged": flagged,
 
         # AI threat classification
         "threat_type_suggested": threat_type,
         "classification_confidence": confidence,
-        "immediate_actions": guidance["immediate"],
-        "preventive_advice": guidance["preventive"],
+        "playbook": playbook_ref(threat_type),
 
         # workflow
-        "status": "open",
+        "status": IncidentStatus.OPEN,
+        "version": 0,
         "analyst_reviewed": False,
 
         # integrity
@@ -122,20 +150,31 @@ def report_incident():
         "reviewed_at": None,
 
         # OCR data
-        "ocr_extracted_text": ocr_text if ocr_text else None,
-        "ocr_results": ocr_results,
-
-        # history
-        "history": [
-            {
-                "action": "Incident reported",
-                "by": current_user,
-                "time": datetime.utcnow()
-            }
-        ]
+        "ocr_results": ocr_results
     }
 
-    db.incidents.insert_one(incident)
+    if canonical:
+        # Duplicates are reviewed through their canonical incident
+        incident["canonical_incident_id"] = canonical["_id"]
+        incident["duplicate_similarity"] = round(duplicate_similarity, 3)
+        if canonical.get("analyst_reviewed"):
+            incident.update({field: canonical.get(field) for field in VERDICT_FIELDS})
+    else:
+        # analyst work queue
+        incident.update(queue_fields(created_at, risk_score, flagged))
+
+    if ocr_text:
+        incident["ocr_text_z"] = compress_text(ocr_text)
+        incident["ocr_terms"] = ocr_terms(ocr_text)
+
+    insert_incident_with_event(db, incident, "Incident reported", current_user)
+    index_incident_iocs(db, incident["_id"], iocs, getattr(current_app, "write_queue", None), created_at)
+    if canonical:
+        db.incidents.update_one({"_id": canonical["_id"]}, {"$inc": {"duplicate_count": 1}})
+    else:
+        register_canonical(incident["_id"], fingerprint, created_at)
+    bump_versions(VersionScopes.INCIDENTS)
+    publish_incident_event(EventTypes.INCIDENT_CREATED, incident)
 
     log_activity(
         actor=current_user,
@@ -161,9 +200,10 @@ def get_my_incidents():
     db = current_app.db
     current_user = get_jwt_identity()
 
-    incidents = list(db.incidents.find({"reported_by": current_user}))
+    incidents = find_user_incidents(db, current_user)
 
     for incident in incidents:
+        expand_incident(incident)
         incident["_id"] = str(incident["_id"])
 
     return jsonify(incidents), 200
@@ -172,12 +212,13 @@ def get_my_incidents():
 #✅ FETCH INCIDENT ANALYSIS
 @incident_bp.route("/analysis/<incident_id>", methods=["GET"])
 @jwt_required()
+@conditional_get(VersionScopes.INCIDENTS, per_user=True)
 def get_incident_analysis(incident_id):
     db = current_app.db
     current_user = get_jwt_identity()
 
     try:
-        incident = db.incidents.find_one({"_id": ObjectId(incident_id)})
+        incident = find_incident(db, ObjectId(incident_id))
     except:
         return jsonify({"msg": IncidentMessages.INVALID_ID}), 400
 
@@ -187,6 +228,8 @@ def get_incident_analysis(incident_id):
     if incident.get("reported_by") != current_user:
         return jsonify({"msg": IncidentMessages.UNAUTHORIZED}), 403
 
+    expand_incident(incident)
+
     analysis = {
         "riskScore": incident.get("risk_score", 0),
         "riskLevel": incident.get("risk_level", "UNKNOWN"),
@@ -223,7 +266,7 @@ def verify_incident(incident_id):
     db = current_app.db
 
     try:
-        incident = db.incidents.find_one({"_id": ObjectId(incident_id)})
+        incident = find_incident(db, ObjectId(incident_id))
     except:
         return jsonify({"msg": IncidentMessages.INVALID_ID}), 400
 
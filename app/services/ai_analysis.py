@@ -1,27 +1,153 @@
+"""
+AI Analysis — VADER tone scoring.
+Results are kept in a bounded LRU keyed by a hash of the text, so resubmitted
+or identical texts are scored once. Long texts (mostly OCR output) are scored
+sentence chunk by sentence chunk and take the most negative chunk, stopping as
+soon as one crosses the fear threshold; chunks with no negative cue at all are
+not scored. Safe to call from worker threads.
+"""
+import hashlib
+import re
+import string
+import threading
+from collections import OrderedDict
 from nltk.sentiment import SentimentIntensityAnalyzer
+from app.constants.incident_constants import RiskReasons
 
 sia = SentimentIntensityAnalyzer()
 
+FEAR_THRESHOLD = -0.5
+URGENCY_THRESHOLD = -0.2
+
+# Texts longer than this are scored in sentence chunks of about CHUNK_CHARS
+LONG_TEXT_CHARS = 2000
+CHUNK_CHARS = 300
+
+SENTIMENT_CACHE_SIZE = 4096
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?\n])\s+")
+
+
+class SentimentCache:
+    """Thread-safe LRU of text digest -> (score, reasons)."""
+
+    def __init__(self, max_entries=SENTIMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text):
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+sentiment_cache = SentimentCache()
+
+
+def _negative_cues():
+    """
+    What VADER needs to score a chunk below zero: negative lexicon words,
+    negations and dampeners (single tokens), or a dampening or negative idiom
+    (phrases).
+    """
+    constants = sia.constants
+    words = {word for word, valence in sia.lexicon.items() if valence < 0}
+    words |= set(constants.NEGATE) | {"least"}
+    phrases = {idiom for idiom, valence in constants.SPECIAL_CASE_IDIOMS.items() if valence < 0}
+    for phrase, scalar in constants.BOOSTER_DICT.items():
+        if scalar < 0:
+            (phrases if " " in phrase else words).add(phrase)
+    return frozenset(words), tuple(phrases)
+
+
+NEGATIVE_WORDS, NEGATIVE_PHRASES = _negative_cues()
+
+
+def may_be_negative(text):
+    """False when VADER's compound for `text` is certainly >= 0."""
+    tokens = text.lower().split()
+    for token in tokens:
+        if token in NEGATIVE_WORDS or "n't" in token or token.strip(string.punctuation) in NEGATIVE_WORDS:
+            return True
+    joined = " ".join(tokens)
+    return any(phrase in joined for phrase in NEGATIVE_PHRASES)
+
+
+def sentence_chunks(text, chunk_chars=CHUNK_CHARS):
+    """Split `text` at sentence ends into chunks of roughly `chunk_chars`."""
+    chunk = ""
+    for sentence in _SENTENCE_END_RE.split(text):
+        if chunk and len(chunk) + len(sentence) > chunk_chars:
+            yield chunk
+            chunk = sentence
+        else:
+            chunk = f"{chunk} {sentence}" if chunk else sentence
+    if chunk:
+        yield chunk
+
+
+def tone_compound(text):
+    """VADER compound score; for long texts, that of the most negative chunk."""
+    if len(text) <= LONG_TEXT_CHARS:
+        return sia.polarity_scores(text)["compound"]
+
+    worst = 0.0
+    for chunk in sentence_chunks(text):
+        if not may_be_negative(chunk):
+            continue  # Cannot lower the worst score below 0
+        worst = min(worst, sia.polarity_scores(chunk)["compound"])
+        if worst <= FEAR_THRESHOLD:
+            break  # Already the strongest tone band
+    return worst
+
+
 def vader_risk_score(text):
     """
     Analyze emotional pressure & urgency tone.
-    Returns score contribution + explanation.
+    Returns score contribution + reason codes.
     """
+    key = SentimentCache.key(text)
+    cached = sentiment_cache.get(key)
+    if cached is not None:
+        score, reasons = cached
+        return score, list(reasons)
 
-    sentiment = sia.polarity_scores(text)
-    compound = sentiment["compound"]
+    compound = tone_compound(text)
 
     score = 0
     reasons = []
 
     # Strong fear / pressure tone
-    if compound <= -0.5:
+    if compound <= FEAR_THRESHOLD:
         score += 15
-        reasons.append("strong negative / fear tone detected")
+        reasons.append(RiskReasons.FEAR_TONE)
 
     # mild urgency tone
-    elif -0.5 < compound < -0.2:
+    elif FEAR_THRESHOLD < compound < URGENCY_THRESHOLD:
         score += 8
-        reasons.append("mild urgency tone detected")
+        reasons.append(RiskReasons.URGENCY_TONE)
 
+    sentiment_cache.put(key, (score, tuple(reasons)))
     return score, reasons
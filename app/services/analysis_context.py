@@ -0,0 +1,59 @@
+"""
+Analysis Context — One pass of text preparation per report.
+The report's narrative, IOC field and OCR text are joined, lowercased,
+URL-scanned and TF-IDF vectorized once; the risk engine, the VADER scorer and
+the threat classifier all read from the same context instead of re-deriving
+their own copies of the text.
+"""
+from functools import cached_property
+from .url_checker import extract_urls
+
+URGENCY_WORDS = ["urgent", "immediately", "now"]
+
+
+class AnalysisContext:
+    def __init__(self, narrative, ioc_indicators="", ocr_text=""):
+        self.narrative = narrative or ""
+        self.ioc_indicators = ioc_indicators or ""
+        self.ocr_text = ocr_text or ""
+
+        # Text the classifier sees (narrative + IOC + OCR)
+        self.combined_text = self.narrative + " " + self.ioc_indicators
+        if self.ocr_text:
+            self.combined_text += " " + self.ocr_text
+
+        # Evidence keeps its joining space, so it always counts as present
+        self.evidence = self.ioc_indicators + " " + self.ocr_text
+
+        # Text the risk engine scores: combined text, narrative, evidence
+        self.raw_text = self.combined_text + " " + self.narrative + " " + self.evidence
+
+    @cached_property
+    def text_lower(self):
+        return self.raw_text.lower()
+
+    @cached_property
+    def combined_lower(self):
+        return self.combined_text.lower()
+
+    @cached_property
+    def urls(self):
+        return extract_urls(self.raw_text)
+
+    @cached_property
+    def url_in_evidence(self):
+        """A link was pasted as an indicator or read from a screenshot."""
+        return "http" in self.evidence.lower()
+
+    @cached_property
+    def urgency_score(self):
+        narrative = self.narrative.lower()
+        return 15 if any(word in narrative for word in URGENCY_WORDS) else 0
+
+    def features(self, vectorizer):
+        """TF-IDF row of the combined text, computed once per vectorizer."""
+        cached = self.__dict__.get("_features")
+        if cached is None or cached[0] is not vectorizer:
+            cached = (vectorizer, vectorizer.transform([self.combined_lower]))
+            self.__dict__["_features"] = cached
+        return cached[1]
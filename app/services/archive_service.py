@@ -0,0 +1,148 @@
+"""
+Archive Service — Cold storage for closed incidents.
+Resolved/closed incidents older than ARCHIVE_AFTER_DAYS are moved, in bounded
+batches, to `incidents_archive`. Each archived document keeps the fields its
+lookups need in clear (and indexed) and the full incident as zlib-compressed
+BSON, so the live collection and its indexes only hold active work.
+"""
+import time
+import zlib
+from datetime import datetime, timedelta
+import bson
+from bson.binary import Binary
+from pymongo import DeleteOne, ReplaceOne
+from app.constants.incident_constants import IncidentStatus
+from app.models.incident_model import IncidentModel
+from app.services.version_service import VERSION_COLLECTION, VersionScopes
+
+ARCHIVE_COLLECTION = "incidents_archive"
+ARCHIVABLE_STATUSES = [IncidentStatus.RESOLVED, IncidentStatus.CLOSED]
+
+# An incident is only deleted if these still hold their copied values:
+# transitions bump `version`; duplicates and clustering write the others
+UNCHANGED_FIELDS = ("version", "duplicate_count", "campaign_id")
+
+
+def _encode(incident):
+    return Binary(zlib.compress(bson.encode(incident), 6))
+
+
+def _decode(archived):
+    incident = bson.decode(zlib.decompress(bytes(archived["payload"])))
+    for field, included in IncidentModel.READ_PROJECTION.items():
+        if not included:
+            incident.pop(field, None)
+    incident["archived"] = True
+    return incident
+
+
+def _archive_document(incident, now):
+    return {
+        "_id": incident["_id"],
+        "reported_by": incident.get("reported_by"),
+        "created_at": incident.get("created_at"),
+        "status": incident.get("status"),
+        "risk_level": incident.get("risk_level"),
+        "archived_at": now,
+        "codec": "zlib",
+        "payload": _encode(incident)
+    }
+
+
+def _candidate_filter(cutoff):
+    return {
+        "status": {"$in": ARCHIVABLE_STATUSES},
+        "$or": [
+            {"updated_at": {"$lt": cutoff}},
+            {"updated_at": {"$exists": False}, "created_at": {"$lt": cutoff}}
+        ]
+    }
+
+
+def archive_batch(db, cutoff, batch_size=500):
+    """
+    Archive up to `batch_size` eligible incidents.
+    Returns (candidates fetched, incidents moved out of the live collection);
+    the two differ when incidents were reopened or edited mid-batch.
+    """
+    batch = list(db.incidents.find(_candidate_filter(cutoff)).limit(batch_size))
+    if not batch:
+        return 0, 0
+
+    now = datetime.utcnow()
+    # Upserts keep re-runs idempotent after an interrupted batch
+    db[ARCHIVE_COLLECTION].bulk_write(
+        [ReplaceOne({"_id": i["_id"]}, _archive_document(i, now), upsert=True) for i in batch],
+        ordered=False
+    )
+
+    # Only delete incidents not reopened or edited since they were copied
+    # (a missing field is matched by None)
+    deletes = []
+    for incident in batch:
+        unchanged = {field: incident.get(field) for field in UNCHANGED_FIELDS}
+        deletes.append(DeleteOne({"_id": incident["_id"], "status": {"$in": ARCHIVABLE_STATUSES}, **unchanged}))
+    deleted = db.incidents.bulk_write(deletes, ordered=False).deleted_count
+
+    if deleted < len(batch):
+        # Drop the stale copies of incidents that stayed live
+        kept = [i["_id"] for i in db.incidents.find({"_id": {"$in": [i["_id"] for i in batch]}}, {"_id": 1})]
+        if kept:
+            db[ARCHIVE_COLLECTION].delete_many({"_id": {"$in": kept}})
+
+    # Runs outside the app, so bump the shared counter directly
+    if deleted:
+        db[VERSION_COLLECTION].update_one(
+            {"_id": VersionScopes.INCIDENTS}, {"$inc": {"v": 1}}, upsert=True
+        )
+    return len(batch), deleted
+
+
+def archive_closed_incidents(db, older_than_days=90, batch_size=500, pause_seconds=0.5, logger=None):
+    """
+    Archive every eligible incident, one bounded batch at a time,
+    pausing between batches so live traffic keeps the database.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    total = 0
+
+    while True:
+        fetched, moved = archive_batch(db, cutoff, batch_size)
+        total += moved
+        if logger:
+            logger.info(f"Archived {moved} incident(s) ({total} total)")
+        # A short fetch means the backlog is drained; a full one may have had
+        # incidents that stayed live, so keep going
+        if fetched < batch_size:
+            break
+        time.sleep(pause_seconds)
+
+    return total
+
+
+def find_incident(db, incident_id, projection=None):
+    """Look up an incident in the live collection, then the archive."""
+    incident = db.incidents.find_one({"_id": incident_id}, projection or IncidentModel.READ_PROJECTION)
+    if incident is not None:
+        return incident
+
+    archived = db[ARCHIVE_COLLECTION].find_one({"_id": incident_id}, {"payload": 1})
+    return _decode(archived) if archived else None
+
+
+def iter_archived_incidents(db, batch_size=500, limit=0):
+    """Stream archived incidents, decoded (offline jobs such as shadow scoring)."""
+    for archived in db[ARCHIVE_COLLECTION].find({}, {"payload": 1}, batch_size=batch_size, limit=limit):
+        yield _decode(archived)
+
+
+def find_user_incidents(db, username):
+    """All incidents reported by `username`, live and archived."""
+    incidents = list(db.incidents.find({"reported_by": username}, IncidentModel.READ_PROJECTION))
+    live_ids = {i["_id"] for i in incidents}
+    # An incident mid-archival can briefly exist in both; the live copy wins
+    incidents.extend(
+        _decode(a) for a in db[ARCHIVE_COLLECTION].find({"reported_by": username}, {"payload": 1})
+        if a["_id"] not in live_ids
+    )
+    return incidents
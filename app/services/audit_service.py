@@ -1,17 +1,14 @@
 from datetime import datetime
 from flask import current_app, request
 from bson.json_util import dumps
+from pymongo import InsertOne
+from app.services.version_service import VersionScopes, bump_versions
 
-def log_activity(actor, event_type, details=None, ip_address=None, role=None):
-    """
-    Logs an activity to the audit_logs collection.
-    """
-    db = current_app.db
-    
+def _build_log_entry(actor, event_type, details, ip_address, role):
     if not ip_address:
         ip_address = request.remote_addr if request else "0.0.0.0"
 
-    log_entry = {
+    return {
         "actor": actor,
         "event_type": event_type,
         "details": details or {},
@@ -19,13 +16,36 @@ def log_activity(actor, event_type, details=None, ip_address=None, role=None):
         "role": role,
         "timestamp": datetime.utcnow()
     }
+
+def log_activity(actor, event_type, details=None, ip_address=None, role=None):
+    """
+    Logs an activity to the audit_logs collection.
+    """
+    db = current_app.db
+    log_entry = _build_log_entry(actor, event_type, details, ip_address, role)
+    ip_address = log_entry["ip_address"]
     
     try:
         db.audit_logs.insert_one(log_entry)
+        bump_versions(VersionScopes.AUDIT_LOGS)
         current_app.logger.info(f"AUDIT LOG: {actor} - {event_type} - {ip_address}")
     except Exception as e:
         current_app.logger.error(f"Failed to write audit log: {e}")
 
+def enqueue_activity(actor, event_type, details=None, ip_address=None, role=None):
+    """
+    Queues an activity for the batched background writer.
+    Falls back to a synchronous write when no write queue is configured.
+    """
+    write_queue = getattr(current_app, "write_queue", None)
+    if write_queue is None:
+        return log_activity(actor, event_type, details, ip_address, role)
+
+    log_entry = _build_log_entry(actor, event_type, details, ip_address, role)
+    write_queue.submit("audit_logs", InsertOne(log_entry))
+    bump_versions(VersionScopes.AUDIT_LOGS)
+    current_app.logger.info(f"AUDIT LOG (queued): {actor} - {event_type} - {log_entry['ip_address']}")
+
 def get_audit_logs(page=1, limit=50, filters=None):
     """
     Retrieves audit logs from the database.
@@ -1,9 +1,9 @@
-from flask import current_app
-from werkzeug.security import check_password_hash
 from flask_jwt_extended import create_access_token
 from app.constants.auth_constants import AuthMessages, AuthRoles
 from app.services.audit_service import log_activity
 from app.constants.audit_constants import AuditEvents
+from app.services.user_cache import find_user
+from app.services.password_hasher import HasherBusy, verify_password, reject_unknown_user
 
 def authenticate_user(serviceId, password, affiliation):
     """
@@ -14,11 +14,15 @@ def authenticate_user(serviceId, password, affiliation):
     if not password:
         return {"msg": AuthMessages.PASSWORD_REQUIRED}, 400
 
-    db = current_app.db
     # First, find the user by username to check their role
-    user = db.users.find_one({ "username": serviceId })
+    user = find_user(serviceId)
 
     if not user:
+        # Same pool, cost and 503 behaviour as a wrong password for a real user
+        try:
+            reject_unknown_user(password)
+        except HasherBusy:
+            return {"msg": AuthMessages.TRY_AGAIN_LATER}, 503
         log_activity(actor=serviceId or "unknown", event_type=AuditEvents.LOGIN_FAILED, details={"reason": "User not found"})
         return {"msg": AuthMessages.INVALID_CREDENTIALS}, 401
 
@@ -30,7 +34,12 @@ def authenticate_user(serviceId, password, affiliation):
         expected_affiliation = "Service Personnel" if affiliation == "Service Personnel" else "family"
     
     # If the user exists and the password matches, we proceed
-    if not check_password_hash(user["password"], password):
+    try:
+        password_ok = verify_password(user["password"], password)
+    except HasherBusy:
+        return {"msg": AuthMessages.TRY_AGAIN_LATER}, 503
+
+    if not password_ok:
         log_activity(actor=serviceId, event_type=AuditEvents.LOGIN_FAILED, details={"reason": "Incorrect password"})
         return {"msg": AuthMessages.INVALID_CREDENTIALS}, 401
 
@@ -56,8 +65,7 @@ def get_user_profile(username):
     """
     Retrieves the user profile from the database.
     """
-    db = current_app.db
-    user = db.users.find_one({"username": username}, {"password": 0})  # Exclude password
+    user = find_user(username)
     
     if not user:
         return {"msg": AuthMessages.INVALID_CREDENTIALS}, 404
@@ -0,0 +1,406 @@
+"""
+Campaign Service — Offline scam-campaign clustering.
+Each run fits its own TF-IDF vectorizer (word uni- and bigrams, English stop
+words dropped) on the newest incidents, so words every report uses weigh
+little and campaigns are told apart by their specific wording. Incidents are
+then streamed from Mongo in chunks and assigned to the nearest active
+campaign (incremental leader clustering): a shared indicator (phone, UPI ID,
+domain, ...) joins a campaign outright, otherwise cosine similarity to the
+campaign centroid must reach CAMPAIGN_SIMILARITY or the incident starts a new
+one. Domains of shared infrastructure (link shorteners, messengers, big
+platforms) never join campaigns on their own. Centroids are pruned to their
+top terms and campaigns idle for CAMPAIGN_ACTIVE_DAYS (relative to the chunk
+being clustered) are dropped, so memory stays bounded; reruns only look at
+incidents that have not been assigned yet.
+"""
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from bson import ObjectId
+from pymongo import UpdateOne, ReplaceOne
+from app.services.version_service import VERSION_COLLECTION, VersionScopes
+
+CAMPAIGN_COLLECTION = "campaigns"
+
+CENTROID_TERMS = 200
+MAX_CAMPAIGN_IOCS = 500
+SUMMARY_TERMS = 10
+SUMMARY_IOCS = 10
+
+# Vocabulary of the campaign vectorizer
+MAX_VOCABULARY = 50000
+# Terms must appear in this many sampled incidents (once the sample is large enough)
+MIN_TERM_INCIDENTS = 2
+MIN_SAMPLE_FOR_MIN_DF = 50
+
+# Used by unrelated scams alike: an incident is not joined to a campaign
+# just because both mention one of these (or a subdomain)
+SHARED_INFRASTRUCTURE_DOMAINS = {
+    "bit.ly", "tinyurl.com", "t.co", "goo.gl", "cutt.ly", "is.gd", "rb.gy", "shorturl.at",
+    "wa.me", "whatsapp.com", "chat.whatsapp.com", "t.me", "telegram.me", "telegram.org",
+    "google.com", "forms.gle", "docs.google.com", "drive.google.com", "youtube.com", "youtu.be",
+    "facebook.com", "fb.com", "instagram.com", "twitter.com", "x.com", "linkedin.com",
+    "gmail.com", "yahoo.com", "outlook.com", "hotmail.com",
+    "play.google.com", "apple.com", "microsoft.com", "amazon.in", "amazon.com", "github.com"
+}
+
+# Only these fields are read while clustering
+CLUSTER_PROJECTION = {
+    "narrative": 1, "description": 1, "ioc_indicators": 1, "ocr_terms": 1, "ioc_keys": 1,
+    "created_at": 1, "risk_level": 1, "threat_type_suggested": 1
+}
+
+UNASSIGNED_FILTER = {"campaign_id": {"$exists": False}}
+
+
+def _incident_text(incident):
+    parts = [incident.get("narrative") or incident.get("description") or "", incident.get("ioc_indicators") or ""]
+    if incident.get("ocr_terms"):
+        parts.append(incident["ocr_terms"])
+    return " ".join(parts).lower()
+
+
+def fit_campaign_vectorizer(db, sample_size=20000):
+    """TF-IDF vectorizer fitted on the newest `sample_size` incidents (None when there are none)."""
+    texts = [
+        _incident_text(incident)
+        for incident in db.incidents.find({}, CLUSTER_PROJECTION).sort("_id", -1).limit(sample_size)
+    ]
+    if not texts:
+        return None
+
+    vectorizer = TfidfVectorizer(
+        ngram_range=(1, 2),
+        stop_words="english",
+        sublinear_tf=True,
+        max_features=MAX_VOCABULARY,
+        min_df=MIN_TERM_INCIDENTS if len(texts) >= MIN_SAMPLE_FOR_MIN_DF else 1
+    )
+    try:
+        vectorizer.fit(texts)
+    except ValueError:
+        # Only stop words (or nothing) to learn from
+        return None
+    return vectorizer
+
+
+def is_shared_infrastructure(key):
+    """True for domain indicators that unrelated scams share."""
+    kind, _, value = key.partition(":")
+    if kind != "domain":
+        return False
+    parts = value.split(".")
+    return any(".".join(parts[i:]) in SHARED_INFRASTRUCTURE_DOMAINS for i in range(len(parts) - 1))
+
+
+def _joining_keys(keys):
+    return [key for key in keys if not is_shared_infrastructure(key)]
+
+
+class _Campaign:
+    def __init__(self, campaign_id, doc=None):
+        doc = doc or {}
+        self.id = campaign_id
+        self.size = doc.get("size", 0)
+        self.first_seen = doc.get("first_seen")
+        self.last_seen = doc.get("last_seen")
+        self.centroid = {}  # term index -> weight
+        # Stored as a list: indicator keys contain "." (and may contain "$");
+        # documents written as a mapping are still read
+        stored = doc.get("ioc_counts") or []
+        if isinstance(stored, dict):
+            self.iocs = Counter(stored)
+        else:
+            self.iocs = Counter({entry["key"]: entry["count"] for entry in stored})
+        self.threat_types = Counter(doc.get("threat_types") or {})
+        self.high_risk = doc.get("high_risk", 0)
+        self.sample_incident_id = doc.get("sample_incident_id")
+
+    def add(self, incident, vector):
+        """Fold an incident into the running-mean centroid and summary."""
+        n = self.size
+        weights = {i: w * n for i, w in self.centroid.items()}
+        for i, w in zip(vector.indices, vector.data):
+            weights[i] = weights.get(i, 0.0) + w
+        top = sorted(weights.items(), key=lambda kv: kv[1], reverse=True)[:CENTROID_TERMS]
+        self.centroid = {i: w / (n + 1) for i, w in top}
+
+        self.size = n + 1
+        created_at = incident.get("created_at")
+        if created_at:
+            self.first_seen = min(self.first_seen or created_at, created_at)
+            self.last_seen = max(self.last_seen or created_at, created_at)
+        for key in incident.get("ioc_keys") or []:
+            if key in self.iocs or len(self.iocs) < MAX_CAMPAIGN_IOCS:
+                self.iocs[key] += 1
+        if incident.get("threat_type_suggested"):
+            self.threat_types[incident["threat_type_suggested"]] += 1
+        if incident.get("risk_level") == "HIGH":
+            self.high_risk += 1
+        if self.sample_incident_id is None:
+            self.sample_incident_id = incident["_id"]
+
+    def centroid_norm(self):
+        return float(np.sqrt(sum(w * w for w in self.centroid.values()))) or 1.0
+
+    def document(self, terms):
+        ranked = sorted(self.centroid.items(), key=lambda kv: kv[1], reverse=True)
+        return {
+            "size": self.size,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "centroid": {"terms": [terms[i] for i, _ in ranked], "weights": [float(w) for _, w in ranked]},
+            "top_terms": [terms[i] for i, _ in ranked[:SUMMARY_TERMS]],
+            "ioc_counts": [{"key": key, "count": count} for key, count in self.iocs.items()],
+            "top_iocs": [key for key, _ in self.iocs.most_common(SUMMARY_IOCS)],
+            "threat_types": dict(self.threat_types),
+            "high_risk": self.high_risk,
+            "sample_incident_id": self.sample_incident_id,
+            "updated_at": datetime.utcnow()
+        }
+
+
+class _CentroidMatrix:
+    """
+    Row-normalized campaign centroids as a sparse (campaigns x terms) matrix.
+    Every row has CENTROID_TERMS slots (unused ones hold zeros), so adding,
+    changing or dropping a campaign rewrites one row instead of the matrix.
+    """
+
+    def __init__(self, n_terms):
+        self.n_terms = n_terms
+        self.ids = []    # row -> campaign id
+        self._rows = {}  # campaign id -> row
+        self._indices = np.zeros((0, CENTROID_TERMS), dtype=np.int32)
+        self._values = np.zeros((0, CENTROID_TERMS))
+
+    def set(self, campaign):
+        row = self._rows.get(campaign.id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self._indices):
+                self._grow()
+            self.ids.append(campaign.id)
+            self._rows[campaign.id] = row
+
+        norm = campaign.centroid_norm()
+        count = len(campaign.centroid)
+        self._indices[row] = 0
+        self._values[row] = 0.0
+        self._indices[row, :count] = list(campaign.centroid)
+        self._values[row, :count] = [w / norm for w in campaign.centroid.values()]
+
+    def remove(self, campaign_id):
+        row = self._rows.pop(campaign_id, None)
+        if row is None:
+            # Dropped before its row was ever written
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            # Move the last row into the gap
+            self._indices[row] = self._indices[last]
+            self._values[row] = self._values[last]
+            self.ids[row] = self.ids[last]
+            self._rows[self.ids[row]] = row
+        self.ids.pop()
+
+    def _grow(self):
+        capacity = max(64, 2 * len(self._indices))
+        indices = np.zeros((capacity, CENTROID_TERMS), dtype=np.int32)
+        values = np.zeros((capacity, CENTROID_TERMS))
+        indices[:len(self._indices)] = self._indices
+        values[:len(self._values)] = self._values
+        self._indices, self._values = indices, values
+
+    def matrix(self):
+        """CSR view over the current rows (no copy)."""
+        n = len(self.ids)
+        indptr = np.arange(n + 1, dtype=np.int64) * CENTROID_TERMS
+        return csr_matrix(
+            (self._values[:n].ravel(), self._indices[:n].ravel(), indptr),
+            shape=(n, self.n_terms)
+        )
+
+
+class CampaignClusterer:
+    def __init__(self, db, vectorizer, similarity=0.6, active_days=90, logger=None):
+        self.db = db
+        self.vectorizer = vectorizer
+        self.similarity = similarity
+        self.active_days = active_days
+        self.logger = logger
+        self.terms = vectorizer.get_feature_names_out()
+        self.campaigns = OrderedDict()  # least recently extended first
+        self._ioc_owner = {}            # ioc key -> campaign id
+        self._centroids = _CentroidMatrix(len(self.terms))
+        self._dirty = set()             # changed since the last save
+        self._stale = set()             # changed since the centroid rows were written
+
+    def load(self):
+        """Load active campaigns (centroids remapped onto the current vocabulary)."""
+        vocabulary = self.vectorizer.vocabulary_
+        since = datetime.utcnow() - timedelta(days=self.active_days)
+        for doc in self.db[CAMPAIGN_COLLECTION].find({"last_seen": {"$gte": since}}).sort("last_seen", 1):
+            campaign = _Campaign(doc["_id"], doc)
+            centroid = doc.get("centroid") or {}
+            for term, weight in zip(centroid.get("terms", []), centroid.get("weights", [])):
+                if term in vocabulary:
+                    campaign.centroid[vocabulary[term]] = weight
+            self._register(campaign)
+            self._centroids.set(campaign)
+        return len(self.campaigns)
+
+    def _register(self, campaign):
+        self.campaigns[campaign.id] = campaign
+        for key in _joining_keys(campaign.iocs):
+            self._ioc_owner.setdefault(key, campaign.id)
+
+    def _evict_inactive(self, now):
+        """Drop campaigns with no incident within `active_days` of `now`."""
+        cutoff = now - timedelta(days=self.active_days)
+        while self.campaigns:
+            campaign = next(iter(self.campaigns.values()))
+            if campaign.last_seen is None or campaign.last_seen >= cutoff:
+                break
+            del self.campaigns[campaign.id]
+            self._centroids.remove(campaign.id)
+            self._dirty.discard(campaign.id)
+            self._stale.discard(campaign.id)
+            for key in campaign.iocs:
+                if self._ioc_owner.get(key) == campaign.id:
+                    del self._ioc_owner[key]
+
+    def _refresh_centroids(self):
+        for campaign_id in self._stale:
+            self._centroids.set(self.campaigns[campaign_id])
+        self._stale.clear()
+
+    @staticmethod
+    def _cosine(vector, campaign):
+        entries = dict(zip(vector.indices, vector.data))
+        dot = sum(w * entries[i] for i, w in campaign.centroid.items() if i in entries)
+        return dot / campaign.centroid_norm()
+
+    def assign_chunk(self, incidents):
+        """Assign a chunk of incidents. Returns [(incident_id, campaign_id or None)]."""
+        seen = [i["created_at"] for i in incidents if i.get("created_at")]
+        if seen:
+            self._evict_inactive(max(seen))
+        self._refresh_centroids()
+
+        vectors = self.vectorizer.transform([_incident_text(i) for i in incidents])
+
+        # Similarities to every campaign in one sparse product; centroids
+        # moving within the chunk are only seen by the next chunk
+        ids = list(self._centroids.ids)
+        similarities = (vectors @ self._centroids.matrix().T).tocsr()
+        fresh = []  # campaigns started in this chunk
+        assignments = []
+
+        for row, incident in enumerate(incidents):
+            vector = vectors.getrow(row)
+            keys = _joining_keys(incident.get("ioc_keys") or [])
+
+            campaign = next((self.campaigns[self._ioc_owner[k]] for k in keys if k in self._ioc_owner), None)
+            if campaign is None and vector.nnz:
+                best, best_score = None, 0.0
+                scores = similarities.getrow(row)
+                if scores.nnz:
+                    j = int(np.argmax(scores.data))
+                    best, best_score = self.campaigns[ids[scores.indices[j]]], scores.data[j]
+                for candidate in fresh:
+                    score = self._cosine(vector, candidate)
+                    if score > best_score:
+                        best, best_score = candidate, score
+                if best_score >= self.similarity:
+                    campaign = best
+
+            if campaign is None:
+                if vector.nnz == 0 and not keys:
+                    # Nothing to cluster on
+                    assignments.append((incident["_id"], None))
+                    continue
+                campaign = _Campaign(ObjectId())
+                self.campaigns[campaign.id] = campaign
+                fresh.append(campaign)
+
+            campaign.add(incident, vector)
+            self.campaigns.move_to_end(campaign.id)
+            self._dirty.add(campaign.id)
+            self._stale.add(campaign.id)
+            for key in keys:
+                self._ioc_owner.setdefault(key, campaign.id)
+            assignments.append((incident["_id"], campaign.id))
+
+        return assignments
+
+    def save(self, assignments):
+        """Write changed campaigns, then the incidents' campaign ids."""
+        ops = [
+            ReplaceOne({"_id": campaign_id}, self.campaigns[campaign_id].document(self.terms), upsert=True)
+            for campaign_id in self._dirty
+        ]
+        if ops:
+            self.db[CAMPAIGN_COLLECTION].bulk_write(ops, ordered=False)
+        self._dirty.clear()
+
+        if assignments:
+            self.db.incidents.bulk_write(
+                [UpdateOne({"_id": i}, {"$set": {"campaign_id": c}}) for i, c in assignments],
+                ordered=False
+            )
+
+
+def cluster_new_incidents(db, similarity=0.6, active_days=90, batch_size=1000, vocabulary_sample=20000,
+                          pause_seconds=0.0, logger=None):
+    """
+    Incrementally assign every unassigned incident, oldest first.
+    Returns (incidents assigned, campaigns still active at the end).
+    """
+    vectorizer = fit_campaign_vectorizer(db, vocabulary_sample)
+    if vectorizer is None:
+        return 0, 0
+    if logger:
+        logger.info(f"Fitted campaign vocabulary of {len(vectorizer.vocabulary_)} term(s)")
+
+    clusterer = CampaignClusterer(db, vectorizer, similarity, active_days, logger)
+    loaded = clusterer.load()
+    if logger:
+        logger.info(f"Loaded {loaded} active campaign(s)")
+
+    total = 0
+    last_id = None
+    while True:
+        query = dict(UNASSIGNED_FILTER)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        chunk = list(db.incidents.find(query, CLUSTER_PROJECTION).sort("_id", 1).limit(batch_size))
+        if not chunk:
+            break
+
+        clusterer.save(clusterer.assign_chunk(chunk))
+        total += len(chunk)
+        last_id = chunk[-1]["_id"]
+        if logger:
+            logger.info(f"Clustered {total} incident(s), {len(clusterer.campaigns)} campaign(s)")
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    # Runs outside the app, so bump the shared counter directly
+    if total:
+        db[VERSION_COLLECTION].update_one({"_id": VersionScopes.INCIDENTS}, {"$inc": {"v": 1}}, upsert=True)
+    return total, len(clusterer.campaigns)
+
+
+def top_campaigns(db, limit=20, days=30, min_size=2):
+    """Largest campaigns with incidents in the last `days` days."""
+    since = datetime.utcnow() - timedelta(days=days)
+    return list(
+        db[CAMPAIGN_COLLECTION]
+        .find({"last_seen": {"$gte": since}, "size": {"$gte": min_size}}, {"centroid": 0, "ioc_counts": 0})
+        .sort("size", -1)
+        .limit(limit)
+    )
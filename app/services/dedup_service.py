@@ -0,0 +1,242 @@
+"""
+Dedup Service — Near-duplicate report detection.
+Each report's narrative + IOC text is reduced to a 64-value MinHash
+signature of its word 3-shingles and split into 16 LSH bands of 4 rows.
+Reports sharing any band with an earlier canonical report are compared by
+signature; above DUPLICATE_SIMILARITY the new report reuses the canonical
+analysis instead of running OCR, ML and URL checks again. The band keys also
+carry a digest of the attached files' bytes, so a report only matches one
+with identical attachments (OCR results are reused, never guessed). Band lookups are
+answered from memory, over the canonicals of the last DUPLICATE_INDEX_DAYS;
+`report_signatures` shares canonicals across workers.
+"""
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from app.utils.periodic import run_periodically
+
+SIGNATURE_COLLECTION = "report_signatures"
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# Shorter texts ("see screenshot") are too generic to call duplicates
+MIN_SHINGLES = 8
+
+# Universal hashing (a*x + b) mod P over 32-bit shingle hashes; the seed is
+# fixed so every worker computes identical signatures
+_PRIME = np.uint64(4294967311)
+_rng = np.random.RandomState(20260222)
+_A = _rng.randint(1, 2 ** 32 - 1, size=NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.randint(0, 2 ** 32 - 1, size=NUM_PERM, dtype=np.uint64)[:, None]
+
+_WORD_RE = re.compile(r"\w+")
+
+HASH_CHUNK_BYTES = 64 * 1024
+
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def shingles(text):
+    words = _WORD_RE.findall(text.lower())
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def attachments_digest(files):
+    """Digest of the uploaded files' bytes (order-insensitive), or None without files."""
+    digests = []
+    for file in files:
+        if not file or not file.filename:
+            continue
+        h = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: file.stream.read(HASH_CHUNK_BYTES), b""):
+            h.update(chunk)
+        file.stream.seek(0)
+        digests.append(h.hexdigest())
+    if not digests:
+        return None
+    return hashlib.blake2b("".join(sorted(digests)).encode(), digest_size=8).hexdigest()
+
+
+def band_key(label):
+    """8-byte integer key for a band label; string keys stored earlier map the same way."""
+    return int.from_bytes(hashlib.blake2b(label.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def report_signature(text, attachments=None):
+    """
+    (signature, band_keys) for `text` plus the attachments_digest() of its
+    files, or None when the text is too short to compare meaningfully.
+    """
+    grams = shingles(text or "")
+    if len(grams) < MIN_SHINGLES:
+        return None
+
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    signature = ((_A * hashes[None, :] + _B) % _PRIME).min(axis=1)
+
+    # Reports with different attachments never share a band
+    prefix = f"{attachments}:" if attachments else ""
+    bands = [
+        band_key(f"{i}:{prefix}{hashlib.blake2b(signature[i * ROWS:(i + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}")
+        for i in range(BANDS)
+    ]
+    return signature, bands
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def _stored_bands(doc):
+    return [band_key(band) if isinstance(band, str) else band for band in doc["bands"]]
+
+
+class DuplicateIndex:
+    def __init__(self, db, logger=None, max_entries=50000, max_age_days=30):
+        self.db = db
+        self.logger = logger
+        self.max_entries = max_entries
+        self.max_age = timedelta(days=max_age_days)
+        self._bands = {}                     # band key -> [incident_id]
+        self._signatures = OrderedDict()     # incident_id -> (signature, bands, created_at), oldest first
+        self._lock = threading.Lock()
+        self._synced_until = None
+
+    def find(self, signature, bands, threshold):
+        """Most similar canonical incident at or above `threshold`: (id, similarity)."""
+        with self._lock:
+            candidates = {incident_id for band in bands for incident_id in self._bands.get(band, ())}
+            scored = [(similarity(signature, self._signatures[c][0]), c) for c in candidates]
+
+        best = max(scored, default=(0.0, None), key=lambda s: s[0])
+        return (best[1], best[0]) if best[0] >= threshold else (None, best[0])
+
+    def add(self, incident_id, signature, bands, persist=True, created_at=None):
+        created_at = created_at or datetime.utcnow()
+        if persist:
+            self.db[SIGNATURE_COLLECTION].replace_one(
+                {"_id": incident_id},
+                {"bands": bands, "signature": [int(v) for v in signature], "created_at": created_at},
+                upsert=True
+            )
+        with self._lock:
+            self._insert(incident_id, signature, bands, created_at)
+
+    def _insert(self, incident_id, signature, bands, created_at):
+        if incident_id in self._signatures:
+            return
+        self._signatures[incident_id] = (signature, bands, created_at)
+        for band in bands:
+            self._bands.setdefault(band, []).append(incident_id)
+
+        while len(self._signatures) > self.max_entries:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        old_id, (_, old_bands, _) = self._signatures.popitem(last=False)
+        for band in old_bands:
+            ids = self._bands.get(band)
+            if ids is not None:
+                ids.remove(old_id)
+                if not ids:
+                    del self._bands[band]
+
+    def _expire(self, now):
+        cutoff = now - self.max_age
+        while self._signatures and next(iter(self._signatures.values()))[2] < cutoff:
+            self._evict_oldest()
+
+    def _insert_docs(self, docs, now):
+        with self._lock:
+            for doc in docs:
+                self._insert(doc["_id"], np.array(doc["signature"], dtype=np.uint64), _stored_bands(doc), doc["created_at"])
+            self._expire(now)
+
+    def load(self):
+        """Fill memory with the newest `max_entries` canonical signatures of the last `max_age`."""
+        now = datetime.utcnow()
+        docs = list(
+            self.db[SIGNATURE_COLLECTION].find({"created_at": {"$gte": now - self.max_age}})
+            .sort("created_at", -1).limit(self.max_entries)
+        )
+        self._insert_docs(reversed(docs), now)
+        self._synced_until = now
+
+    def sync(self):
+        """Pick up canonicals registered by other workers."""
+        if self._synced_until is None:
+            # Loading at startup failed: same bounds as a load
+            return self.load()
+
+        now = datetime.utcnow()
+        docs = list(
+            self.db[SIGNATURE_COLLECTION].find({"created_at": {"$gte": self._synced_until - SYNC_OVERLAP}})
+            .sort("created_at", 1)
+        )
+        self._insert_docs(docs, now)
+        self._synced_until = now
+
+    def size(self):
+        return len(self._signatures)
+
+
+def init_duplicate_index(app):
+    """Attach the duplicate index to the app, load it and start its sync loop."""
+    index = DuplicateIndex(
+        app.db, app.logger,
+        app.config.get("DUPLICATE_INDEX_SIZE", 50000),
+        app.config.get("DUPLICATE_INDEX_DAYS", 30)
+    )
+    try:
+        index.load()
+    except Exception as e:
+        app.logger.warning(f"Loading report signatures failed: {e}")
+
+    run_periodically("duplicate-sync", app.config.get("DUPLICATE_SYNC_SECONDS", 5.0), index.sync, app.logger)
+    app.duplicate_index = index
+    return index
+
+
+# Analysis fields a duplicate copies from its canonical incident
+REUSED_FIELDS = [
+    "risk_score", "risk_level", "risk_reasons", "flagged",
+    "threat_type_suggested", "classification_confidence", "playbook"
+]
+
+# Review fields a duplicate copies when its canonical incident was already reviewed
+VERDICT_FIELDS = [
+    "status", "analyst_reviewed", "analyst_name", "reviewed_at", "threat_type",
+    "final_verdict", "analyst_notes", "response_actions", "preventive_advice"
+]
+
+
+def find_canonical(db, fingerprint):
+    """
+    Canonical incident (analysis and review fields only) for a report fingerprint from
+    report_signature(), with its similarity; (None, 0) when there is none.
+    """
+    index = getattr(current_app, "duplicate_index", None)
+    if index is None or fingerprint is None:
+        return None, 0.0
+
+    threshold = current_app.config.get("DUPLICATE_SIMILARITY", 0.85)
+    incident_id, score = index.find(*fingerprint, threshold)
+    if incident_id is None:
+        return None, score
+
+    canonical = db.incidents.find_one({"_id": incident_id}, {field: 1 for field in REUSED_FIELDS + VERDICT_FIELDS})
+    return canonical, score
+
+
+def register_canonical(incident_id, fingerprint, created_at=None):
+    index = getattr(current_app, "duplicate_index", None)
+    if index is not None and fingerprint is not None:
+        index.add(incident_id, *fingerprint, created_at=created_at)
@@ -0,0 +1,202 @@
+"""
+Event Stream — Live incident events for analyst dashboards.
+One shared MongoDB change stream per worker is fanned out to every connected
+SSE client. Servers without change streams (standalone mongod) fall back to
+in-process publishing from the write paths; those events only reach clients
+connected to the same worker, so that mode needs a single worker (or a
+replica set). Recent events are buffered so a client reconnecting with
+Last-Event-ID gets what it missed.
+Every open stream holds a server thread (or greenlet) for its lifetime, so
+streams per worker are capped at SSE_MAX_STREAMS.
+"""
+import itertools
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from flask import current_app
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Change streams need a replica set / sharded cluster
+CHANGE_STREAM_UNSUPPORTED_CODES = (40573, 40324, 20)
+
+WATCH_PIPELINE = [
+    {"$match": {"$or": [
+        {"operationType": "insert"},
+        {"operationType": "update", "updateDescription.updatedFields.status": {"$exists": True}}
+    ]}},
+    {"$project": {
+        "operationType": 1,
+        "documentKey": 1,
+        "fullDocument._id": 1,
+        "fullDocument.status": 1,
+        "fullDocument.risk_level": 1,
+        "fullDocument.risk_score": 1,
+        "fullDocument.flagged": 1,
+        "fullDocument.platform": 1,
+        "fullDocument.title": 1,
+        "fullDocument.created_at": 1
+    }}
+]
+
+
+class EventTypes:
+    INCIDENT_CREATED = "incident.created"
+    INCIDENT_STATUS = "incident.status"
+    RESET = "reset"
+
+
+def build_event(event_type, incident):
+    """Compact event payload from (a subset of) an incident document."""
+    created_at = incident.get("created_at")
+    return {
+        "type": event_type,
+        "id": str(incident.get("_id")),
+        "status": incident.get("status"),
+        "risk_level": incident.get("risk_level"),
+        "risk_score": incident.get("risk_score"),
+        "flagged": incident.get("flagged", False),
+        "platform": incident.get("platform"),
+        "title": incident.get("title"),
+        "created_at": created_at.isoformat() + "Z" if created_at else None
+    }
+
+
+class HubFull(Exception):
+    """The worker already serves its maximum number of event streams."""
+
+
+class _Subscriber:
+    def __init__(self, max_pending):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.dropped = False
+
+
+class IncidentEventHub:
+    def __init__(self, db, logger, buffer_size=1000, max_pending=256, max_subscribers=None):
+        self.db = db
+        self.logger = logger
+        self.mode = "local"
+        self._buffer = deque(maxlen=buffer_size)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._max_pending = max_pending
+        self._max_subscribers = max_subscribers
+        self._local_prefix = uuid.uuid4().hex[:8]
+        self._local_seq = itertools.count(1)
+        self._resume_token = None
+
+    # --- sources -------------------------------------------------------
+
+    def start(self):
+        """Open the shared change stream, or stay in local mode."""
+        try:
+            stream = self.db.incidents.watch(WATCH_PIPELINE, full_document="updateLookup")
+        except OperationFailure as e:
+            if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                self.logger.info("Change streams unavailable, using in-process incident events")
+                return self
+            raise
+        except (PyMongoError, NotImplementedError) as e:
+            self.logger.warning(f"Change stream failed to open, using in-process incident events: {e}")
+            return self
+
+        self.mode = "change_stream"
+        threading.Thread(target=self._watch, args=(stream,), name="incident-watcher", daemon=True).start()
+        return self
+
+    def _watch(self, stream):
+        while True:
+            try:
+                with stream:
+                    for change in stream:
+                        self._resume_token = change["_id"]
+                        self._dispatch(self._token_id(change["_id"]), self._from_change(change))
+            except PyMongoError as e:
+                self.logger.error(f"Incident change stream interrupted: {e}")
+                time.sleep(1)
+
+            try:
+                stream = self.db.incidents.watch(
+                    WATCH_PIPELINE, full_document="updateLookup", resume_after=self._resume_token
+                )
+            except PyMongoError as e:
+                self.logger.error(f"Incident change stream resume failed: {e}")
+                time.sleep(1)
+
+    @staticmethod
+    def _token_id(token):
+        return token.get("_data") if isinstance(token, dict) else str(token)
+
+    @staticmethod
+    def _from_change(change):
+        incident = change.get("fullDocument") or {"_id": change["documentKey"]["_id"]}
+        if change["operationType"] == "insert":
+            return build_event(EventTypes.INCIDENT_CREATED, incident)
+        return build_event(EventTypes.INCIDENT_STATUS, incident)
+
+    def publish(self, event):
+        """In-process publish from a write path (ignored when a change stream is active)."""
+        if self.mode != "local":
+            return
+        self._dispatch(f"{self._local_prefix}-{next(self._local_seq)}", event)
+
+    # --- fan-out -------------------------------------------------------
+
+    def _dispatch(self, event_id, event):
+        with self._lock:
+            self._buffer.append((event_id, event))
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait((event_id, event))
+            except queue.Full:
+                # Slow client: disconnect it, it will resume from Last-Event-ID
+                subscriber.dropped = True
+                self.unsubscribe(subscriber)
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a subscriber. Returns (subscriber, backlog); backlog holds
+        buffered events after `last_event_id`, or a reset event when that id
+        is no longer buffered. Raises HubFull at the subscriber cap.
+        """
+        subscriber = _Subscriber(self._max_pending)
+        with self._lock:
+            if self._max_subscribers and len(self._subscribers) >= self._max_subscribers:
+                raise HubFull()
+            self._subscribers.add(subscriber)
+            buffered = list(self._buffer)
+
+        backlog = []
+        if last_event_id:
+            ids = [event_id for event_id, _ in buffered]
+            if last_event_id in ids:
+                backlog = buffered[ids.index(last_event_id) + 1:]
+            else:
+                backlog = [(None, {"type": EventTypes.RESET})]
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+def init_event_hub(app):
+    """Attach the incident event hub to the app and start its source."""
+    app.event_hub = IncidentEventHub(
+        app.db, app.logger, max_subscribers=app.config.get("SSE_MAX_STREAMS", 32)
+    ).start()
+    return app.event_hub
+
+
+def publish_incident_event(event_type, incident):
+    """Publish from a write path; a no-op when change streams feed the hub."""
+    hub = getattr(current_app, "event_hub", None)
+    if hub is not None:
+        hub.publish(build_event(event_type, incident))
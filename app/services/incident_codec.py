@@ -0,0 +1,144 @@
+"""
+Incident Codec — Compact stored representation.
+Incidents keep a playbook reference instead of copied guidance lists, risk
+reasons as short codes ("kh:password"), and OCR text zlib-compressed (with
+its distinct words kept in clear as `ocr_terms` for the search index).
+`expand_incident` restores the full read shape from in-memory tables.
+"""
+import re
+import zlib
+from bson.binary import Binary
+from app.constants.incident_constants import (
+    PLAYBOOK, PLAYBOOK_VERSION, PLAYBOOK_VERSIONS, RISK_REASON_TEXT
+)
+
+FALLBACK_PLAYBOOK_KEY = "Suspicious Message"
+
+# Cap on distinct OCR words kept for the text index
+MAX_OCR_TERMS = 2000
+
+_WORD_RE = re.compile(r"\w+")
+
+# Legacy reason text -> code, e.g. "high risk keyword: otp" -> "kh:otp"
+_LEGACY_REASON_PATTERNS = [
+    (code, re.compile("^" + re.escape(template).replace(r"\{\}", "(.+)") + "$"))
+    for code, template in RISK_REASON_TEXT.items()
+]
+
+
+def encode_reason(code, param=None):
+    """Build a compact reason string."""
+    return f"{code}:{param}" if param is not None else code
+
+
+def describe_reason(reason):
+    """Expand a compact reason; legacy free-text reasons pass through."""
+    code, _, param = reason.partition(":")
+    template = RISK_REASON_TEXT.get(code)
+    if template is None:
+        return reason
+    return template.format(param) if "{}" in template else template
+
+
+def describe_reasons(reasons):
+    return [describe_reason(r) for r in reasons or []]
+
+
+def playbook_ref(threat_type):
+    """Reference to the playbook entry used for `threat_type`."""
+    key = threat_type if threat_type in PLAYBOOK else FALLBACK_PLAYBOOK_KEY
+    return {"key": key, "v": PLAYBOOK_VERSION}
+
+
+def resolve_playbook(ref):
+    """Guidance dict for a stored playbook reference."""
+    playbook = PLAYBOOK_VERSIONS.get(ref.get("v"), PLAYBOOK)
+    return playbook.get(ref.get("key"), playbook[FALLBACK_PLAYBOOK_KEY])
+
+
+def compress_text(text):
+    if not text:
+        return None
+    return Binary(zlib.compress(text.encode("utf-8"), 6))
+
+
+def decompress_text(blob):
+    if not blob:
+        return None
+    return zlib.decompress(bytes(blob)).decode("utf-8")
+
+
+def ocr_terms(text):
+    """Distinct lowercase words of `text`, in first-seen order, as one string."""
+    if not text:
+        return None
+    terms = dict.fromkeys(_WORD_RE.findall(text.lower()))
+    return " ".join(list(terms)[:MAX_OCR_TERMS])
+
+
+def expand_incident(incident):
+    """Restore the full read shape of a compact incident (in place)."""
+    if incident is None:
+        return None
+
+    ref = incident.pop("playbook", None)
+    if ref:
+        guidance = resolve_playbook(ref)
+        incident.setdefault("immediate_actions", guidance["immediate"])
+        incident.setdefault("preventive_advice", guidance["preventive"])
+
+    if "risk_reasons" in incident:
+        incident["risk_reasons"] = describe_reasons(incident["risk_reasons"])
+
+    if "ocr_text_z" in incident:
+        incident["ocr_extracted_text"] = decompress_text(incident.pop("ocr_text_z"))
+    incident.pop("ocr_terms", None)
+
+    return incident
+
+
+def _compact_legacy_reason(reason):
+    for code, pattern in _LEGACY_REASON_PATTERNS:
+        match = pattern.match(reason)
+        if match:
+            return encode_reason(code, match.group(1) if match.groups() else None)
+    return reason
+
+
+def compact_legacy_incident(incident):
+    """
+    Build the $set/$unset update that rewrites a legacy incident compactly.
+    Returns None when there is nothing to change.
+    """
+    set_fields = {}
+    unset_fields = {}
+
+    reasons = incident.get("risk_reasons") or []
+    compact_reasons = [_compact_legacy_reason(r) for r in reasons]
+    if compact_reasons != reasons:
+        set_fields["risk_reasons"] = compact_reasons
+
+    # Guidance is only dropped when it is an untouched playbook copy
+    if "immediate_actions" in incident and "playbook" not in incident:
+        ref = playbook_ref(incident.get("threat_type_suggested"))
+        guidance = resolve_playbook(ref)
+        if incident.get("immediate_actions") == guidance["immediate"]:
+            set_fields["playbook"] = ref
+            unset_fields["immediate_actions"] = ""
+            if not incident.get("analyst_reviewed") and incident.get("preventive_advice") == guidance["preventive"]:
+                unset_fields["preventive_advice"] = ""
+
+    ocr_text = incident.get("ocr_extracted_text")
+    if isinstance(ocr_text, str) and ocr_text:
+        set_fields["ocr_text_z"] = compress_text(ocr_text)
+        set_fields["ocr_terms"] = ocr_terms(ocr_text)
+        unset_fields["ocr_extracted_text"] = ""
+    elif incident.get("ocr_text_z") and "ocr_terms" not in incident:
+        set_fields["ocr_terms"] = ocr_terms(decompress_text(incident["ocr_text_z"]))
+
+    update = {}
+    if set_fields:
+        update["$set"] = set_fields
+    if unset_fields:
+        update["$unset"] = unset_fields
+    return update or None
@@ -0,0 +1,131 @@
+"""
+IOC Extractor — Indicators of compromise from report text.
+One compiled pattern scans narrative, IOC field and OCR text in a single
+pass for URLs, emails, UPI/wallet IDs, IPv4 addresses, file hashes, phone
+numbers and bare domains. Each indicator is normalized to a `type:value`
+key so the same number or domain written differently in two reports
+matches in the `iocs` index.
+"""
+import re
+from urllib.parse import urlsplit
+
+
+class IocTypes:
+    URL = "url"
+    DOMAIN = "domain"
+    EMAIL = "email"
+    UPI = "upi"
+    IP = "ip"
+    PHONE = "phone"
+    HASH = "hash"
+
+
+# Common gTLDs; any two-letter ccTLD is accepted as well
+KNOWN_TLDS = {
+    "com", "net", "org", "info", "biz", "xyz", "top", "online", "site", "club", "app", "dev",
+    "live", "shop", "store", "link", "click", "icu", "buzz", "gov", "edu", "mil", "int",
+    "co", "io", "me", "ly", "tk", "ml", "ga", "cf", "gq", "in", "cc", "ru", "cn", "pk",
+}
+
+_OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+
+# Alternatives are tried in order at each position: URLs before the
+# emails/domains they contain, hashes before phone-like digit runs
+IOC_PATTERN = re.compile(
+    r"(?P<url>\b(?:https?://|www\.)[^\s<>\"'`]+)"
+    r"|(?P<email>\b[\w.+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,24}\b)"
+    r"|(?P<upi>\b[\w.-]{2,256}@[a-z][a-z0-9]{1,63}\b)"
+    rf"|(?P<ip>\b{_OCTET}(?:\.{_OCTET}){{3}}\b)"
+    r"|(?P<hash>\b(?:[a-f0-9]{64}|[a-f0-9]{40}|[a-f0-9]{32})\b)"
+    r"|(?P<phone>(?<![\w+])\+?\d(?:[\s-]?\d){7,14}(?!\w))"
+    r"|(?P<domain>\b(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,24}\b)",
+    re.IGNORECASE
+)
+
+IP_PATTERN = re.compile(rf"{_OCTET}(?:\.{_OCTET}){{3}}")
+
+_TRAILING_PUNCTUATION = ".,;:!?)]}'\""
+
+
+def _normalize_url(raw):
+    url = raw.rstrip(_TRAILING_PUNCTUATION)
+    if url.lower().startswith("www."):
+        url = "http://" + url
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+    except ValueError:  # e.g. an unbalanced "[" in the host
+        return None, None
+    if not host:
+        return None, None
+    netloc = f"[{host}]" if ":" in host else host  # IPv6 literal
+    normalized = f"{parts.scheme.lower()}://{netloc}{parts.path.rstrip('/')}"
+    if parts.query:
+        normalized += "?" + parts.query
+    return normalized, host
+
+
+def _valid_domain(domain):
+    tld = domain.rsplit(".", 1)[-1]
+    return tld in KNOWN_TLDS or (len(tld) == 2 and tld.isalpha())
+
+
+def _normalize_phone(raw):
+    digits = re.sub(r"\D", "", raw)
+    # Indian mobile numbers, with or without the 91/0 prefix
+    if len(digits) == 10 and digits[0] in "6789":
+        return "91" + digits
+    if len(digits) == 11 and digits[0] == "0" and digits[1] in "6789":
+        return "91" + digits[1:]
+    if len(digits) == 12 and digits.startswith("91") and digits[2] in "6789":
+        return digits
+    if raw.strip().startswith("+") and 8 <= len(digits) <= 15:
+        return digits
+    return None
+
+
+def _ioc(ioc_type, value):
+    return {"key": f"{ioc_type}:{value}", "type": ioc_type, "value": value}
+
+
+def extract_iocs(*texts):
+    """
+    All distinct indicators in `texts`, in first-seen order.
+    Returns a list of {"key", "type", "value"}.
+    """
+    found = {}
+
+    def add(ioc_type, value):
+        if value:
+            ioc = _ioc(ioc_type, value)
+            found.setdefault(ioc["key"], ioc)
+
+    for text in texts:
+        if not text:
+            continue
+        for match in IOC_PATTERN.finditer(text):
+            kind = match.lastgroup
+            raw = match.group(kind)
+
+            if kind == "url":
+                url, host = _normalize_url(raw)
+                add(IocTypes.URL, url)
+                # Hosts like "localhost" or "[::1]" are not indexed as domains
+                if host and "." in host and ":" not in host and not IP_PATTERN.fullmatch(host):
+                    add(IocTypes.DOMAIN, host[4:] if host.startswith("www.") else host)
+            elif kind == "email":
+                add(IocTypes.EMAIL, raw.lower())
+            elif kind == "upi":
+                add(IocTypes.UPI, raw.lower())
+            elif kind == "ip":
+                add(IocTypes.IP, raw)
+            elif kind == "hash":
+                add(IocTypes.HASH, raw.lower())
+            elif kind == "phone":
+                add(IocTypes.PHONE, _normalize_phone(raw))
+            elif kind == "domain":
+                domain = raw.lower()
+                if _valid_domain(domain):
+                    add(IocTypes.DOMAIN, domain[4:] if domain.startswith("www.") else domain)
+
+    return list(found.values())
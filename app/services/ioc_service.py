@@ -0,0 +1,90 @@
+"""
+IOC Service — Cross-incident indicator index.
+`iocs` holds one row per (indicator key, incident), so "which other reports
+mention this number/domain" is a single indexed lookup on `key`. Incidents
+keep their own keys in `ioc_keys` for the shared-IOC counts on detail views.
+"""
+from datetime import datetime
+from pymongo import UpdateOne
+from app.services.archive_service import ARCHIVE_COLLECTION
+
+IOC_COLLECTION = "iocs"
+
+# Most incidents returned for one indicator lookup
+MAX_LOOKUP_INCIDENTS = 100
+
+SUMMARY_PROJECTION = {
+    "platform": 1, "reported_by": 1, "created_at": 1, "status": 1,
+    "risk_level": 1, "risk_score": 1, "threat_type_suggested": 1
+}
+
+
+def index_operations(incident_id, iocs, created_at=None):
+    """Idempotent upserts adding `incident_id` under each indicator key."""
+    created_at = created_at or datetime.utcnow()
+    return [
+        UpdateOne(
+            {"key": ioc["key"], "incident_id": incident_id},
+            {"$setOnInsert": {"type": ioc["type"], "value": ioc["value"], "created_at": created_at}},
+            upsert=True
+        )
+        for ioc in iocs
+    ]
+
+
+def index_incident_iocs(db, incident_id, iocs, write_queue=None, created_at=None):
+    """Add an incident's indicators to the index (queued when a writer is given)."""
+    ops = index_operations(incident_id, iocs, created_at)
+    if not ops:
+        return
+    if write_queue is not None:
+        for op in ops:
+            write_queue.submit(IOC_COLLECTION, op)
+    else:
+        db[IOC_COLLECTION].bulk_write(ops, ordered=False)
+
+
+def remove_incident_iocs(db, incident_id):
+    db[IOC_COLLECTION].delete_many({"incident_id": incident_id})
+
+
+def _summaries(db, incident_ids):
+    found = {i["_id"]: i for i in db.incidents.find({"_id": {"$in": incident_ids}}, SUMMARY_PROJECTION)}
+    missing = [i for i in incident_ids if i not in found]
+    if missing:
+        for archived in db[ARCHIVE_COLLECTION].find({"_id": {"$in": missing}}, {"payload": 0, "codec": 0}):
+            archived["archived"] = True
+            found[archived["_id"]] = archived
+    return [found[i] for i in incident_ids if i in found]
+
+
+def lookup_ioc(db, key, limit=MAX_LOOKUP_INCIDENTS):
+    """Newest incidents mentioning indicator `key`, plus the total count."""
+    rows = db[IOC_COLLECTION].find({"key": key}, {"incident_id": 1, "_id": 0}) \
+        .sort("incident_id", -1).limit(limit)
+    incident_ids = [row["incident_id"] for row in rows]
+
+    return {
+        "key": key,
+        "total": db[IOC_COLLECTION].count_documents({"key": key}),
+        "incidents": _summaries(db, incident_ids)
+    }
+
+
+def shared_ioc_counts(db, incident):
+    """Indicators of `incident` that also appear in other incidents."""
+    keys = incident.get("ioc_keys") or []
+    if not keys:
+        return []
+
+    counts = db[IOC_COLLECTION].aggregate([
+        {"$match": {"key": {"$in": keys}}},
+        {"$group": {"_id": "$key", "incidents": {"$sum": 1}}},
+        {"$match": {"incidents": {"$gt": 1}}}
+    ])
+
+    shared = []
+    for row in counts:
+        ioc_type, _, value = row["_id"].partition(":")
+        shared.append({"key": row["_id"], "type": ioc_type, "value": value, "other_incidents": row["incidents"] - 1})
+    return sorted(shared, key=lambda s: s["other_incidents"], reverse=True)
@@ -2,6 +2,9 @@ import psutil
 import time
 from datetime import datetime
 from flask import current_app
+from app.services.risk_engine import pipeline_stats
+from app.services.ai_analysis import sentiment_cache
+from app.services.ocr_service import ocr_backend_stats
 
 def get_system_metrics():
     """
@@ -54,5 +57,23 @@ def get_system_metrics():
             "memory_percent": psutil.virtual_memory().percent
         }
     }
+
+    hasher = getattr(current_app, "password_hasher", None)
+    if hasher is not None:
+        metrics["password_hasher"] = hasher.stats()
+
+    revocations = getattr(current_app, "revocations", None)
+    metrics["token_revocation"] = revocations.stats() if revocations is not None else {"degraded": True}
+
+    safe_browsing = getattr(current_app, "safe_browsing", None)
+    if safe_browsing is not None:
+        metrics["safe_browsing"] = safe_browsing.stats()
+
+    metrics["report_pipeline"] = pipeline_stats.stats()
+    metrics["sentiment_cache"] = sentiment_cache.stats()
+
+    ocr_backend = ocr_backend_stats()
+    if ocr_backend is not None:
+        metrics["ocr_backend"] = ocr_backend
     
     return metrics
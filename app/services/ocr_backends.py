@@ -0,0 +1,180 @@
+"""
+OCR Backends — How an image reaches Tesseract.
+`tesserocr` keeps a pool of initialized in-process engines (language model
+loaded once, no temp files, GIL released while recognizing); the subprocess
+backend runs the `tesseract` binary through pytesseract per image. OCR_BACKEND
+picks one ("auto" prefers the pool when tesserocr is installed).
+tesserocr is imported only when the backend is created: OpenMP reads
+OMP_THREAD_LIMIT once, when Tesseract's library is loaded, so the limit must
+be in the environment before that import.
+"""
+import math
+import os
+import queue
+import threading
+import time
+from functools import lru_cache
+import pytesseract
+
+_NOT_LOADED = object()
+tesserocr = _NOT_LOADED  # see load_tesserocr()
+
+WINDOWS_TESSERACT_PATH = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+# Tesseract's own clock may stop it marginally before our deadline
+DEADLINE_SLACK_SECONDS = 0.01
+
+
+class OcrDeadline(Exception):
+    """The report deadline passed before an image could be read."""
+
+
+class OcrError(Exception):
+    """Tesseract failed to read an image (not a timeout)."""
+
+
+def load_tesserocr():
+    """Import tesserocr on first use (None when it is not installed)."""
+    global tesserocr
+    if tesserocr is _NOT_LOADED:
+        try:
+            import tesserocr as module
+        except ImportError:  # pragma: no cover - optional speedup
+            module = None
+        tesserocr = module
+    return tesserocr
+
+
+class BackendNames:
+    AUTO = "auto"
+    TESSEROCR = "tesserocr"
+    SUBPROCESS = "subprocess"
+
+
+@lru_cache(maxsize=1)
+def get_tesseract_cmd():
+    """Tesseract binary: TESSERACT_CMD, the default Windows install, else PATH."""
+    custom_path = os.getenv("TESSERACT_CMD")
+    if custom_path and os.path.exists(custom_path):
+        return custom_path
+    if os.name == "nt" and os.path.exists(WINDOWS_TESSERACT_PATH):
+        return WINDOWS_TESSERACT_PATH
+    return "tesseract"  # fallback to PATH
+
+
+def _remaining(deadline):
+    """Seconds left before `deadline` (None: no deadline)."""
+    if deadline is None:
+        return None
+    timeout = deadline - time.monotonic()
+    if timeout <= 0:
+        raise OcrDeadline()
+    return timeout
+
+
+class SubprocessBackend:
+    name = BackendNames.SUBPROCESS
+
+    def __init__(self, lang=None):
+        self.lang = lang
+        pytesseract.pytesseract.tesseract_cmd = get_tesseract_cmd()
+
+    def recognize(self, image, deadline=None):
+        timeout = _remaining(deadline) or 0  # pytesseract: 0 = no timeout
+        try:
+            return pytesseract.image_to_string(image, lang=self.lang, timeout=timeout)
+        except RuntimeError as e:
+            # pytesseract kills Tesseract and raises RuntimeError on timeout
+            if "timeout" in str(e).lower():
+                raise OcrDeadline() from e
+            raise
+
+    def stats(self):
+        return {"backend": self.name}
+
+
+class EnginePoolBackend:
+    """Initialized tesserocr engines, checked out one per recognition."""
+    name = BackendNames.TESSEROCR
+
+    def __init__(self, size, lang=None):
+        self.size = size
+        self.lang = lang or "eng"
+        self._engines = queue.LifoQueue()
+        self._created = 0
+        self._creating = 0
+        self._lock = threading.Lock()
+        self.init_seconds = 0.0
+        # One engine up front, so a broken install fails here and not per image
+        self._engines.put(self._create())
+
+    def _create(self):
+        start = time.perf_counter()
+        engine = tesserocr.PyTessBaseAPI(lang=self.lang)
+        with self._lock:
+            self._created += 1
+            self.init_seconds += time.perf_counter() - start
+        return engine
+
+    def _checkout(self):
+        try:
+            return self._engines.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Engines are created lazily, up to one per OCR worker
+        with self._lock:
+            create = self._created + self._creating < self.size
+            if create:
+                self._creating += 1
+        if not create:
+            return self._engines.get()
+        try:
+            return self._create()
+        finally:
+            with self._lock:
+                self._creating -= 1
+
+    def recognize(self, image, deadline=None):
+        timeout = _remaining(deadline)
+        engine = self._checkout()
+        try:
+            engine.SetImage(image)
+            if not engine.Recognize(math.ceil(timeout * 1000) if timeout else 0):
+                # Recognize() is False for a timeout and for a failed recognition alike
+                if deadline is not None and time.monotonic() >= deadline - DEADLINE_SLACK_SECONDS:
+                    raise OcrDeadline()
+                raise OcrError("Tesseract could not recognize the image")
+            return engine.GetUTF8Text()
+        finally:
+            engine.Clear()
+            self._engines.put(engine)
+
+    def stats(self):
+        return {
+            "backend": self.name,
+            "engines": self._created,
+            "idle": self._engines.qsize(),
+            "init_ms": round(self.init_seconds * 1000, 1)
+        }
+
+
+def create_ocr_backend(name=BackendNames.AUTO, size=1, lang=None, logger=None):
+    """
+    Build the configured backend, falling back to the subprocess path. With
+    more than one engine, each Tesseract is limited to one OpenMP thread.
+    """
+    if size > 1:
+        # Strips already run in parallel; must be set before tesserocr is imported
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+    if name in (BackendNames.AUTO, BackendNames.TESSEROCR):
+        if load_tesserocr() is not None:
+            try:
+                return EnginePoolBackend(size, lang)
+            except RuntimeError as e:
+                if logger:
+                    logger.warning(f"tesserocr engine failed to start ({e}), using the tesseract binary")
+        elif name == BackendNames.TESSEROCR and logger:
+            logger.warning("OCR_BACKEND=tesserocr but tesserocr is not installed, using the tesseract binary")
+    return SubprocessBackend(lang)
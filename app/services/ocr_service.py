@@ -1,67 +1,265 @@
 """
 OCR Service — Extract text from uploaded images using Tesseract.
 The extracted text is fed into the NLP risk engine for analysis.
+Tall images (scrolling chat screenshots) are cut into overlapping horizontal
+strips at blank rows; the strips of every image in a report are OCR'd
+concurrently and stitched back in order with the overlapping lines removed.
+Each image is decoded by its own OCR job, and only OCR_WORKERS images of a
+report are decoded at any time.
 """
-import pytesseract
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+import numpy as np
 from PIL import Image
 from flask import current_app
-import os
+from app.services.ocr_backends import OcrDeadline, create_ocr_backend
+
+# Result reason for images not (fully) read before the report deadline
+DEADLINE_REASON = "Deadline exceeded"
+TOO_LARGE_REASON = "Image too large"
+BUDGET_REASON = "Report image budget exceeded"
+
+ALLOWED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".webp")
+# Decoders Pillow may use, whatever the file claims to be
+ALLOWED_FORMATS = ("PNG", "JPEG", "BMP", "TIFF", "WEBP")
+
+# Images taller than TILE_MIN_ASPECT x their width are OCR'd in strips
+TILE_MIN_ASPECT = 2.0
+# Strip cuts move to the quietest row within this many pixels of the target
+CUT_SEARCH_PIXELS = 80
+# Longest run of repeated lines looked for where two strips overlap
+MAX_OVERLAP_LINES = 8
+OVERLAP_LINE_SIMILARITY = 0.85
+
+_NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+_DIGITS_RE = re.compile(r"\d+")
+
+_executor = None
+_backend = None
+_workers = 1
+_runtime_lock = threading.Lock()
+
+
+def _get_runtime():
+    """Shared strip executor, OCR backend and worker count, sized by OCR_WORKERS."""
+    global _executor, _backend, _workers
+    with _runtime_lock:
+        if _executor is None:
+            config = current_app.config
+            _workers = config.get("OCR_WORKERS") or os.cpu_count() or 1
+            _backend = create_ocr_backend(
+                config.get("OCR_BACKEND", "auto"), size=_workers, logger=current_app.logger
+            )
+            _executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix="ocr")
+        return _executor, _backend, _workers
+
+
+def ocr_backend_stats():
+    return _backend.stats() if _backend is not None else None
+
+
+def _quietest_row(activity, lo, hi):
+    return lo + int(np.argmin(activity[lo:hi]))
+
+
+def tile_bounds(image, tile_height, overlap):
+    """
+    (top, bottom) row ranges covering `image` in strips of about
+    `tile_height`, consecutive strips sharing about `overlap` rows. Cuts are
+    moved to the quietest nearby row so text lines are not sliced.
+    """
+    width, height = image.size
+    if height <= tile_height or height < TILE_MIN_ASPECT * width:
+        return [(0, height)]
+
+    # Row "activity": blank rows are uniform whatever the theme (light/dark)
+    activity = np.asarray(image.convert("L"), dtype=np.float32).std(axis=1)
+
+    bounds = []
+    top = 0
+    while top + tile_height < height:
+        target = top + tile_height
+        lo = max(top + tile_height // 2, target - CUT_SEARCH_PIXELS)
+        # Strips end just after a quiet row and start on one
+        bottom = _quietest_row(activity, lo, min(height, target + CUT_SEARCH_PIXELS)) + 1
+        bounds.append((top, bottom))
+
+        start = bottom - overlap
+        top = _quietest_row(activity, max(top + 1, start - CUT_SEARCH_PIXELS // 2), max(top + 2, start))
+    bounds.append((top, height))
+    return bounds
+
+
+def _normalize_line(line):
+    return _NORMALIZE_RE.sub(" ", line.lower()).strip()
+
+
+def _same_line(x, y):
+    if x == y:
+        return True
+    # OCR noise may differ, numbers (amounts, phones, counters) must not
+    return _DIGITS_RE.findall(x) == _DIGITS_RE.findall(y) and \
+        SequenceMatcher(None, x, y).ratio() >= OVERLAP_LINE_SIMILARITY
 
 
-def get_tesseract_cmd():
-    """Get Tesseract command path from config or default Windows location."""
-    default_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-    custom_path = os.getenv("TESSERACT_CMD", default_path)
+def _same_lines(a, b):
+    return all(_same_line(x, y) for x, y in zip(a, b))
 
-    if os.path.exists(custom_path):
-        return custom_path
-    return "tesseract"  # fallback to PATH
 
+def merge_strip_texts(texts):
+    """Join strip texts in order, dropping the lines repeated across each overlap."""
+    merged = []
+    for text in texts:
+        lines = [line for line in text.splitlines() if line.strip()]
+        if merged and lines:
+            tail = [_normalize_line(line) for line in merged[-MAX_OVERLAP_LINES:]]
+            head = [_normalize_line(line) for line in lines[:MAX_OVERLAP_LINES]]
+            for k in range(min(len(tail), len(head)), 0, -1):
+                if _same_lines(tail[-k:], head[:k]):
+                    lines = lines[k:]
+                    break
+        merged.extend(lines)
+    return "\n".join(merged)
 
-def extract_text_from_images(file_list):
+
+def _strips(image, config):
+    if not config.get("OCR_TILING", True):
+        return [image]
+    bounds = tile_bounds(image, config.get("OCR_TILE_HEIGHT", 1600), config.get("OCR_TILE_OVERLAP", 120))
+    if len(bounds) == 1:
+        return [image]
+    width = image.size[0]
+    return [image.crop((0, top, width, bottom)) for top, bottom in bounds]
+
+
+def _open_image(file, max_pixels):
+    """Read an upload's header only, refusing oversized images before any pixel is decoded."""
+    try:
+        image = Image.open(file.stream, formats=ALLOWED_FORMATS)
+    except Image.DecompressionBombError:
+        return None
+    width, height = image.size
+    if max_pixels and width * height > max_pixels:
+        image.close()
+        return None
+    return image
+
+
+def _read_image(image, config, executor, backend, deadline, on_decoded):
+    """
+    OCR job for one image: decode it here rather than upfront, then recognize
+    its first strip and queue the rest. Returns (first strip text, futures of
+    the other strips); never waits on the pool, which runs this job.
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        raise OcrDeadline()
+    image.load()
+    strips = _strips(image, config)
+    if on_decoded is not None:
+        on_decoded()
+
+    rest = [executor.submit(backend.recognize, strip, deadline) for strip in strips[1:]]
+    try:
+        first = backend.recognize(strips[0], deadline)
+    except Exception:
+        for future in rest:
+            future.cancel()
+        raise
+    return first, rest
+
+
+def _collect(job):
+    """Wait for an image's OCR job and its strips. Returns its result entry and text."""
+    filename = job["filename"]
+    strips = []
+    try:
+        first, strips = job["future"].result()
+        if not strips:
+            extracted = first.strip()
+        else:
+            extracted = merge_strip_texts([first] + [f.result() for f in strips]).strip()
+    except OcrDeadline:
+        for future in strips:
+            future.cancel()
+        current_app.logger.warning(f"OCR timed out for {filename}")
+        return {"filename": filename, "status": "skipped", "reason": DEADLINE_REASON}, None
+    except Exception as e:
+        current_app.logger.error(f"OCR failed for {filename}: {e}")
+        return {"filename": filename, "status": "error", "reason": str(e)}, None
+
+    result = {"filename": filename, "status": "success", "text_length": len(extracted)}
+    if strips:
+        result["tiles"] = len(strips) + 1
+    return result, extracted
+
+
+def extract_text_from_images(file_list, time_budget=None, on_decoded=None):
     """
     Extract text from a list of uploaded image files using Tesseract OCR.
+    With `time_budget` (seconds), images left when it runs out are skipped.
+    Headers are checked upfront against OCR_MAX_IMAGE_PIXELS and the report's
+    OCR_MAX_REPORT_PIXELS; pixels are decoded inside each image's OCR job,
+    with at most OCR_WORKERS images in flight. `on_decoded` is called (on an
+    OCR thread) right after each image is decoded.
     Returns combined extracted text and per-file results.
     """
-    pytesseract.pytesseract.tesseract_cmd = get_tesseract_cmd()
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    config = current_app.config
+    executor, backend, max_in_flight = _get_runtime()
+    report_pixels = config.get("OCR_MAX_REPORT_PIXELS")
+
+    entries = []     # per-file result dicts, or OCR jobs still running, in upload order
+    in_flight = []   # indexes into `entries` of running jobs, oldest first
+    texts = {}
+    pixels = 0
 
-    combined_text = ""
-    results = []
+    def finish_oldest():
+        index = in_flight.pop(0)
+        entries[index], text = _collect(entries[index])
+        if text:
+            texts[index] = text
 
     for file in file_list:
         if not file or not file.filename:
             continue
 
-        filename = file.filename.lower()
-        allowed_extensions = (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".webp")
-
-        if not filename.endswith(allowed_extensions):
-            results.append({
-                "filename": file.filename,
-                "status": "skipped",
-                "reason": "Unsupported format"
-            })
+        if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
+            entries.append({"filename": file.filename, "status": "skipped", "reason": "Unsupported format"})
             continue
 
         try:
-            image = Image.open(file.stream)
-            extracted = pytesseract.image_to_string(image).strip()
+            image = _open_image(file, config.get("OCR_MAX_IMAGE_PIXELS"))
+        except Exception as e:
+            current_app.logger.error(f"OCR failed for {file.filename}: {e}")
+            entries.append({"filename": file.filename, "status": "error", "reason": str(e)})
+            continue
 
-            results.append({
-                "filename": file.filename,
-                "status": "success",
-                "text_length": len(extracted)
-            })
+        if image is None:
+            current_app.logger.warning(f"OCR refused oversized image {file.filename}")
+            entries.append({"filename": file.filename, "status": "skipped", "reason": TOO_LARGE_REASON})
+            continue
 
-            if extracted:
-                combined_text += " " + extracted
+        width, height = image.size
+        if report_pixels and pixels + width * height > report_pixels:
+            image.close()
+            current_app.logger.warning(f"OCR pixel budget of the report exhausted at {file.filename}")
+            entries.append({"filename": file.filename, "status": "skipped", "reason": BUDGET_REASON})
+            continue
+        pixels += width * height
 
-        except Exception as e:
-            current_app.logger.error(f"OCR failed for {file.filename}: {e}")
-            results.append({
-                "filename": file.filename,
-                "status": "error",
-                "reason": str(e)
-            })
+        # Bound the decoded images held at once
+        while len(in_flight) >= max_in_flight:
+            finish_oldest()
+
+        future = executor.submit(_read_image, image, config, executor, backend, deadline, on_decoded)
+        in_flight.append(len(entries))
+        entries.append({"filename": file.filename, "future": future})
+
+    while in_flight:
+        finish_oldest()
 
-    return combined_text.strip(), results
+    return " ".join(texts[i] for i in sorted(texts)), entries
@@ -0,0 +1,137 @@
+"""
+Password Hasher — Bounded pool for password hashing.
+Hashing is deliberately CPU-expensive, so it runs on a small dedicated pool
+(hashlib releases the GIL) instead of the request thread. Requests beyond
+`max_pending` are rejected immediately rather than queued, so a login flood
+cannot starve reporting and the admin endpoints. Unknown usernames verify
+against a dummy hash on the same pool, so they cost the same time and hit the
+same 503 as real accounts and neither reveals which usernames exist.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Weight of the newest sample in the verification time average
+EWMA_ALPHA = 0.2
+
+
+class HasherBusy(Exception):
+    """Raised when the pool already holds `max_pending` jobs."""
+
+
+class PasswordHasher:
+    def __init__(self, max_workers=2, max_pending=32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._verify_seconds = None
+        # Built once, off the request path, with the same method as real hashes
+        self._dummy_hash = self._executor.submit(generate_password_hash, "dummy-password")
+        self.completed = 0
+        self.rejected = 0
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusy()
+
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def _timed_check(self, pwhash, password):
+        start = time.perf_counter()
+        matched = check_password_hash(pwhash, password)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            if self._verify_seconds is None:
+                self._verify_seconds = elapsed
+            else:
+                self._verify_seconds += EWMA_ALPHA * (elapsed - self._verify_seconds)
+        return matched
+
+    def verify(self, pwhash, password):
+        """check_password_hash on the pool. Raises HasherBusy when saturated."""
+        return self._submit(self._timed_check, pwhash, password)
+
+    def hash(self, password):
+        """generate_password_hash on the pool. Raises HasherBusy when saturated."""
+        return self._submit(generate_password_hash, password)
+
+    def _dummy_check(self, password):
+        self._timed_check(self._dummy_hash.result(), password)
+        return False
+
+    def reject_unknown(self, password):
+        """
+        Verify against a dummy hash on the pool, exactly like a wrong password
+        for a real user. Raises HasherBusy when saturated.
+        """
+        return self._submit(self._dummy_check, password)
+
+    def stats(self):
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "verify_ms": round(self._verify_seconds * 1000, 1) if self._verify_seconds else None
+        }
+
+
+def init_password_hasher(app):
+    """Attach a PasswordHasher to the app."""
+    app.password_hasher = PasswordHasher(
+        max_workers=app.config.get("PASSWORD_HASH_WORKERS", 2),
+        max_pending=app.config.get("PASSWORD_HASH_MAX_PENDING", 32)
+    )
+    return app.password_hasher
+
+
+_fallback_hash = None
+
+
+def _fallback_dummy_hash():
+    global _fallback_hash
+    if _fallback_hash is None:
+        _fallback_hash = generate_password_hash("dummy-password")
+    return _fallback_hash
+
+
+def _hasher():
+    return getattr(current_app, "password_hasher", None)
+
+
+def verify_password(pwhash, password):
+    hasher = _hasher()
+    if hasher is None:
+        return check_password_hash(pwhash, password)
+    return hasher.verify(pwhash, password)
+
+
+def hash_password(password):
+    hasher = _hasher()
+    if hasher is None:
+        return generate_password_hash(password)
+    return hasher.hash(password)
+
+
+def reject_unknown_user(password):
+    hasher = _hasher()
+    if hasher is None:
+        check_password_hash(_fallback_dummy_hash(), password)
+        return
+    hasher.reject_unknown(password)
@@ -0,0 +1,107 @@
+"""
+Query Cache — Version-invalidated result cache for admin reads.
+Entries are keyed by endpoint + normalized query parameters + role + the
+negotiated response format (JSON or NDJSON) and store the write versions they
+were computed under; a bump on any of those scopes invalidates them. Entries
+also expire after a TTL and the least recently used are evicted past
+`max_entries`. Concurrent misses on one key are coalesced so
+only one Mongo query runs (single flight).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    def __init__(self, versions):
+        self.versions = versions
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class QueryCache:
+    def __init__(self, max_entries=512, default_ttl=30, wait_timeout=10):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.wait_timeout = wait_timeout
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_compute(self, key, versions, compute, ttl=None, store_if=None):
+        """
+        Return the cached value for `key` if it was computed under `versions`
+        and has not expired, else compute it (once across concurrent callers).
+        A computed value is only stored when `store_if(value)` is true.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, entry_versions, expires_at = entry
+                if entry_versions == versions and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            flight = self._inflight.get(key)
+            leader = flight is None or flight.versions != versions
+            if leader:
+                flight = _Flight(versions)
+                self._inflight[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if flight.done.wait(self.wait_timeout) and flight.error is None:
+                return flight.value
+            return compute()
+
+        self.misses += 1
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                if flight.error is None and (store_if is None or store_if(flight.value)):
+                    self._store(key, flight.value, versions, ttl)
+            flight.done.set()
+
+        return flight.value
+
+    def _store(self, key, value, versions, ttl):
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        self._entries[key] = (value, versions, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced
+        }
+
+
+def init_query_cache(app):
+    """Attach a QueryCache to the app."""
+    app.query_cache = QueryCache(
+        max_entries=app.config.get("QUERY_CACHE_MAX_ENTRIES", 512),
+        default_ttl=app.config.get("QUERY_CACHE_TTL_SECONDS", 30)
+    )
+    return app.query_cache
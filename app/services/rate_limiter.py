@@ -0,0 +1,146 @@
+"""
+Rate Limiter — Token buckets for expensive endpoints.
+Each bucket holds up to `capacity` tokens and refills at `rate` tokens per
+second; a request spends its cost from every bucket it is checked against or
+is refused with the time until enough tokens are back, and a refused request
+leaves all of its buckets as they were. Buckets live in process memory by default, or in the
+`rate_limits` collection (one atomic pipeline update per check) when several
+workers must share them.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from app.constants.rate_limit_constants import RateLimits
+
+RATE_LIMIT_COLLECTION = "rate_limits"
+
+
+class MemoryBucketStore:
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at), least recently used first
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, cost, capacity, rate):
+        """Spend `cost` tokens. Returns (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # Drop the least recently used buckets, never the whole table,
+                # so flooding new keys cannot reset anyone else's limit
+                while len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+                tokens = capacity
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                self._buckets.move_to_end(key)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+
+        return (True, 0) if allowed else (False, (cost - tokens) / rate)
+
+    def refund(self, key, cost, capacity, rate):
+        """Give back `cost` tokens spent by a request that was refused elsewhere."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                self._buckets[key] = (min(capacity, bucket[0] + cost), bucket[1])
+
+
+class MongoBucketStore:
+    def __init__(self, db, fallback=None, logger=None):
+        self.collection = db[RATE_LIMIT_COLLECTION]
+        self.fallback = fallback or MemoryBucketStore()
+        self.logger = logger
+
+    def take(self, key, cost, capacity, rate):
+        now = datetime.utcnow()
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        refilled = {"$min": [capacity, {"$add": [{"$ifNull": ["$tokens", capacity]}, {"$multiply": [elapsed, rate]}]}]}
+
+        try:
+            bucket = self.collection.find_one_and_update(
+                {"_id": key},
+                [
+                    {"$set": {"tokens": refilled, "updated_at": now}},
+                    {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+                    {"$set": {
+                        "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                        # Gone once it would have refilled anyway
+                        "expires_at": now + timedelta(seconds=capacity / rate)
+                    }}
+                ],
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except PyMongoError as e:
+            if self.logger:
+                self.logger.warning(f"Shared rate limit store unavailable, using local buckets: {e}")
+            return self.fallback.take(key, cost, capacity, rate)
+
+        if bucket["allowed"]:
+            return True, 0
+        return False, (cost - bucket["tokens"]) / rate
+
+    def refund(self, key, cost, capacity, rate):
+        try:
+            self.collection.update_one(
+                {"_id": key},
+                [{"$set": {"tokens": {"$min": [capacity, {"$add": ["$tokens", cost]}]}}}]
+            )
+        except PyMongoError as e:
+            if self.logger:
+                self.logger.warning(f"Shared rate limit store unavailable, using local buckets: {e}")
+            self.fallback.refund(key, cost, capacity, rate)
+
+
+class RateLimiter:
+    def __init__(self, store, buckets):
+        self.store = store
+        self.buckets = buckets
+
+    def check(self, name, subjects, cost=1):
+        """
+        Spend `cost` from bucket `name` for every subject (IP, identity), or
+        from none of them. Returns (allowed, retry_after_seconds).
+        """
+        capacity, rate = self.buckets[name]
+        cost = min(cost, capacity)
+        retry_after = 0
+        spent = []
+        for subject in subjects:
+            key = f"{name}:{subject}"
+            allowed, wait = self.store.take(key, cost, capacity, rate)
+            if allowed:
+                spent.append(key)
+            else:
+                retry_after = max(retry_after, wait)
+
+        if retry_after:
+            # Refused by one bucket: the others must not pay for it
+            for key in spent:
+                self.store.refund(key, cost, capacity, rate)
+        return retry_after == 0, retry_after
+
+
+def init_rate_limiter(app):
+    """Attach a RateLimiter to the app (memory or shared Mongo buckets)."""
+    if not app.config.get("RATE_LIMIT_ENABLED", True):
+        app.rate_limiter = None
+        return None
+
+    if app.config.get("RATE_LIMIT_STORE") == "mongo":
+        store = MongoBucketStore(app.db, logger=app.logger)
+    else:
+        store = MemoryBucketStore()
+
+    app.rate_limiter = RateLimiter(store, RateLimits.BUCKETS)
+    return app.rate_limiter
@@ -1,91 +1,388 @@
+"""
+Risk Engine — Deadline-aware report analysis.
+A report runs through a fixed list of stages (OCR, keywords, URL reputation,
+VADER, ML classifier). Each stage declares its expected cost and the most
+time it may take. Under a report deadline, a stage that no longer fits is
+skipped and one that runs out of time returns a partial result. Both cases
+are recorded as risk reasons ("sk:ocr", "dg:url_reputation").
+Process RSS is sampled when a report starts, right after each of its images
+is decoded (on the OCR threads, while the pixels are held) and when it ends.
+RSS is the process high-water mark in practice, since freed memory is rarely
+returned to the OS: a report's "growth" is how far it raised that mark, and is
+about 0 when it fit in memory the process already held.
+"""
+import threading
+import time
+import psutil
 from .ai_analysis import vader_risk_score
+from .analysis_context import AnalysisContext
+from .ocr_service import extract_text_from_images, DEADLINE_REASON
 from .threat_classifier import get_threat_classifier
-from .url_checker import extract_urls, is_malicious
+from .url_checker import find_malicious_urls
+from .incident_codec import encode_reason
+from app.constants.incident_constants import RiskReasons, ThreatTypes
 
-def calculate_risk_score(title: str, description: str, evidence: str):
-    score = 0
-    reasons = []   # ✅ ADD (for explainability)
+HIGH_RISK_KEYWORDS = ["password", "bank", "otp", "login", "verify", "account locked"]
+MEDIUM_RISK_KEYWORDS = ["urgent", "click", "link", "security alert", "update"]
+LOW_RISK_KEYWORDS = ["newsletter", "promotion", "discount", "offer"]
+CREDENTIAL_KEYWORDS = ["otp", "password", "bank", "verify", "login"]
 
-    raw_text = title + " " + description + " " + evidence
-    text = raw_text.lower()
+# Live keyword/indicator weights; shadow scoring replays candidates of this shape
+DEFAULT_RULESET = {
+    "high_risk_keywords": HIGH_RISK_KEYWORDS,
+    "high_risk_weight": 25,
+    "medium_risk_keywords": MEDIUM_RISK_KEYWORDS,
+    "medium_risk_weight": 15,
+    "low_risk_keywords": LOW_RISK_KEYWORDS,
+    "low_risk_weight": -10,
+    "url_weight": 20,
+    "malicious_url_weight": 40,
+    "evidence_weight": 10
+}
+
+
+_process = psutil.Process()
+
+
+def current_rss():
+    return _process.memory_info().rss
+
+
+def risk_level(score):
+    if score <= 25:
+        return "LOW"
+    elif score <= 60:
+        return "MEDIUM"
+    return "HIGH"
+
+
+class Deadline:
+    """Wall-clock time left for analysing one report."""
+
+    def __init__(self, budget_ms):
+        self.budget_ms = budget_ms
+        self.expires_at = time.monotonic() + budget_ms / 1000
+
+    def remaining_ms(self):
+        return max(0.0, (self.expires_at - time.monotonic()) * 1000)
+
+
+class ReportAnalysis:
+    """Score, reasons and classifier output built up by the stages."""
+
+    def __init__(self, narrative, ioc_indicators="", files=None, context=None):
+        self.narrative = narrative or ""
+        self.ioc_indicators = ioc_indicators or ""
+        self.files = files or []
+        self.ocr_text = ""
+        self.ocr_results = []
+        self.score = 0
+        self.reasons = []   # ✅ compact reason codes (expanded at read time)
+        self.ml_type = ThreatTypes.SUSPICIOUS_MESSAGE
+        self.confidence = 0.0
+        self.start_rss = None
+        self.peak_rss = 0
+        self._rss_lock = threading.Lock()
+        self._context = context
+
+    def sample_rss(self):
+        # Also called from OCR threads
+        rss = current_rss()
+        with self._rss_lock:
+            if self.start_rss is None:
+                self.start_rss = rss
+            self.peak_rss = max(self.peak_rss, rss)
+
+    @property
+    def context(self):
+        # Built on first use, i.e. after the OCR stage has run
+        if self._context is None:
+            self._context = AnalysisContext(self.narrative, self.ioc_indicators, self.ocr_text)
+        return self._context
+
+    def risk(self):
+        """(score, level, reasons) with the score clamped to 0-100."""
+        score = max(0, min(self.score, 100))
+        return score, risk_level(score), self.reasons
+
+    def threat(self):
+        """(threat type, confidence): the ML result, or rules when it is unsure."""
+        # Hybrid approach: Rule-based fallback if ML confidence is low
+        if self.confidence > 0.6:
+            return self.ml_type, self.confidence
+
+        context = self.context
+        if context.url_in_evidence:
+            return "Malicious Link", 1.0
+
+        elif any(word in context.combined_lower for word in CREDENTIAL_KEYWORDS):
+            return "Credential Theft", 0.9
+
+        elif context.urgency_score > 10:
+            return "Social Engineering", 0.8
+
+        return self.ml_type, self.confidence  # Return ML type even if low confidence if no rules match
+
+
+class Stage:
+    """One analysis step. `cost_ms` is its expected run time, `budget_ms` its cap."""
+    name = None
+    cost_ms = 1
+    budget_ms = None
+    # Required stages always run, even past the deadline
+    required = False
+
+    def applies(self, report):
+        return True
+
+    def skip(self, report):
+        """Leave a trace of the skipped work on the report."""
+
+    def run(self, report, budget_ms):
+        """Run within `budget_ms` (None: unbounded). Returns False when degraded."""
+        raise NotImplementedError
+
+
+class OcrStage(Stage):
+    name = "ocr"
+    cost_ms = 1500   # one typical screenshot
+    budget_ms = 6000
+
+    def applies(self, report):
+        return bool(report.files)
+
+    def skip(self, report):
+        report.ocr_results = [
+            {"filename": f.filename, "status": "skipped", "reason": DEADLINE_REASON}
+            for f in report.files if f and f.filename
+        ]
+
+    def run(self, report, budget_ms):
+        report.ocr_text, report.ocr_results = extract_text_from_images(
+            report.files, None if budget_ms is None else budget_ms / 1000, on_decoded=report.sample_rss
+        )
+        return not any(r.get("reason") == DEADLINE_REASON for r in report.ocr_results)
+
+
+def keyword_score(context, ruleset=DEFAULT_RULESET):
+    """Keyword, URL-presence and evidence points of a context: (points, reasons)."""
+    points = 0
+    reasons = []
+    text = context.text_lower
 
-    # ... (rest of the logic using text) ...
-    # (re-writing the relevant part to avoid confusion)
-    
     # HIGH RISK
-    high_risk = ["password", "bank", "otp", "login", "verify", "account locked"]
-    for word in high_risk:
+    for word in ruleset["high_risk_keywords"]:
         if word in text:
-            score += 25
-            reasons.append(f"high risk keyword: {word}")
+            points += ruleset["high_risk_weight"]
+            reasons.append(encode_reason(RiskReasons.HIGH_KEYWORD, word))
 
     # MEDIUM RISK
-    medium_risk = ["urgent", "click", "link", "security alert", "update"]
-    for word in medium_risk:
+    for word in ruleset["medium_risk_keywords"]:
         if word in text:
-            score += 15
-            reasons.append(f"medium risk keyword: {word}")
-
-    # URL Check
-    urls = extract_urls(raw_text)
-    if urls:
-        score += 20
-        reasons.append("URL detected")
-        
-        # Deep check for malicious URLs
-        for url in urls:
-            if is_malicious(url):
-                score += 40
-                reasons.append(f"malicious URL identified: {url}")
-                break # Only add once
+            points += ruleset["medium_risk_weight"]
+            reasons.append(encode_reason(RiskReasons.MEDIUM_KEYWORD, word))
+
+    # URL presence (reputation is its own stage)
+    if context.urls:
+        points += ruleset["url_weight"]
+        reasons.append(RiskReasons.URL_DETECTED)
 
     # evidence present
-    if evidence:
-        score += 10
-        reasons.append("evidence provided")
+    if context.evidence:
+        points += ruleset["evidence_weight"]
+        reasons.append(RiskReasons.EVIDENCE)
 
     # LOW RISK indicators
-    low_risk = ["newsletter", "promotion", "discount", "offer"]
-    for word in low_risk:
+    for word in ruleset["low_risk_keywords"]:
         if word in text:
-            score -= 10
-            reasons.append(f"low risk indicator: {word}")
+            points += ruleset["low_risk_weight"]
+            reasons.append(encode_reason(RiskReasons.LOW_KEYWORD, word))
 
-    # ✅ ADD THIS BLOCK (VADER NLP scoring) - Use raw_text for case sensitivity
-    nlp_score, nlp_reasons = vader_risk_score(raw_text)
-    score += nlp_score
-    reasons.extend(nlp_reasons)
+    return points, reasons
 
-    # normalize score
-    score = max(0, min(score, 100))
 
-    # assign risk level
-    if score <= 25:
-        level = "LOW"
-    elif score <= 60:
-        level = "MEDIUM"
-    else:
-        level = "HIGH"
+class KeywordStage(Stage):
+    name = "keywords"
+    required = True
+
+    def run(self, report, budget_ms):
+        points, reasons = keyword_score(report.context)
+        report.score += points
+        report.reasons.extend(reasons)
+        return True
+
+
+class UrlReputationStage(Stage):
+    name = "url_reputation"
+    cost_ms = 300
+    budget_ms = 3000
+
+    def applies(self, report):
+        return bool(report.context.urls)
+
+    def run(self, report, budget_ms):
+        urls = list(dict.fromkeys(report.context.urls))
+        malicious = find_malicious_urls(urls, timeout=None if budget_ms is None else budget_ms / 1000)
+        if malicious is None:
+            # Reputation unknown: upstream failed, timed out or shed the lookup
+            return False
+
+        for url in urls:
+            if url in malicious:
+                report.score += DEFAULT_RULESET["malicious_url_weight"]
+                # Keep the reason next to URL detection
+                position = report.reasons.index(RiskReasons.URL_DETECTED) + 1
+                report.reasons.insert(position, encode_reason(RiskReasons.MALICIOUS_URL, url))
+                break # Only add once
+        return True
+
+
+class VaderStage(Stage):
+    name = "vader"
+    cost_ms = 20
+
+    def run(self, report, budget_ms):
+        # Use raw_text for case sensitivity
+        nlp_score, nlp_reasons = vader_risk_score(report.context.raw_text)
+        report.score += nlp_score
+        report.reasons.extend(nlp_reasons)
+        return True
+
+
+class ClassifierStage(Stage):
+    name = "ml"
+    cost_ms = 30
+
+    def run(self, report, budget_ms):
+        classifier = get_threat_classifier()
+        if classifier.vectorizer is not None:
+            features = report.context.features(classifier.vectorizer)
+            report.ml_type, report.confidence = classifier.predict_features(features)
+        else:
+            report.ml_type, report.confidence = classifier.predict(report.context.combined_text)
+        return True
+
+
+SCORING_STAGES = [KeywordStage(), UrlReputationStage(), VaderStage()]
+CLASSIFIER_STAGES = [ClassifierStage()]
+REPORT_STAGES = [OcrStage()] + SCORING_STAGES + CLASSIFIER_STAGES
+
+
+class PipelineStats:
+    """Per-stage outcome counters and mean latency, for the monitoring page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self.reports = 0
+        self.over_deadline = 0
+        self._memory = {"reports": 0, "total_growth": 0, "max_growth": 0, "max_peak": 0}
+
+    def record(self, stage, outcome, elapsed_ms=0.0):
+        with self._lock:
+            entry = self._stages.setdefault(
+                stage, {"ran": 0, "skipped": 0, "degraded": 0, "total_ms": 0.0}
+            )
+            entry[outcome] += 1
+            entry["total_ms"] += elapsed_ms
+
+    def record_report(self, over_deadline):
+        with self._lock:
+            self.reports += 1
+            self.over_deadline += int(over_deadline)
+
+    def record_memory(self, start_rss, peak_rss):
+        growth = peak_rss - start_rss
+        with self._lock:
+            memory = self._memory
+            memory["reports"] += 1
+            memory["total_growth"] += growth
+            memory["max_growth"] = max(memory["max_growth"], growth)
+            memory["max_peak"] = max(memory["max_peak"], peak_rss)
+
+    def _memory_stats(self):
+        # Process-wide RSS: concurrent reports show up in each other's growth
+        memory = self._memory
+        mb = 1024 * 1024
+        return {
+            "reports": memory["reports"],
+            "avg_high_water_growth_mb":
+                round(memory["total_growth"] / memory["reports"] / mb, 2) if memory["reports"] else 0.0,
+            "max_high_water_growth_mb": round(memory["max_growth"] / mb, 2),
+            "max_peak_rss_mb": round(memory["max_peak"] / mb, 2)
+        }
+
+    def stats(self):
+        with self._lock:
+            stages = {}
+            for name, entry in self._stages.items():
+                timed = entry["ran"] + entry["degraded"]
+                stages[name] = {
+                    "ran": entry["ran"],
+                    "skipped": entry["skipped"],
+                    "degraded": entry["degraded"],
+                    "avg_ms": round(entry["total_ms"] / timed, 2) if timed else 0.0
+                }
+            return {
+                "reports": self.reports,
+                "over_deadline": self.over_deadline,
+                "stages": stages,
+                "memory": self._memory_stats()
+            }
+
+
+pipeline_stats = PipelineStats()
+
+
+def run_stages(report, stages, deadline=None):
+    """Run `stages` in order, skipping or capping them to fit `deadline`."""
+    for i, stage in enumerate(stages):
+        if not stage.applies(report):
+            continue
+
+        budget_ms = stage.budget_ms
+        if deadline is not None and not stage.required:
+            # Leave room for the stages still to come
+            reserve_ms = sum(s.cost_ms for s in stages[i + 1:])
+            available_ms = deadline.remaining_ms() - reserve_ms
+            if available_ms < stage.cost_ms:
+                stage.skip(report)
+                report.reasons.append(encode_reason(RiskReasons.STAGE_SKIPPED, stage.name))
+                pipeline_stats.record(stage.name, "skipped")
+                continue
+            budget_ms = available_ms if budget_ms is None else min(budget_ms, available_ms)
+
+        started = time.perf_counter()
+        complete = stage.run(report, budget_ms)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if not complete:
+            report.reasons.append(encode_reason(RiskReasons.STAGE_DEGRADED, stage.name))
+        pipeline_stats.record(stage.name, "ran" if complete else "degraded", elapsed_ms)
+    return report
+
+
+def analyze_report(narrative, ioc_indicators="", files=None, deadline_ms=None):
+    """OCR, score and classify a report within `deadline_ms` (None: no deadline)."""
+    report = ReportAnalysis(narrative, ioc_indicators, files)
+    deadline = Deadline(deadline_ms) if deadline_ms else None
+    report.sample_rss()
+
+    run_stages(report, REPORT_STAGES, deadline)
 
-    return score, level, reasons   # ✅ UPDATED RETURN
+    report.sample_rss()
+    pipeline_stats.record_memory(report.start_rss, report.peak_rss)
 
-def detect_threat_type(text, malicious_url_found, urgency_score):
-    classifier = get_threat_classifier()
-    ml_type, confidence = classifier.predict(text)
-    
-    # Hybrid approach: Rule-based fallback if ML confidence is low
-    if confidence > 0.6:
-        return ml_type, confidence
-        
-    text_lower = text.lower()
+    if deadline is not None:
+        pipeline_stats.record_report(deadline.remaining_ms() <= 0)
+    return report
 
-    if malicious_url_found:
-        return "Malicious Link", 1.0
 
-    elif any(word in text_lower for word in ["otp", "password", "bank", "verify", "login"]):
-        return "Credential Theft", 0.9
+def calculate_risk_score(context):
+    """Score an AnalysisContext without a deadline. Returns (score, level, reason codes)."""
+    return run_stages(ReportAnalysis(None, context=context), SCORING_STAGES).risk()
 
-    elif urgency_score > 10:
-        return "Social Engineering", 0.8
 
-    return ml_type, confidence  # Return ML type even if low confidence if no rules match
\ No newline at end of file
+def detect_threat_type(context):
+    """Classify an AnalysisContext without a deadline. Returns (threat type, confidence)."""
+    return run_stages(ReportAnalysis(None, context=context), CLASSIFIER_STAGES).threat()
@@ -0,0 +1,225 @@
+"""
+Safe Browsing Client — Resilient URL reputation lookups.
+All URLs of a report go out in one threatMatches:find request. Outbound
+requests are capped per worker and retried once with jittered backoff inside
+the caller's time budget, each attempt getting its share of what is left. A
+circuit breaker opens after consecutive upstream failures (errors, or
+timeouts at the client's own `timeout`; running out of a shorter caller
+budget says nothing about the upstream), so while it is down a lookup returns
+"unknown" in microseconds; after `reset_seconds` a single half-open probe
+decides whether it closes again.
+"""
+import logging
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_ENDPOINT = "https://safebrowsing.googleapis.com/v4/threatMatches:find"
+
+CLIENT_INFO = {
+    "clientId": "cyberguard",
+    "clientVersion": "1.0"
+}
+
+
+class LookupOutcomes:
+    OK = "ok"
+    ERROR = "error"
+    TIMEOUT = "timeout"
+    SHORT_CIRCUITED = "short_circuited"
+    REJECTED = "rejected"
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may go out now (at most one probe while half-open)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self):
+        """End a lookup that says nothing about the upstream (frees the half-open probe)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class SafeBrowsingClient:
+    def __init__(self, api_key, endpoint=DEFAULT_ENDPOINT, timeout=2.0, max_concurrency=8,
+                 retries=1, backoff=0.05, failure_threshold=5, reset_seconds=30.0, logger=None):
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.logger = logger or logging.getLogger(__name__)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._outcomes = {}
+        self._warned_missing_key = False
+
+        # Keep-alive connections, one per concurrent request
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _record(self, outcome, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            entry = self._outcomes.setdefault(outcome, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def _post(self, urls, timeout):
+        payload = {
+            "client": CLIENT_INFO,
+            "threatInfo": {
+                "threatTypes": ["MALWARE", "SOCIAL_ENGINEERING"],
+                "platformTypes": ["ANY_PLATFORM"],
+                "threatEntryTypes": ["URL"],
+                "threatEntries": [{"url": url} for url in urls]
+            }
+        }
+        response = self._session.post(
+            self.endpoint, params={"key": self.api_key}, json=payload, timeout=timeout
+        )
+        response.raise_for_status()
+        result = response.json()
+        self.logger.debug(f"Safe Browsing API response: {result}")
+        return {match["threat"]["url"] for match in result.get("matches", [])}
+
+    def check(self, urls, timeout=None):
+        """
+        Set of `urls` flagged by Safe Browsing, from a single request.
+        Returns None when the verdict is unknown: upstream failed or timed
+        out, the circuit is open, or too many lookups are already in flight.
+        """
+        if not urls:
+            return set()
+
+        if not self.api_key:
+            if not self._warned_missing_key:
+                self.logger.warning("SAFE_BROWSING_API_KEY is missing. Skipping URL check.")
+                self._warned_missing_key = True
+            return set()
+
+        started = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            self._record(LookupOutcomes.REJECTED, started)
+            return None
+
+        try:
+            if not self.breaker.allow():
+                self._record(LookupOutcomes.SHORT_CIRCUITED, started)
+                return None
+
+            budget = self.timeout if timeout is None else min(self.timeout, timeout)
+            deadline = time.monotonic() + budget
+            # A timeout only counts against the upstream when it had our full timeout
+            own_budget = budget >= self.timeout
+            outcome, error, upstream_failed = LookupOutcomes.TIMEOUT, None, False
+
+            for attempt in range(self.retries + 1):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    # Leave the later attempts their share of the budget
+                    matches = self._post(urls, remaining / (self.retries - attempt + 1))
+                except requests.Timeout as e:
+                    outcome, error = LookupOutcomes.TIMEOUT, e
+                    upstream_failed = upstream_failed or own_budget
+                except (requests.RequestException, ValueError, KeyError) as e:
+                    outcome, error, upstream_failed = LookupOutcomes.ERROR, e, True
+                except Exception as e:
+                    # Unexpected: not retried, but the breaker must still hear
+                    # of it or a half-open probe would never finish
+                    outcome, error, upstream_failed = LookupOutcomes.ERROR, e, True
+                    break
+                else:
+                    self.breaker.record_success()
+                    self._record(LookupOutcomes.OK, started)
+                    return matches
+
+                if attempt < self.retries:
+                    # Full jitter, never past the caller's budget
+                    pause = random.uniform(0, self.backoff * (2 ** attempt))
+                    time.sleep(max(0.0, min(pause, deadline - time.monotonic())))
+
+            if upstream_failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            self._record(outcome, started)
+            self.logger.error(f"Error checking URLs with Safe Browsing ({outcome}): {error}")
+            return None
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            outcomes = {
+                name: {
+                    "count": entry["count"],
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+                    "max_ms": round(entry["max_ms"], 3)
+                }
+                for name, entry in self._outcomes.items()
+            }
+        return {"circuit": self.breaker.state, "outcomes": outcomes}
+
+
+def init_safe_browsing(app):
+    """Attach a SafeBrowsingClient to the app."""
+    app.safe_browsing = SafeBrowsingClient(
+        api_key=app.config.get("SAFE_BROWSING_API_KEY"),
+        endpoint=app.config.get("SAFE_BROWSING_URL", DEFAULT_ENDPOINT),
+        timeout=app.config.get("SAFE_BROWSING_TIMEOUT_SECONDS", 2.0),
+        max_concurrency=app.config.get("SAFE_BROWSING_MAX_CONCURRENCY", 8),
+        retries=app.config.get("SAFE_BROWSING_RETRIES", 1),
+        failure_threshold=app.config.get("SAFE_BROWSING_FAILURE_THRESHOLD", 5),
+        reset_seconds=app.config.get("SAFE_BROWSING_RESET_SECONDS", 30.0),
+        logger=app.logger
+    )
+    return app.safe_browsing
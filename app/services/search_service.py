@@ -0,0 +1,136 @@
+"""
+Search Service — Full-text incident search.
+Queries the `incident_search` text index (narrative, IOC field, OCR words,
+platform and threat types), ranked by text score, with optional risk level,
+status and date filters. Each hit carries short highlighted snippets of the
+fields that matched.
+"""
+import html
+import re
+from app.services.incident_codec import decompress_text
+
+SNIPPET_RADIUS = 60
+MAX_LIMIT = 50
+
+SEARCH_PROJECTION = {
+    "score": {"$meta": "textScore"},
+    "platform": 1,
+    "narrative": 1,
+    "ioc_indicators": 1,
+    "ocr_text_z": 1,
+    "threat_type_suggested": 1,
+    "threat_type": 1,
+    "risk_level": 1,
+    "risk_score": 1,
+    "status": 1,
+    "created_at": 1
+}
+
+# Fields snippets are cut from, in display order
+SNIPPET_FIELDS = ["narrative", "ioc_indicators", "ocr_extracted_text"]
+
+_TERM_RE = re.compile(r'-?"[^"]+"|-?\S+')
+
+
+def query_terms(q):
+    """Positive terms and phrases of a $text search string."""
+    terms = []
+    for token in _TERM_RE.findall(q):
+        if token.startswith("-"):
+            continue
+        token = token.strip('"').strip()
+        if token:
+            terms.append(token)
+    return terms
+
+
+_SUFFIXES = ("ing", "ed", "es", "s", "y", "e")
+
+
+def _stem_prefix(term):
+    # Crude stand-in for the index's stemming: "verify" -> "verif" matches "verified"
+    if " " in term or len(term) <= 4:
+        return term
+    for suffix in _SUFFIXES:
+        if term.lower().endswith(suffix):
+            return term[:-len(suffix)]
+    return term
+
+
+def _highlight_pattern(terms):
+    alternatives = sorted((re.escape(_stem_prefix(t)) for t in terms), key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\w*", re.IGNORECASE)
+
+
+def build_snippet(text, pattern, radius=SNIPPET_RADIUS):
+    """Window of `text` around its first match, matches wrapped in <mark>."""
+    if not text:
+        return None
+    match = pattern.search(text)
+    if match is None:
+        return None
+
+    start = max(0, match.start() - radius)
+    end = min(len(text), match.end() + radius)
+    window = text[start:end]
+
+    parts = []
+    last = 0
+    for m in pattern.finditer(window):
+        parts.append(html.escape(window[last:m.start()]))
+        parts.append(f"<mark>{html.escape(m.group(0))}</mark>")
+        last = m.end()
+    parts.append(html.escape(window[last:]))
+
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+
+def build_search_filter(q, risk_level=None, status=None, date_from=None, date_to=None):
+    query = {"$text": {"$search": q}}
+    if risk_level:
+        query["risk_level"] = risk_level.upper()
+    if status:
+        query["status"] = status
+    if date_from or date_to:
+        query["created_at"] = {}
+        if date_from:
+            query["created_at"]["$gte"] = date_from
+        if date_to:
+            query["created_at"]["$lt"] = date_to
+    return query
+
+
+def search_incidents(db, q, page=1, limit=20, **filters):
+    """
+    Ranked search. Returns {results, page, limit, has_more}; totals are not
+    counted, which would cost a second pass over every match.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    page = max(1, page)
+
+    cursor = db.incidents.find(build_search_filter(q, **filters), SEARCH_PROJECTION) \
+        .sort([("score", {"$meta": "textScore"})]) \
+        .skip((page - 1) * limit) \
+        .limit(limit + 1)
+    hits = list(cursor)
+
+    terms = query_terms(q)
+    pattern = _highlight_pattern(terms) if terms else None
+
+    results = []
+    for hit in hits[:limit]:
+        ocr_blob = hit.pop("ocr_text_z", None)
+        if pattern is not None:
+            texts = {"narrative": hit.get("narrative"), "ioc_indicators": hit.get("ioc_indicators")}
+            if ocr_blob:
+                texts["ocr_extracted_text"] = decompress_text(ocr_blob)
+            highlights = {}
+            for field in SNIPPET_FIELDS:
+                snippet = build_snippet(texts.get(field), pattern)
+                if snippet:
+                    highlights[field] = snippet
+            hit["highlights"] = highlights
+        hit["score"] = round(hit.get("score", 0), 3)
+        results.append(hit)
+
+    return {"results": results, "page": page, "limit": limit, "has_more": len(hits) > limit}
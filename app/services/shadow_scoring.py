@@ -0,0 +1,223 @@
+"""
+Shadow Scoring — Replay stored incidents against a candidate model/ruleset.
+Incidents are streamed read-only from Mongo in batches and scored in a process
+pool by both the live scorer and a candidate (another classifier/vectorizer
+pair and/or keyword weights). Each batch is vectorized and classified in one
+call. Scoring is offline: URL reputation is taken from the stored reasons and
+OCR text from the stored (compressed) copy, so the two scorers differ only by
+what is being evaluated. Archived incidents are replayed too, decoded from
+their compressed payload, unless `include_archive` is off. The result is a diff report: risk level and threat
+type transitions, confusion against analyst labels, and throughput.
+"""
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import joblib
+from app.constants.incident_constants import RiskReasons
+from app.services.ai_analysis import vader_risk_score
+from app.services.archive_service import iter_archived_incidents
+from app.services.analysis_context import AnalysisContext
+from app.services.incident_codec import decompress_text
+from app.services.risk_engine import DEFAULT_RULESET, ReportAnalysis, keyword_score
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "models")
+LIVE_MODEL_PATH = os.path.join(MODEL_DIR, "threat_rf_model.joblib")
+LIVE_VECTORIZER_PATH = os.path.join(MODEL_DIR, "tfidf_vectorizer.joblib")
+
+# Only these fields are read while replaying
+SHADOW_PROJECTION = {
+    "narrative": 1, "description": 1, "ioc_indicators": 1, "ocr_text_z": 1, "ocr_extracted_text": 1,
+    "risk_reasons": 1, "analyst_reviewed": 1, "threat_type": 1, "final_verdict": 1
+}
+
+# Changed incidents listed in the report
+MAX_EXAMPLES = 50
+
+
+class Scorer:
+    """A classifier/vectorizer pair plus keyword ruleset, scoring whole batches."""
+
+    def __init__(self, model_path=LIVE_MODEL_PATH, vectorizer_path=LIVE_VECTORIZER_PATH, ruleset=None):
+        self.model = joblib.load(model_path)
+        self.vectorizer = joblib.load(vectorizer_path)
+        self.ruleset = {**DEFAULT_RULESET, **(ruleset or {})}
+
+    def score(self, contexts, malicious_flags):
+        """[(score, level, threat type)] for a batch of contexts."""
+        X = self.vectorizer.transform([context.combined_lower for context in contexts])
+        probabilities = self.model.predict_proba(X)
+        class_indexes = probabilities.argmax(axis=1)
+
+        results = []
+        for row, (context, malicious) in enumerate(zip(contexts, malicious_flags)):
+            report = ReportAnalysis(None, context=context)
+            report.score, report.reasons = keyword_score(context, self.ruleset)
+            if malicious:
+                report.score += self.ruleset["malicious_url_weight"]
+            tone, _ = vader_risk_score(context.raw_text)
+            report.score += tone
+
+            class_index = class_indexes[row]
+            report.ml_type = str(self.model.classes_[class_index])
+            report.confidence = float(probabilities[row, class_index])
+
+            score, level, _ = report.risk()
+            threat_type, _ = report.threat()
+            results.append((score, level, threat_type))
+        return results
+
+
+_scorers = None
+
+
+def _init_worker(live, candidate):
+    # Models are loaded once per worker process, not per batch
+    global _scorers
+    _scorers = (Scorer(**live), Scorer(**candidate))
+
+
+def _score_rows(rows):
+    contexts = [AnalysisContext(r["narrative"], r["ioc_indicators"], r["ocr_text"]) for r in rows]
+    malicious = [r["malicious"] for r in rows]
+    live, candidate = _scorers
+    return list(zip(rows, live.score(contexts, malicious), candidate.score(contexts, malicious)))
+
+
+def _replay_row(incident):
+    """Scoring inputs and analyst labels of a stored incident."""
+    ocr_text = incident.get("ocr_extracted_text")
+    if not isinstance(ocr_text, str):
+        ocr_text = decompress_text(incident.get("ocr_text_z")) or ""
+    reasons = incident.get("risk_reasons") or []
+    return {
+        "id": str(incident["_id"]),
+        "narrative": incident.get("narrative") or incident.get("description") or "",
+        "ioc_indicators": incident.get("ioc_indicators") or "",
+        "ocr_text": ocr_text,
+        "malicious": any(r.startswith(RiskReasons.MALICIOUS_URL + ":") or r.startswith("malicious URL")
+                         for r in reasons),
+        "analyst_threat_type": incident.get("threat_type") if incident.get("analyst_reviewed") else None,
+        "final_verdict": incident.get("final_verdict") if incident.get("analyst_reviewed") else None
+    }
+
+
+class ShadowReport:
+    def __init__(self):
+        self.scored = 0
+        self.levels = {"live": Counter(), "candidate": Counter()}
+        self.level_transitions = Counter()
+        self.threat_transitions = Counter()
+        self.score_delta_total = 0
+        self.confusion = {"live": defaultdict(Counter), "candidate": defaultdict(Counter)}
+        self.verdict_levels = defaultdict(lambda: {"live": Counter(), "candidate": Counter()})
+        self.examples = []
+
+    def add(self, row, live, candidate):
+        self.scored += 1
+        live_score, live_level, live_threat = live
+        cand_score, cand_level, cand_threat = candidate
+
+        self.levels["live"][live_level] += 1
+        self.levels["candidate"][cand_level] += 1
+        self.score_delta_total += cand_score - live_score
+        if live_level != cand_level:
+            self.level_transitions[f"{live_level}->{cand_level}"] += 1
+        if live_threat != cand_threat:
+            self.threat_transitions[f"{live_threat}->{cand_threat}"] += 1
+
+        if row["analyst_threat_type"]:
+            self.confusion["live"][row["analyst_threat_type"]][live_threat] += 1
+            self.confusion["candidate"][row["analyst_threat_type"]][cand_threat] += 1
+        if row["final_verdict"]:
+            self.verdict_levels[row["final_verdict"]]["live"][live_level] += 1
+            self.verdict_levels[row["final_verdict"]]["candidate"][cand_level] += 1
+
+        if (live_level != cand_level or live_threat != cand_threat) and len(self.examples) < MAX_EXAMPLES:
+            self.examples.append({"id": row["id"], "live": list(live), "candidate": list(candidate)})
+
+    @staticmethod
+    def _accuracy(confusion):
+        total = sum(sum(row.values()) for row in confusion.values())
+        correct = sum(row[label] for label, row in confusion.items())
+        return round(correct / total, 4) if total else None
+
+    def to_dict(self, elapsed_seconds, workers, batch_size):
+        return {
+            "scored": self.scored,
+            "levels": {name: dict(counts) for name, counts in self.levels.items()},
+            "level_changes": sum(self.level_transitions.values()),
+            "level_transitions": dict(self.level_transitions.most_common()),
+            "threat_type_transitions": dict(self.threat_transitions.most_common()),
+            "mean_score_delta": round(self.score_delta_total / self.scored, 3) if self.scored else 0.0,
+            "analyst_confusion": {
+                name: {label: dict(row) for label, row in confusion.items()}
+                for name, confusion in self.confusion.items()
+            },
+            "analyst_accuracy": {name: self._accuracy(c) for name, c in self.confusion.items()},
+            "verdict_levels": {
+                verdict: {name: dict(counts) for name, counts in by_scorer.items()}
+                for verdict, by_scorer in self.verdict_levels.items()
+            },
+            "examples": self.examples,
+            "throughput": {
+                "elapsed_seconds": round(elapsed_seconds, 2),
+                "incidents_per_second": round(self.scored / elapsed_seconds, 1) if elapsed_seconds else None,
+                "workers": workers,
+                "batch_size": batch_size
+            }
+        }
+
+
+def _stored_incidents(db, batch_size, limit, include_archive):
+    """Live incidents, then archived ones, at most `limit` in all (0: no limit)."""
+    count = 0
+    for incident in db.incidents.find({}, SHADOW_PROJECTION, batch_size=batch_size, limit=limit):
+        count += 1
+        yield incident
+    if include_archive and not (limit and count >= limit):
+        yield from iter_archived_incidents(db, batch_size, limit - count if limit else 0)
+
+
+def _batches(cursor, batch_size):
+    batch = []
+    for incident in cursor:
+        batch.append(_replay_row(incident))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def shadow_score(db, live=None, candidate=None, batch_size=500, workers=None, limit=0,
+                 include_archive=True, logger=None):
+    """
+    Score every stored incident (live, then archived) with the live and the
+    candidate scorer. `live`/`candidate` are Scorer keyword arguments
+    (model_path, vectorizer_path, ruleset). Only reads from `db`. Returns the
+    report dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    report = ShadowReport()
+    started = time.perf_counter()
+
+    cursor = _stored_incidents(db, batch_size, limit, include_archive)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(live or {}, candidate or {})) as pool:
+        pending = set()
+        for batch in _batches(cursor, batch_size):
+            # Keep at most two batches per worker in flight
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for row, live_result, candidate_result in future.result():
+                        report.add(row, live_result, candidate_result)
+                if logger:
+                    logger.info(f"Shadow-scored {report.scored} incident(s)")
+            pending.add(pool.submit(_score_rows, batch))
+
+        for future in pending:
+            for row, live_result, candidate_result in future.result():
+                report.add(row, live_result, candidate_result)
+
+    return report.to_dict(time.perf_counter() - started, workers, batch_size)
@@ -90,15 +90,20 @@ class ThreatClassifierService:
         """Predicts the threat type and returns confidence score."""
         if not self.model or not self.vectorizer:
             return ThreatTypes.SUSPICIOUS_MESSAGE, 0.0
-            
-        X = self.vectorizer.transform([text.lower()])
-        prediction = self.model.predict(X)[0]
+
+        return self.predict_features(self.vectorizer.transform([text.lower()]))
+
+    def predict_features(self, X):
+        """Predicts from an already vectorized text (one row)."""
+        if not self.model:
+            return ThreatTypes.SUSPICIOUS_MESSAGE, 0.0
+
+        # One forest pass: the predicted label is the most probable class
         probabilities = self.model.predict_proba(X)[0]
-        
-        # Get confidence score for the predicted label
-        class_index = list(self.model.classes_).index(prediction)
+        class_index = int(probabilities.argmax())
+        prediction = self.model.classes_[class_index]
         confidence = float(probabilities[class_index])
-        
+
         return prediction, confidence
 
 # Singleton instance
@@ -0,0 +1,138 @@
+"""
+Timeline Service — Bucketed incident history.
+Events are stored in the `incident_timeline` collection, grouped into bucket
+documents of at most TIMELINE_BUCKET_SIZE events, so incident documents stay
+a fixed size and list/detail reads never carry the history.
+Status transitions are applied by the workflow service, which writes their
+timeline events synchronously once the conditional update has matched.
+"""
+from datetime import datetime
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import InvalidOperation
+
+TIMELINE_COLLECTION = "incident_timeline"
+TIMELINE_BUCKET_SIZE = 50
+
+# Flipped off after the first server that rejects MongoClient.bulk_write (< 8.0)
+_client_bulk_supported = True
+
+
+def build_event(action, actor, time=None):
+    """Build a single timeline event."""
+    return {
+        "action": action,
+        "by": actor,
+        "time": time or datetime.utcnow()
+    }
+
+
+def _bucket_filter(incident_id):
+    return {"incident_id": incident_id, "count": {"$lt": TIMELINE_BUCKET_SIZE}}
+
+
+def _bucket_update(event):
+    return {
+        "$push": {"events": event},
+        "$inc": {"count": 1},
+        "$min": {"start": event["time"]},
+        "$max": {"end": event["time"]}
+    }
+
+
+def bucket_append_op(incident_id, event, namespace=None):
+    """
+    UpdateOne that appends `event` to the incident's open bucket.
+    When every bucket is full the upsert opens a new one.
+    """
+    kwargs = {"namespace": namespace} if namespace else {}
+    return UpdateOne(_bucket_filter(incident_id), _bucket_update(event), upsert=True, **kwargs)
+
+
+def write_event(db, incident_id, event):
+    """Append an already built event to an incident timeline."""
+    db[TIMELINE_COLLECTION].update_one(
+        _bucket_filter(incident_id), _bucket_update(event), upsert=True
+    )
+    return event
+
+
+def append_event(db, incident_id, action, actor):
+    """Append a single event to an incident timeline."""
+    return write_event(db, incident_id, build_event(action, actor))
+
+
+def _client_bulk_write(db, models):
+    """
+    Run a multi-collection bulk write in one round trip.
+    Returns None when the server does not support it (MongoDB < 8.0).
+    """
+    global _client_bulk_supported
+    if not _client_bulk_supported:
+        return None
+    try:
+        return db.client.bulk_write(models, ordered=True, verbose_results=True)
+    except (InvalidOperation, AttributeError, NotImplementedError):
+        _client_bulk_supported = False
+        return None
+
+
+def insert_incident_with_event(db, incident, action, actor):
+    """
+    Insert a new incident together with its first timeline event.
+    Returns the inserted incident id.
+    """
+    incident.setdefault("_id", ObjectId())
+
+    event = build_event(action, actor, incident.get("created_at"))
+    result = _client_bulk_write(db, [
+        InsertOne(incident, namespace=f"{db.name}.incidents"),
+        bucket_append_op(incident["_id"], event, namespace=f"{db.name}.{TIMELINE_COLLECTION}")
+    ])
+
+    if result is None:
+        db.incidents.insert_one(incident)
+        append_event(db, incident["_id"], action, actor)
+
+    return incident["_id"]
+
+
+def get_timeline(db, incident_id, page=1, limit=50):
+    """
+    Page through an incident timeline in chronological order.
+    Only the buckets overlapping the requested page are fetched.
+    """
+    collection = db[TIMELINE_COLLECTION]
+    headers = list(
+        collection.find({"incident_id": incident_id}, {"count": 1})
+        .sort([("start", 1), ("_id", 1)])
+    )
+
+    total = sum(h.get("count", 0) for h in headers)
+    skip = (page - 1) * limit
+
+    wanted = []
+    offset = 0
+    for header in headers:
+        count = header.get("count", 0)
+        if offset + count > skip and offset < skip + limit:
+            wanted.append((header["_id"], offset))
+        offset += count
+
+    events = []
+    if wanted:
+        buckets = {
+            doc["_id"]: doc.get("events", [])
+            for doc in collection.find({"_id": {"$in": [w[0] for w in wanted]}}, {"events": 1})
+        }
+        for bucket_id, start in wanted:
+            for index, event in enumerate(buckets.get(bucket_id, [])):
+                if skip <= start + index < skip + limit:
+                    events.append(event)
+
+    return {
+        "events": events,
+        "total": total,
+        "page": page,
+        "limit": limit
+    }
@@ -0,0 +1,109 @@
+"""
+Token Revocation — Denylist of logged-out JWTs.
+Revoked JTIs are stored in `revoked_tokens` until the token would have
+expired anyway (TTL index), and mirrored in an in-memory set that every
+worker refreshes incrementally, so the blocklist check on each
+authenticated request is a single hash lookup. The check fails closed: until
+the first successful sync, or when no denylist could be set up at all, every
+token is refused rather than letting logged-out tokens through. A denylist
+whose syncs keep failing is reported as degraded on /api/admin/system-health.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from pymongo.errors import DuplicateKeyError
+from app.extensions import jwt
+from app.utils.periodic import run_periodically
+
+REVOKED_COLLECTION = "revoked_tokens"
+
+# Re-read a little before the last sync to cover clock skew between workers
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationList:
+    def __init__(self, db, logger=None, stale_after=10.0):
+        self.db = db
+        self.logger = logger
+        self.stale_after = stale_after
+        self._revoked = {}  # jti -> expires_at
+        self._lock = threading.Lock()
+        self._synced_until = None
+        self._synced_at = None
+
+    def is_revoked(self, jti):
+        # Never synced: the denylist is unknown, so refuse every token
+        return self._synced_at is None or jti in self._revoked
+
+    def revoke(self, jti, expires_at):
+        """Persist the revocation, then apply it locally."""
+        now = datetime.utcnow()
+        try:
+            self.db[REVOKED_COLLECTION].insert_one({"_id": jti, "expires_at": expires_at, "revoked_at": now})
+        except DuplicateKeyError:
+            pass
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def sync(self):
+        """Pull revocations made by other workers and forget expired ones."""
+        now = datetime.utcnow()
+        query = {"expires_at": {"$gt": now}}
+        if self._synced_until is not None:
+            query["revoked_at"] = {"$gte": self._synced_until - SYNC_OVERLAP}
+
+        docs = list(self.db[REVOKED_COLLECTION].find(query, {"expires_at": 1}))
+        with self._lock:
+            for doc in docs:
+                self._revoked[doc["_id"]] = doc["expires_at"]
+            for jti in [j for j, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+        self._synced_until = now
+        self._synced_at = time.monotonic()
+
+    def size(self):
+        return len(self._revoked)
+
+    def stats(self):
+        age = None if self._synced_at is None else time.monotonic() - self._synced_at
+        return {
+            "revoked": len(self._revoked),
+            "last_sync_seconds_ago": None if age is None else round(age, 1),
+            "degraded": age is None or age > self.stale_after
+        }
+
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(jwt_header, jwt_payload):
+    revocations = getattr(current_app, "revocations", None)
+    if revocations is None:
+        current_app.logger.error("Token revocation list unavailable, refusing token")
+        return True
+    return revocations.is_revoked(jwt_payload.get("jti"))
+
+
+def init_token_revocation(app):
+    """Attach the revocation list to the app and start its sync loop."""
+    interval = app.config.get("REVOCATION_SYNC_SECONDS", 2.0)
+    revocations = RevocationList(app.db, app.logger, stale_after=5 * interval)
+    try:
+        revocations.sync()
+    except Exception as e:
+        app.logger.error(f"Initial revocation sync failed, refusing tokens until it succeeds: {e}")
+
+    run_periodically("revocation-sync", interval, revocations.sync, app.logger)
+    app.revocations = revocations
+    return revocations
+
+
+def revoke_token(jwt_payload):
+    """Revoke the token described by `jwt_payload` (from get_jwt())."""
+    revocations = getattr(current_app, "revocations", None)
+    if revocations is None:
+        return False
+
+    exp = jwt_payload.get("exp")
+    expires_at = datetime.utcfromtimestamp(exp) if exp else datetime.utcnow() + timedelta(days=1)
+    revocations.revoke(jwt_payload["jti"], expires_at)
+    return True
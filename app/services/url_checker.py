@@ -1,39 +1,25 @@
 from flask import current_app
-import requests
 import re
+from app.services.safe_browsing import init_safe_browsing
 
 def extract_urls(text):
     pattern = r'(https?://[^\s]+)'
     return re.findall(pattern, text)
 
-def is_malicious(url):
-    api_key = current_app.config.get("SAFE_BROWSING_API_KEY")
+def _client():
+    app = current_app._get_current_object()
+    client = getattr(app, "safe_browsing", None)
+    if client is None:
+        client = init_safe_browsing(app)
+    return client
 
-    if not api_key:
-        current_app.logger.warning("SAFE_BROWSING_API_KEY is missing. Skipping URL check.")
-        return False
+def find_malicious_urls(urls, timeout=None):
+    """
+    Subset of `urls` flagged by Safe Browsing (one request for all of them).
+    None when the reputation is unknown (upstream down, slow or shed).
+    """
+    return _client().check(list(dict.fromkeys(urls)), timeout=timeout)
 
-    endpoint = f"https://safebrowsing.googleapis.com/v4/threatMatches:find?key={api_key}"
-    
-    payload = {
-        "client": {
-            "clientId": "cyberguard",
-            "clientVersion": "1.0"
-        },
-        "threatInfo": {
-            "threatTypes": ["MALWARE", "SOCIAL_ENGINEERING"],
-            "platformTypes": ["ANY_PLATFORM"],
-            "threatEntryTypes": ["URL"],
-            "threatEntries": [{"url": url}]
-        }
-    }
-
-    try:
-        response = requests.post(endpoint, json=payload, timeout=5)
-        response.raise_for_status()
-        result = response.json()
-        current_app.logger.debug(f"Safe Browsing API response: {result}") 
-        return "matches" in result
-    except Exception as e:
-        current_app.logger.error(f"Error checking URL with Safe Browsing: {e}")
-        return False
+def is_malicious(url, timeout=None):
+    """Single-URL lookup; an unknown reputation counts as not malicious."""
+    return url in (find_malicious_urls([url], timeout=timeout) or ())
@@ -0,0 +1,86 @@
+"""
+User Cache — In-process user lookups for the auth paths.
+Login and profile requests resolve the user document here instead of
+querying `users` every time. Entries (including "no such user") live for
+USER_CACHE_TTL_SECONDS and are dropped when the user is modified; a users
+write version bump from any worker invalidates every entry.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from app.services.version_service import VersionScopes, current_versions
+
+_MISSING = object()
+
+
+class UserCache:
+    def __init__(self, db, ttl=60, max_entries=10000):
+        self.db = db
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, username):
+        """User document for `username` (None when it does not exist)."""
+        versions = current_versions(VersionScopes.USERS)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is not None:
+                user, entry_versions, expires_at = entry
+                if entry_versions == versions and expires_at > now:
+                    self._entries.move_to_end(username)
+                    self.hits += 1
+                    return user
+                del self._entries[username]
+            self.misses += 1
+
+        user = self.db.users.find_one({"username": username})
+
+        with self._lock:
+            self._entries[username] = (user, versions, now + self.ttl)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, username=_MISSING):
+        """Drop one user's entry, or every entry."""
+        with self._lock:
+            if username is _MISSING:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def init_user_cache(app):
+    """Attach a UserCache to the app."""
+    app.user_cache = UserCache(
+        app.db,
+        ttl=app.config.get("USER_CACHE_TTL_SECONDS", 60),
+        max_entries=app.config.get("USER_CACHE_MAX_ENTRIES", 10000)
+    )
+    return app.user_cache
+
+
+def find_user(username):
+    """Look up a user through the cache (direct query when it is disabled)."""
+    cache = getattr(current_app, "user_cache", None)
+    if cache is None:
+        return current_app.db.users.find_one({"username": username})
+    return cache.get(username)
+
+
+def invalidate_user(username):
+    """Call after inserting, updating or deleting a user."""
+    cache = getattr(current_app, "user_cache", None)
+    if cache is not None:
+        cache.invalidate(username)
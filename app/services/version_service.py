@@ -0,0 +1,84 @@
+"""
+Version Service — Per-collection write version counters.
+Write paths bump a scope ("incidents", "users", "audit_logs"); read paths
+derive ETags and cache keys from the current values without touching Mongo.
+A bump is an atomic `$inc` on the shared counter and the worker adopts the
+value Mongo returns, so every version number is handed out exactly once
+across workers. Other workers pull the shared counters once per
+VERSION_SYNC_SECONDS: until then they keep serving (and answering 304 for)
+the previous version, i.e. another worker's write is seen within that window.
+"""
+import threading
+from flask import current_app
+from pymongo import ReturnDocument
+from app.utils.periodic import run_periodically
+
+VERSION_COLLECTION = "versions"
+
+
+class VersionScopes:
+    INCIDENTS = "incidents"
+    USERS = "users"
+    AUDIT_LOGS = "audit_logs"
+
+
+class VersionRegistry:
+    def __init__(self, db, logger=None):
+        self.db = db
+        self.logger = logger
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def current(self, *scopes):
+        """Tuple of the current versions of `scopes`."""
+        return tuple(self._versions.get(scope, 0) for scope in scopes)
+
+    def _advance(self, scope, version):
+        with self._lock:
+            if version > self._versions.get(scope, 0):
+                self._versions[scope] = version
+
+    def bump(self, *scopes):
+        for scope in scopes:
+            try:
+                doc = self.db[VERSION_COLLECTION].find_one_and_update(
+                    {"_id": scope}, {"$inc": {"v": 1}},
+                    upsert=True, projection={"v": 1}, return_document=ReturnDocument.AFTER
+                )
+                self._advance(scope, doc["v"])
+            except Exception as e:
+                # Still invalidate this worker's ETags and cache; the next sync realigns
+                if self.logger:
+                    self.logger.error(f"Version bump for {scope} failed: {e}")
+                self._advance(scope, self._versions.get(scope, 0) + 1)
+
+    def sync(self):
+        """Merge the shared counters (highest value wins)."""
+        for doc in self.db[VERSION_COLLECTION].find():
+            self._advance(doc["_id"], doc.get("v", 0))
+
+
+def init_versioning(app):
+    """Attach a VersionRegistry to the app and start its sync loop."""
+    registry = VersionRegistry(app.db, app.logger)
+    try:
+        registry.sync()
+    except Exception as e:
+        app.logger.warning(f"Initial version sync failed: {e}")
+
+    interval = app.config.get("VERSION_SYNC_SECONDS", 1.0)
+    run_periodically("version-sync", interval, registry.sync, app.logger)
+    app.versions = registry
+    return registry
+
+
+def bump_versions(*scopes):
+    """Bump version scopes from a request (no-op without a registry)."""
+    registry = getattr(current_app, "versions", None)
+    if registry is not None:
+        registry.bump(*scopes)
+
+
+def current_versions(*scopes):
+    registry = getattr(current_app, "versions", None)
+    return registry.current(*scopes) if registry is not None else None
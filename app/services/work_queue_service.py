@@ -0,0 +1,108 @@
+"""
+Work Queue Service — Atomic analyst claiming.
+Unreviewed incidents carry a `queue_rank`: their creation time pulled forward
+by risk score and the flagged bit. Sorting by rank ascending serves the most
+urgent work first while older incidents still age their way to the front.
+Claims are leases; an expired lease makes the incident claimable again.
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from pymongo import ReturnDocument
+from app.constants.incident_constants import AdminMessages
+from app.models.incident_model import IncidentModel
+from app.services.version_service import VersionScopes, bump_versions
+
+# Each risk point pulls an incident forward by 36s (score 100 = 1 hour)
+RISK_WEIGHT_SECONDS = 36
+# Flagged (HIGH) incidents jump a further 4 hours ahead
+FLAGGED_BOOST_SECONDS = 4 * 3600
+
+# Lease expiry of an unclaimed incident
+UNCLAIMED = datetime(1970, 1, 1)
+
+# Fields removed when an incident leaves the queue
+QUEUE_FIELDS = {"queue_rank": "", "lease_expires_at": "", "claimed_by": "", "claimed_at": ""}
+
+QUEUE_FILTER = {"queue_rank": {"$exists": True}}
+
+
+def queue_fields(created_at, risk_score=0, flagged=False):
+    """Queue fields stored on a newly created incident."""
+    boost = (risk_score or 0) * RISK_WEIGHT_SECONDS
+    if flagged:
+        boost += FLAGGED_BOOST_SECONDS
+
+    return {
+        "queue_rank": created_at - timedelta(seconds=boost),
+        "lease_expires_at": UNCLAIMED,
+        "claimed_by": None
+    }
+
+
+def _lease_seconds():
+    return current_app.config.get("WORK_QUEUE_LEASE_SECONDS", 900)
+
+
+def claim_next(actor):
+    """
+    Claim the highest-priority unclaimed (or lease-expired) incident.
+    Returns (response_dict, status_code).
+    """
+    db = current_app.db
+    now = datetime.utcnow()
+    lease_expires_at = now + timedelta(seconds=_lease_seconds())
+
+    incident = db.incidents.find_one_and_update(
+        {**QUEUE_FILTER, "lease_expires_at": {"$lte": now}},
+        {
+            "$set": {
+                "claimed_by": actor,
+                "claimed_at": now,
+                "lease_expires_at": lease_expires_at
+            },
+            "$inc": {"claim_count": 1}
+        },
+        sort=[("queue_rank", 1)],
+        projection=IncidentModel.READ_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+
+    if incident is None:
+        return {"msg": AdminMessages.QUEUE_EMPTY, "incident": None}, 200
+
+    bump_versions(VersionScopes.INCIDENTS)
+    return {"incident": incident, "lease_expires_at": lease_expires_at}, 200
+
+
+def renew_lease(incident_id, actor):
+    """Extend a lease still held by `actor`."""
+    db = current_app.db
+    now = datetime.utcnow()
+    lease_expires_at = now + timedelta(seconds=_lease_seconds())
+
+    result = db.incidents.update_one(
+        {"_id": incident_id, "claimed_by": actor, "lease_expires_at": {"$gt": now}},
+        {"$set": {"lease_expires_at": lease_expires_at}}
+    )
+
+    if result.matched_count == 0:
+        return {"msg": AdminMessages.LEASE_LOST}, 409
+
+    bump_versions(VersionScopes.INCIDENTS)
+    return {"lease_expires_at": lease_expires_at}, 200
+
+
+def release_lease(incident_id, actor):
+    """Hand a claimed incident back to the queue."""
+    db = current_app.db
+
+    result = db.incidents.update_one(
+        {"_id": incident_id, "claimed_by": actor},
+        {"$set": {"lease_expires_at": UNCLAIMED, "claimed_by": None}}
+    )
+
+    if result.matched_count == 0:
+        return {"msg": AdminMessages.LEASE_LOST}, 409
+
+    bump_versions(VersionScopes.INCIDENTS)
+    return {"msg": AdminMessages.LEASE_RELEASED}, 200
@@ -0,0 +1,146 @@
+"""
+Workflow Service — Incident state machine.
+Each transition is one conditional find_one_and_update: the filter only
+matches when the incident is in a status the transition is allowed from (and,
+optionally, at the version the client last saw), so two analysts racing on
+the same incident cannot silently overwrite each other. The timeline event and
+the audit entry (who moved which incident, and the verdict) are written
+synchronously once the update has matched, as they must survive a worker crash.
+"""
+from datetime import datetime
+from flask import current_app
+from pymongo import ReturnDocument
+from app.constants.incident_constants import AdminMessages, IncidentStatus, LEGACY_STATUSES, WORKFLOW_TRANSITIONS
+from app.services.audit_service import log_activity
+from app.services.timeline_service import TIMELINE_COLLECTION, build_event, bucket_append_op, write_event
+from app.services.work_queue_service import QUEUE_FIELDS, queue_fields
+from app.services.version_service import VersionScopes, bump_versions
+from app.services.event_stream import publish_incident_event, EventTypes
+
+# Reaching one of these (or an analyst verdict) takes an incident off the work queue
+QUEUE_EXIT_STATUSES = [IncidentStatus.RESOLVED, IncidentStatus.CLOSED]
+# Moving back into one of these (a reopen) puts it on the queue again
+QUEUED_STATUSES = [IncidentStatus.OPEN, IncidentStatus.UNDER_REVIEW]
+
+
+def allowed_sources(target_status):
+    """Statuses an incident may be in for a move to `target_status`."""
+    return [source for source, targets in WORKFLOW_TRANSITIONS.items() if target_status in targets]
+
+
+def workflow_status(status, analyst_reviewed=False):
+    """
+    The workflow status for a stored (possibly legacy or free-text) status.
+    Unknown values become resolved when an analyst reviewed the incident, else open.
+    """
+    key = str(status or "").strip().lower().replace(" ", "_").replace("-", "_")
+    if key in WORKFLOW_TRANSITIONS:
+        return key
+    if key in LEGACY_STATUSES:
+        return LEGACY_STATUSES[key]
+    return IncidentStatus.RESOLVED if analyst_reviewed else IncidentStatus.OPEN
+
+
+def apply_transition(incident_id, target_status, actor, action, audit_event,
+                     fields=None, expected_version=None, role=None, audit_details=None):
+    """
+    Move an incident to `target_status` with a single conditional update.
+    Returns (response_dict, status_code) like the other services.
+    """
+    if target_status not in WORKFLOW_TRANSITIONS:
+        return {"msg": AdminMessages.INVALID_STATUS}, 400
+
+    db = current_app.db
+    now = datetime.utcnow()
+    event = build_event(action, actor, now)
+
+    query = {"_id": incident_id, "status": {"$in": allowed_sources(target_status)}}
+    if expected_version is not None:
+        # Documents written before versioning have no field (matches null)
+        query["version"] = {"$in": [expected_version, None]} if expected_version == 0 else expected_version
+
+    update_fields = dict(fields or {})
+    update_fields.update({
+        "status": target_status,
+        "updated_at": now,
+        "last_event": event
+    })
+
+    update = {"$set": update_fields, "$inc": {"version": 1}}
+    leaves_queue = target_status in QUEUE_EXIT_STATUSES or update_fields.get("analyst_reviewed")
+    if leaves_queue:
+        update["$unset"] = QUEUE_FIELDS
+
+    incident = db.incidents.find_one_and_update(
+        query,
+        update,
+        projection={"status": 1, "version": 1, "risk_level": 1, "risk_score": 1, "flagged": 1,
+                    "platform": 1, "created_at": 1, "queue_rank": 1},
+        return_document=ReturnDocument.AFTER
+    )
+
+    if incident is None:
+        current = db.incidents.find_one({"_id": incident_id}, {"status": 1, "version": 1})
+        if current is None:
+            return {"msg": AdminMessages.NOT_FOUND}, 404
+        if current.get("status") in allowed_sources(target_status):
+            msg = AdminMessages.STALE_TRANSITION
+        else:
+            msg = AdminMessages.INVALID_TRANSITION
+        return {
+            "msg": msg,
+            "status": current.get("status"),
+            "version": current.get("version", 0)
+        }, 409
+
+    if target_status in QUEUED_STATUSES and not leaves_queue and "queue_rank" not in incident:
+        # Reopened: back on the queue, unclaimed, ranked by its original age.
+        # The status filter keeps a transition that raced in since then intact.
+        db.incidents.update_one(
+            {"_id": incident_id, "status": target_status, "queue_rank": {"$exists": False}},
+            {"$set": queue_fields(incident.get("created_at") or now, incident.get("risk_score"), incident.get("flagged"))}
+        )
+
+    bump_versions(VersionScopes.INCIDENTS)
+    publish_incident_event(EventTypes.INCIDENT_STATUS, incident)
+
+    write_event(db, incident_id, event)
+
+    details = {"incident_id": str(incident_id)}
+    details.update(audit_details or {})
+    log_activity(actor=actor, event_type=audit_event, details=details, role=role)
+
+    return {
+        "status": incident["status"],
+        "version": incident["version"]
+    }, 200
+
+
+def cascade_review(canonical_id, target_status, fields, actor):
+    """
+    Copy an analyst verdict on a canonical incident to its unreviewed duplicates,
+    which never enter the analyst queues themselves.
+    Returns the number of duplicates updated.
+    """
+    db = current_app.db
+    query = {
+        "canonical_incident_id": canonical_id,
+        "analyst_reviewed": False,
+        "status": {"$in": allowed_sources(target_status)}
+    }
+    duplicate_ids = [doc["_id"] for doc in db.incidents.find(query, {"_id": 1})]
+    if not duplicate_ids:
+        return 0
+
+    now = datetime.utcnow()
+    event = build_event(f"Verdict copied from incident {canonical_id}", actor, now)
+    update_fields = dict(fields)
+    update_fields.update({"status": target_status, "updated_at": now, "last_event": event})
+
+    query["_id"] = {"$in": duplicate_ids}
+    db.incidents.update_many(query, {"$set": update_fields, "$inc": {"version": 1}})
+    db[TIMELINE_COLLECTION].bulk_write(
+        [bucket_append_op(duplicate_id, event) for duplicate_id in duplicate_ids], ordered=False
+    )
+    bump_versions(VersionScopes.INCIDENTS)
+    return len(duplicate_ids)
@@ -0,0 +1,82 @@
+"""
+Write Queue — Batched background writes.
+Non-critical writes (audit entries, timeline events) are enqueued from the
+request thread and flushed by a single daemon thread as ordered bulk writes,
+so an analyst action costs one synchronous Mongo round trip.
+Delivery is best effort: entries still queued when the process is killed, or
+in a bulk write that fails, are lost (failures are logged). Audit entries that
+must not be lost go through the synchronous `log_activity` instead.
+"""
+import atexit
+import queue
+import threading
+import time
+
+
+class BatchedWriter:
+    def __init__(self, db, logger, max_batch=500, flush_interval=0.2, max_queue=10000):
+        self.db = db
+        self.logger = logger
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="batched-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, collection_name, operation):
+        """
+        Enqueue a pymongo write model (InsertOne, UpdateOne, ...).
+        Falls back to a synchronous write when the queue is full.
+        """
+        try:
+            self._queue.put_nowait((collection_name, operation))
+        except queue.Full:
+            self.logger.warning("Write queue full, writing synchronously")
+            self._write([(collection_name, operation)])
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def flush(self):
+        """Drain everything currently queued on the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        # One ordered bulk write per collection; order within a collection is kept
+        groups = {}
+        for collection_name, operation in batch:
+            groups.setdefault(collection_name, []).append(operation)
+
+        for collection_name, operations in groups.items():
+            try:
+                self.db[collection_name].bulk_write(operations, ordered=True)
+            except Exception as e:
+                self.logger.error(f"Batched write to {collection_name} failed: {e}")
+
+
+def init_write_queue(app):
+    """Attach a BatchedWriter to the app (requires app.db)."""
+    app.write_queue = BatchedWriter(app.db, app.logger)
+    return app.write_queue
@@ -1,4 +1,4 @@
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, TEXT
 
 def init_db_indexes(db, logger):
     """
@@ -15,11 +15,58 @@ def init_db_indexes(db, logger):
         db.incidents.create_index([("created_at", DESCENDING)])
         db.incidents.create_index([("analyst_reviewed", ASCENDING)])
         
+        # Full-text search (one text index per collection)
+        db.incidents.create_index(
+            [
+                ("narrative", TEXT), ("ioc_indicators", TEXT), ("ocr_terms", TEXT),
+                ("platform", TEXT), ("threat_type_suggested", TEXT), ("threat_type", TEXT)
+            ],
+            name="incident_search",
+            weights={
+                "ioc_indicators": 8, "narrative": 5, "threat_type": 3,
+                "threat_type_suggested": 3, "platform": 2, "ocr_terms": 1
+            }
+        )
+        db.incidents.create_index([("risk_level", ASCENDING), ("created_at", DESCENDING)])
+        
+        # Analyst work queue (only incidents still in the queue are indexed)
+        db.incidents.create_index(
+            [("queue_rank", ASCENDING), ("lease_expires_at", ASCENDING)],
+            partialFilterExpression={"queue_rank": {"$exists": True}}
+        )
+        
+        # Archival candidates + archive lookups
+        db.incidents.create_index([("status", ASCENDING), ("updated_at", ASCENDING)])
+        db.incidents_archive.create_index([("reported_by", ASCENDING)])
+        
+        # Incident Timeline Indexes (bucket append + paging)
+        db.incident_timeline.create_index([("incident_id", ASCENDING), ("count", ASCENDING)])
+        db.incident_timeline.create_index([("incident_id", ASCENDING), ("start", ASCENDING)])
+        
+        # IOC inverted index (indicator -> incidents)
+        db.iocs.create_index([("key", ASCENDING), ("incident_id", ASCENDING)], unique=True)
+        db.iocs.create_index([("incident_id", ASCENDING)])
+        
+        # Canonical report signatures (near-duplicate detection)
+        db.report_signatures.create_index([("created_at", ASCENDING)])
+        db.incidents.create_index([("canonical_incident_id", ASCENDING)], sparse=True)
+        
+        # Scam campaigns (clustering job + top campaigns listing)
+        db.campaigns.create_index([("last_seen", DESCENDING), ("size", DESCENDING)])
+        db.incidents.create_index([("campaign_id", ASCENDING)], sparse=True)
+        
         # Audit Logs Indexes
         db.audit_logs.create_index([("timestamp", DESCENDING)])
         db.audit_logs.create_index([("actor", ASCENDING)])
         db.audit_logs.create_index([("event_type", ASCENDING)])
         
+        # Revoked JWTs are kept until the token would have expired
+        db.revoked_tokens.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+        db.revoked_tokens.create_index([("revoked_at", ASCENDING)])
+        
+        # Shared rate-limit buckets expire once they would be full again
+        db.rate_limits.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+        
         # Request Logs Indexes
         db.request_logs.create_index([("timestamp", DESCENDING)])
         
@@ -33,6 +33,20 @@ def register_error_handlers(app):
             "message": "The requested resource was not found"
         }), 404
 
+    @app.errorhandler(412)
+    def precondition_failed(error):
+        return jsonify({
+            "error": "Precondition Failed",
+            "message": str(error.description) if hasattr(error, 'description') else str(error)
+        }), 412
+
+    @app.errorhandler(413)
+    def request_too_large(error):
+        return jsonify({
+            "error": "Payload Too Large",
+            "message": str(error.description) if hasattr(error, 'description') else str(error)
+        }), 413
+
     @app.errorhandler(500)
     def internal_error(error):
         app.logger.error(f"Internal Server Error: {error}")
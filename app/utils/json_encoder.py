@@ -0,0 +1,99 @@
+"""
+JSON Encoder — Fast response serialization.
+Encodes Mongo documents with orjson (stdlib json fallback), rendering
+ObjectId as a string, datetimes as ISO-8601 UTC and Decimal128 as a decimal
+string instead of extended-JSON wrappers. Large result sets are streamed
+straight from the cursor as a chunked JSON array or NDJSON.
+"""
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from flask import Response, request
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+JSON_MIMETYPE = "application/json"
+
+# Documents per streamed chunk
+STREAM_CHUNK_SIZE = 500
+
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, datetime):
+        return obj.isoformat() + ("Z" if obj.tzinfo is None else "")
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def to_json(obj):
+        """Serialize to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def to_json(obj):
+        """Serialize to UTF-8 JSON bytes."""
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(obj, status=200):
+    """Flask response for a single JSON payload."""
+    return Response(to_json(obj), status=status, mimetype=JSON_MIMETYPE)
+
+
+def wants_ndjson():
+    return request.args.get("format") == "ndjson" or \
+        request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def _iter_json_array(docs, transform):
+    yield b"["
+    first = True
+    chunk = []
+    for doc in docs:
+        if transform is not None:
+            doc = transform(doc)
+        chunk.append(to_json(doc))
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield (b"" if first else b",") + b",".join(chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]"
+
+
+def _iter_ndjson(docs, transform):
+    chunk = []
+    for doc in docs:
+        if transform is not None:
+            doc = transform(doc)
+        chunk.append(to_json(doc))
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def stream_documents(docs, transform=None, status=200):
+    """
+    Stream a cursor (or any iterable) without materializing it.
+    Emits NDJSON when the client asks for it, else a chunked JSON array.
+    """
+    if wants_ndjson():
+        return Response(_iter_ndjson(docs, transform), status=status, mimetype=NDJSON_MIMETYPE)
+    return Response(_iter_json_array(docs, transform), status=status, mimetype=JSON_MIMETYPE)
@@ -0,0 +1,21 @@
+import threading
+
+
+def run_periodically(name, interval, fn, logger=None):
+    """
+    Runs `fn` every `interval` seconds on a daemon thread.
+    Exceptions are logged and never stop the loop.
+    """
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            try:
+                fn()
+            except Exception as e:
+                if logger:
+                    logger.error(f"Periodic task {name} failed: {e}")
+
+    thread = threading.Thread(target=loop, name=name, daemon=True)
+    thread.start()
+    return stop
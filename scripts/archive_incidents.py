@@ -0,0 +1,46 @@
+import os
+import sys
+import logging
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from app.services.archive_service import archive_closed_incidents, ARCHIVE_COLLECTION
+
+
+def archive_incidents():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client["cyberguard"]
+        print("\n--- Closed Incident Archival ---")
+        print(f"Archiving resolved/closed incidents older than {Config.ARCHIVE_AFTER_DAYS} day(s)")
+
+        moved = archive_closed_incidents(
+            db,
+            older_than_days=Config.ARCHIVE_AFTER_DAYS,
+            batch_size=Config.ARCHIVE_BATCH_SIZE,
+            pause_seconds=Config.ARCHIVE_BATCH_PAUSE_SECONDS,
+            logger=logging.getLogger("archive")
+        )
+
+        print(f"\n✅ Moved {moved} incident(s) to '{ARCHIVE_COLLECTION}'")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    archive_incidents()
@@ -0,0 +1,74 @@
+import os
+import sys
+from pymongo import MongoClient, UpdateOne
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.incident_codec import decompress_text
+from app.services.ioc_extractor import extract_iocs
+from app.services.ioc_service import IOC_COLLECTION, index_operations
+
+BATCH_SIZE = 500
+
+PROJECTION = {"narrative": 1, "description": 1, "ioc_indicators": 1, "ocr_text_z": 1, "ocr_extracted_text": 1, "created_at": 1}
+
+
+def backfill_iocs():
+    load_dotenv()
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client["cyberguard"]
+        print("\n--- IOC Index Backfill ---")
+
+        last_id = None
+        indexed = 0
+        indicators = 0
+        while True:
+            query = {"ioc_keys": {"$exists": False}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            batch = list(db.incidents.find(query, PROJECTION).sort("_id", 1).limit(BATCH_SIZE))
+            if not batch:
+                break
+
+            incident_ops = []
+            ioc_ops = []
+            for incident in batch:
+                ocr_text = incident.get("ocr_extracted_text") or decompress_text(incident.get("ocr_text_z"))
+                iocs = extract_iocs(
+                    incident.get("narrative") or incident.get("description"),
+                    incident.get("ioc_indicators"),
+                    ocr_text
+                )
+                incident_ops.append(UpdateOne({"_id": incident["_id"]}, {"$set": {"ioc_keys": [i["key"] for i in iocs]}}))
+                ioc_ops.extend(index_operations(incident["_id"], iocs, incident.get("created_at")))
+
+            # Index rows first, so an interrupted run is simply re-run
+            if ioc_ops:
+                db[IOC_COLLECTION].bulk_write(ioc_ops, ordered=False)
+            db.incidents.bulk_write(incident_ops, ordered=False)
+
+            indexed += len(batch)
+            indicators += len(ioc_ops)
+            last_id = batch[-1]["_id"]
+            print(f"  indexed {indexed} incident(s), {indicators} indicator(s)...")
+
+        print(f"\n✅ Indexed {indexed} incident(s)")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    backfill_iocs()
@@ -0,0 +1,55 @@
+import os
+import sys
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.work_queue_service import RISK_WEIGHT_SECONDS, FLAGGED_BOOST_SECONDS, UNCLAIMED
+
+
+def backfill_work_queue():
+    load_dotenv()
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client["cyberguard"]
+        print("\n--- Work Queue Backfill ---")
+
+        # Same rank as queue_fields(), computed server-side (date - ms = date)
+        result = db.incidents.update_many(
+            {
+                "analyst_reviewed": False,
+                "canonical_incident_id": {"$exists": False},
+                "status": {"$in": ["open", "under_review"]},
+                "queue_rank": {"$exists": False}
+            },
+            [{"$set": {
+                "queue_rank": {"$subtract": [
+                    "$created_at",
+                    {"$add": [
+                        {"$multiply": [{"$ifNull": ["$risk_score", 0]}, RISK_WEIGHT_SECONDS * 1000]},
+                        {"$cond": [{"$eq": ["$flagged", True]}, FLAGGED_BOOST_SECONDS * 1000, 0]}
+                    ]}
+                ]},
+                "lease_expires_at": UNCLAIMED,
+                "claimed_by": None
+            }}]
+        )
+
+        print(f"\n✅ Queued {result.modified_count} unreviewed incident(s)")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    backfill_work_queue()
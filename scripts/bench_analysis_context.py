@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+from flask import Flask
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.analysis_context import AnalysisContext
+from app.services.risk_engine import calculate_risk_score, detect_threat_type
+from app.services.threat_classifier import get_threat_classifier
+from tests.legacy_scoring import legacy_analyze
+
+ROUNDS = 200
+
+REPORTS = [
+    ("Dear customer your SBI account will be blocked today. Click http://sbi-kyc.tk to update your KYC "
+     "immediately and share the OTP you receive. " * 3, "http://sbi-kyc.tk 9876543210", ""),
+    ("Caller claiming to be from the bank asked me to verify my login and password urgently", "", ""),
+    ("I'm your boss, buy gift cards now and send me the codes", "",
+     "WhatsApp screenshot text: send the codes now, this is urgent, do not tell anyone " * 10),
+    ("Got a newsletter with a discount offer", "", ""),
+]
+
+
+def analyze(narrative, ioc_indicators, ocr_text):
+    context = AnalysisContext(narrative, ioc_indicators, ocr_text)
+    score, level, reasons = calculate_risk_score(context)
+    threat_type, confidence = detect_threat_type(context)
+    return score, level, reasons, threat_type, confidence
+
+
+def measure(label, fn):
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        for report in REPORTS:
+            fn(*report)
+    elapsed = time.process_time() - start
+    per_report = elapsed / (ROUNDS * len(REPORTS)) * 1000
+    print(f"{label:<28} {per_report:7.3f} ms CPU/report")
+    return per_report
+
+
+def main():
+    print(f"\n--- Report Analysis CPU ({ROUNDS * len(REPORTS):,} reports) ---")
+
+    # No SAFE_BROWSING_API_KEY: the reputation lookup is skipped on both paths
+    app = Flask(__name__)
+    with app.app_context():
+        get_threat_classifier()
+        for report in REPORTS:
+            if analyze(*report) != legacy_analyze(*report):
+                print("❌ Error: shared-context scores differ from the legacy path")
+                return
+
+        legacy = measure("legacy (per-scorer text)", legacy_analyze)
+        shared = measure("shared AnalysisContext", analyze)
+
+    print(f"✅ {(1 - shared / legacy) * 100:.0f}% less CPU per report, identical scores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import logging
+from dotenv import load_dotenv
+from werkzeug.security import generate_password_hash
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.services.auth_service import authenticate_user, get_user_profile
+
+USERS = 200
+REQUESTS = 5000
+PASSWORD = "bench-password"
+PREFIX = "bench_user_"
+
+
+def seed(db):
+    # Cheap hash so the numbers show lookup cost, not PBKDF2 cost
+    hashed = generate_password_hash(PASSWORD, method="pbkdf2:sha256:1")
+    db.users.delete_many({"username": {"$regex": f"^{PREFIX}"}})
+    db.users.insert_many([
+        {"username": f"{PREFIX}{i}", "password": hashed, "role": "user"} for i in range(USERS)
+    ])
+
+
+def cleanup(db):
+    db.users.delete_many({"username": {"$regex": f"^{PREFIX}"}})
+    db.audit_logs.delete_many({"actor": {"$regex": f"^{PREFIX}"}})
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        fn(f"{PREFIX}{i % USERS}")
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {REQUESTS / elapsed:10,.0f} req/s  {elapsed / REQUESTS * 1000:6.3f} ms/req")
+
+
+def run(app, cached):
+    cache = app.user_cache
+    if not cached:
+        app.user_cache = None
+    try:
+        suffix = "cached" if cached else "uncached"
+        measure(f"login ({suffix})", lambda u: authenticate_user(u, PASSWORD, None))
+        measure(f"profile ({suffix})", lambda u: get_user_profile(u))
+    finally:
+        app.user_cache = cache
+
+
+def main():
+    load_dotenv()
+    if not os.getenv("MONGO_URI"):
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    app = create_app()
+    if not hasattr(app, "db"):
+        print("❌ Error: could not connect to MongoDB")
+        return
+    app.logger.setLevel(logging.WARNING)
+
+    seed(app.db)
+    try:
+        with app.test_request_context():
+            print(f"\n--- Auth Lookups ({USERS} users, {REQUESTS:,} requests each) ---")
+            run(app, cached=False)
+            run(app, cached=True)
+            print(f"✅ Cache stats: {app.user_cache.stats()}")
+    finally:
+        cleanup(app.db)
+
+
+if __name__ == "__main__":
+    main()
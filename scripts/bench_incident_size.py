@@ -0,0 +1,85 @@
+import os
+import sys
+import random
+from datetime import datetime
+import bson
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.constants.incident_constants import PLAYBOOK
+from app.services.incident_codec import compact_legacy_incident, expand_incident
+
+SAMPLES = 2000
+
+NARRATIVES = [
+    "Received a message saying my bank account is locked, asked me to verify OTP urgently",
+    "Someone posing as my unit officer asked for my login password on WhatsApp",
+    "Got a link offering a discount, the page asked to update account details",
+]
+
+OCR_LINES = [
+    "Dear customer your account will be blocked today",
+    "Click the link below to update your KYC immediately",
+    "Share the OTP sent to your registered mobile number",
+    "This is an automated message from the security team",
+]
+
+
+def legacy_incident(i):
+    threat_type = random.choice(list(PLAYBOOK.keys()))
+    ocr = "\n".join(random.choice(OCR_LINES) for _ in range(random.randint(0, 40)))
+    return {
+        "_id": bson.ObjectId(),
+        "platform": "WhatsApp",
+        "incident_date": "2026-02-22",
+        "narrative": random.choice(NARRATIVES),
+        "ioc_indicators": "http://example-phish.tk/login",
+        "reported_by": f"user{i}",
+        "created_at": datetime.utcnow(),
+        "risk_score": 80,
+        "risk_level": "HIGH",
+        "risk_reasons": [
+            "high risk keyword: bank", "high risk keyword: otp", "high risk keyword: verify",
+            "medium risk keyword: urgent", "URL detected", "evidence provided",
+            "strong negative / fear tone detected"
+        ],
+        "threat_type_suggested": threat_type,
+        "immediate_actions": PLAYBOOK[threat_type]["immediate"],
+        "preventive_advice": PLAYBOOK[threat_type]["preventive"],
+        "ocr_extracted_text": ocr or None,
+        "analyst_reviewed": False,
+    }
+
+
+def apply_update(doc, update):
+    doc = dict(doc)
+    doc.update(update.get("$set", {}))
+    for field in update.get("$unset", {}):
+        doc.pop(field, None)
+    return doc
+
+
+def bench_incident_size():
+    random.seed(42)
+    legacy = [legacy_incident(i) for i in range(SAMPLES)]
+    compact = [apply_update(d, compact_legacy_incident(d) or {}) for d in legacy]
+
+    legacy_avg = sum(len(bson.encode(d)) for d in legacy) / SAMPLES
+    compact_avg = sum(len(bson.encode(d)) for d in compact) / SAMPLES
+
+    # Round trip must restore the original read shape
+    for original, stored in zip(legacy, compact):
+        restored = expand_incident(dict(stored))
+        assert restored["risk_reasons"] == original["risk_reasons"]
+        assert restored["immediate_actions"] == original["immediate_actions"]
+        assert restored.get("ocr_extracted_text") == original["ocr_extracted_text"]
+
+    print("--- Incident Document Size ---")
+    print(f"Legacy average:  {round(legacy_avg)} bytes")
+    print(f"Compact average: {round(compact_avg)} bytes")
+    print(f"Reduction:       {round((1 - compact_avg / legacy_avg) * 100, 1)}%")
+
+
+if __name__ == "__main__":
+    bench_incident_size()
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from bson.json_util import dumps
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.json_encoder import to_json, _iter_json_array, orjson
+
+DOCUMENTS = 100_000
+
+
+def make_document(i):
+    return {
+        "_id": ObjectId(),
+        "platform": "WhatsApp",
+        "incident_date": "2026-02-22",
+        "narrative": "Received a message saying my bank account is locked, asked me to verify OTP",
+        "ioc_indicators": "http://example-phish.tk/login",
+        "reported_by": f"user{i}",
+        "created_at": datetime.utcnow(),
+        "risk_score": 80,
+        "amount": Decimal128(Decimal("1999.99")),
+        "risk_level": "HIGH",
+        "risk_reasons": ["high risk keyword: bank", "URL detected", "evidence provided"],
+        "status": "open",
+        "analyst_reviewed": False,
+    }
+
+
+# Built once so timings measure serialization, not document construction
+SOURCE = [make_document(i) for i in range(DOCUMENTS)]
+
+
+def cursor():
+    """Simulates a Mongo cursor: documents are handed out one at a time."""
+    return iter(SOURCE)
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+
+    # Separate pass: peak memory allocated on top of the source documents
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<28} {elapsed:7.2f}s  {DOCUMENTS / elapsed:10,.0f} docs/s  "
+          f"peak {peak / 1024 / 1024:7.1f} MB  body {size / 1024 / 1024:6.1f} MB")
+
+
+def bench_json_util():
+    return len(dumps(cursor()))
+
+
+def bench_fast_full():
+    return len(to_json(list(cursor())))
+
+
+def bench_fast_stream():
+    return sum(len(chunk) for chunk in _iter_json_array(cursor(), None))
+
+
+if __name__ == "__main__":
+    print(f"--- JSON Serialization ({DOCUMENTS:,} documents, orjson={'yes' if orjson else 'no'}) ---")
+    measure("bson.json_util.dumps", bench_json_util)
+    measure("to_json (materialized)", bench_fast_full)
+    measure("stream_documents (chunked)", bench_fast_stream)
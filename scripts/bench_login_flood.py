@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import logging
+import threading
+from dotenv import load_dotenv
+from werkzeug.security import generate_password_hash
+from flask_jwt_extended import create_access_token
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+
+FLOOD_THREADS = 32
+DURATION_SECONDS = 10
+PROBE_INTERVAL_SECONDS = 0.05
+USERNAME = "bench_flood_user"
+PASSWORD = "bench-password"
+
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def flood(app, stop, counts, lock):
+    client = app.test_client()
+    attempts = [
+        {"serviceId": USERNAME, "password": PASSWORD},
+        {"serviceId": USERNAME, "password": "wrong-password"},
+        {"serviceId": "bench_no_such_user", "password": "guess"},
+    ]
+    i = 0
+    while not stop.is_set():
+        status = client.post("/api/auth/login", json=attempts[i % len(attempts)]).status_code
+        i += 1
+        with lock:
+            counts[status] = counts.get(status, 0) + 1
+
+
+def probe(app, stop, latencies, token):
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get("/api/auth/me", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(PROBE_INTERVAL_SECONDS)
+
+
+def run(app, label, token):
+    stop = threading.Event()
+    counts, latencies = {}, []
+    lock = threading.Lock()
+
+    threads = [threading.Thread(target=flood, args=(app, stop, counts, lock)) for _ in range(FLOOD_THREADS)]
+    threads.append(threading.Thread(target=probe, args=(app, stop, latencies, token)))
+    for t in threads:
+        t.start()
+    time.sleep(DURATION_SECONDS)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    answered = counts.get(200, 0) + counts.get(401, 0)
+    print(f"{label:<18} {answered / DURATION_SECONDS:8.1f} logins/s  "
+          f"503s {counts.get(503, 0):6d}  "
+          f"/me p50 {percentile(latencies, 0.5):7.1f} ms  p95 {percentile(latencies, 0.95):7.1f} ms  "
+          f"p99 {percentile(latencies, 0.99):7.1f} ms")
+
+
+def main():
+    load_dotenv()
+    if not os.getenv("MONGO_URI"):
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    app = create_app()
+    if not hasattr(app, "db"):
+        print("❌ Error: could not connect to MongoDB")
+        return
+    app.logger.setLevel(logging.WARNING)
+
+    db = app.db
+    db.users.delete_many({"username": USERNAME})
+    db.users.insert_one({"username": USERNAME, "password": generate_password_hash(PASSWORD), "role": "user"})
+    with app.app_context():
+        token = create_access_token(identity=USERNAME, additional_claims={"role": "user"})
+
+    try:
+        print(f"\n--- Login Flood ({FLOOD_THREADS} threads, {DURATION_SECONDS}s each) ---")
+        hasher = app.password_hasher
+        app.password_hasher = None
+        run(app, "inline hashing", token)
+        app.password_hasher = hasher
+        run(app, "bounded pool", token)
+        print(f"✅ Pool stats: {hasher.stats()}")
+    finally:
+        db.users.delete_many({"username": USERNAME})
+        db.audit_logs.delete_many({"actor": {"$in": [USERNAME, "bench_no_such_user"]}})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import io
+import time
+from difflib import SequenceMatcher
+from flask import Flask
+from PIL import Image, ImageDraw, ImageFont
+import pytesseract
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import ocr_service
+from app.services.ocr_backends import get_tesseract_cmd
+from app.services.ocr_service import extract_text_from_images
+
+MESSAGES = 400
+LINE_HEIGHT = 44
+ROUNDS = 3
+
+
+class Upload:
+    """Stand-in for a werkzeug FileStorage."""
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.data = data
+
+    @property
+    def stream(self):
+        return io.BytesIO(self.data)
+
+
+def chat_screenshot():
+    """A tall WhatsApp-like scroll and the text it contains."""
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 22)
+    except OSError:
+        font = ImageFont.load_default()
+
+    lines = [f"Message {i}: sir your parcel {1000 + i} is held, pay customs at once" for i in range(MESSAGES)]
+    image = Image.new("RGB", (900, MESSAGES * LINE_HEIGHT + 40), "white")
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((20, 20 + i * LINE_HEIGHT), line, fill="black", font=font)
+
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue(), lines
+
+
+def accuracy(text, truth):
+    """Word-level match ratio against the drawn text, and duplicated lines."""
+    words, expected = text.split(), " ".join(truth).split()
+    ratio = SequenceMatcher(None, words, expected, autojunk=False).ratio()
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return ratio, len(lines) - len(set(lines))
+
+
+def run(app, data, truth, tiling, workers):
+    app.config.update(OCR_TILING=tiling, OCR_WORKERS=workers)
+    ocr_service._executor = None
+
+    with app.app_context():
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            text, results = extract_text_from_images([Upload("scroll.png", data)])
+        elapsed = (time.perf_counter() - start) / ROUNDS
+
+    ratio, duplicates = accuracy(text, truth)
+    tiles = results[0].get("tiles", 1)
+    label = f"tiled x{tiles}, {workers} worker(s)" if tiling else "single call"
+    print(f"{label:<26} {elapsed:7.2f} s/image   word match {ratio:.3f}   duplicated lines {duplicates}")
+    return elapsed
+
+
+def main():
+    pytesseract.pytesseract.tesseract_cmd = get_tesseract_cmd()
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        print(f"❌ Error: Tesseract not available: {e}")
+        return
+
+    data, truth = chat_screenshot()
+    print(f"\n--- Tile-Parallel OCR (1 image, {MESSAGES} lines, {os.cpu_count()} CPU(s)) ---")
+
+    app = Flask(__name__)
+    baseline = run(app, data, truth, tiling=False, workers=1)
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        tiled = run(app, data, truth, tiling=True, workers=workers)
+        print(f"{'':<26} speedup x{baseline / tiled:.2f}")
+
+    print("✅ Done")
+
+
+if __name__ == "__main__":
+    main()
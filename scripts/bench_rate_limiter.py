@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+from flask import Flask
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.rate_limiter import MemoryBucketStore, RateLimiter
+from app.helpers.rate_limit_helpers import rate_limit
+from app.constants.rate_limit_constants import RateLimits
+
+ITERATIONS = 200_000
+CLIENTS = 10_000
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / ITERATIONS * 1e6:7.2f} µs/check")
+
+
+def main():
+    print(f"\n--- Rate Limiter Overhead ({ITERATIONS:,} checks, {CLIENTS:,} clients) ---")
+
+    store = MemoryBucketStore()
+    measure("bucket take (1 key)", lambda i: store.take("ip:1", 1, 1e9, 1e9))
+    measure("bucket take (many keys)", lambda i: store.take(f"ip:{i % CLIENTS}", 1, 1e9, 1e9))
+
+    limiter = RateLimiter(MemoryBucketStore(), {RateLimits.REPORT: (1e9, 1e9)})
+    measure("limiter check (ip + identity)",
+            lambda i: limiter.check(RateLimits.REPORT, [f"ip:{i % CLIENTS}", f"id:user{i % CLIENTS}"]))
+
+    app = Flask(__name__)
+    app.rate_limiter = limiter
+
+    def handler():
+        return "ok"
+
+    limited = rate_limit(RateLimits.REPORT, identity=lambda: "user1")(handler)
+    with app.test_request_context("/incident/report", method="POST"):
+        measure("bare handler", lambda i: handler())
+        measure("rate_limit decorated handler", lambda i: limited())
+
+    print("✅ Done")
+
+
+if __name__ == "__main__":
+    main()
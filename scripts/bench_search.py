@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import random
+import logging
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.db_init import init_db_indexes
+from app.services.incident_codec import compress_text, ocr_terms
+from app.services.search_service import search_incidents
+
+BENCH_DB = "cyberguard_bench_search"
+INCIDENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+INSERT_BATCH = 5000
+RUNS = 50
+
+WORDS = ("account bank verify otp password urgent blocked kyc update link offer prize lottery job "
+         "army canteen parcel courier refund loan investment crypto profile photo video call").split()
+PLATFORMS = ["WhatsApp", "Telegram", "SMS", "Email", "Facebook", "Instagram"]
+THREATS = ["Phishing", "Financial Fraud", "Impersonation", "Sextortion", "Suspicious Message"]
+
+QUERIES = [
+    ("otp", {}),
+    ("bank verify", {}),
+    ('"kyc update"', {}),
+    ("lottery prize", {"risk_level": "HIGH"}),
+    ("courier refund", {"status": "open"}),
+    ("9876543210", {}),
+]
+
+
+def make_incident(i, now):
+    text = " ".join(random.choices(WORDS, k=random.randint(8, 30)))
+    ocr = " ".join(random.choices(WORDS, k=random.randint(0, 60)))
+    doc = {
+        "platform": random.choice(PLATFORMS),
+        "narrative": text,
+        "ioc_indicators": f"http://phish{i % 5000}.tk +91{9876500000 + i % 100000}",
+        "threat_type_suggested": random.choice(THREATS),
+        "risk_level": random.choice(["LOW", "MEDIUM", "HIGH"]),
+        "risk_score": random.randint(0, 100),
+        "status": random.choice(["open", "under_review", "resolved", "closed"]),
+        "created_at": now - timedelta(minutes=i),
+    }
+    if ocr:
+        doc["ocr_text_z"] = compress_text(ocr)
+        doc["ocr_terms"] = ocr_terms(ocr)
+    return doc
+
+
+def seed(db):
+    now = datetime.utcnow()
+    existing = db.incidents.estimated_document_count()
+    for start in range(existing, INCIDENTS, INSERT_BATCH):
+        end = min(INCIDENTS, start + INSERT_BATCH)
+        db.incidents.insert_many([make_incident(i, now) for i in range(start, end)], ordered=False)
+        print(f"  seeded {end:,}/{INCIDENTS:,}", end="\r")
+    print()
+
+
+def main():
+    load_dotenv()
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client[BENCH_DB]
+        print(f"\n--- Incident Search ({INCIDENTS:,} incidents in {BENCH_DB}) ---")
+        seed(db)
+        init_db_indexes(db, logging.getLogger("bench"))
+
+        for q, filters in QUERIES:
+            timings = []
+            for _ in range(RUNS):
+                start = time.perf_counter()
+                result = search_incidents(db, q, page=1, limit=20, **filters)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            print(f"{q + ' ' + str(filters or ''):<40} hits {len(result['results']):3d}  "
+                  f"p50 {timings[len(timings) // 2]:7.1f} ms  p95 {timings[int(len(timings) * 0.95)]:7.1f} ms")
+
+        print(f"\n✅ Done (drop the '{BENCH_DB}' database when finished)")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ai_analysis import vader_risk_score, sentiment_cache, sia
+
+ROUNDS = 200
+
+CALM = "Hi, your parcel is out for delivery today. Please keep the receipt for reference. "
+THREAT = "Police case filed against you. You will be arrested and your bank account frozen. Pay the penalty now! "
+
+INPUTS = {
+    "short (~200 chars)": CALM + THREAT,
+    "medium (~1.5k chars)": CALM * 15 + THREAT,
+    "OCR calm (~10k chars)": CALM * 120,
+    "OCR threat early (~10k)": CALM * 5 + THREAT * 2 + CALM * 115,
+    "OCR threat late (~10k)": CALM * 115 + THREAT * 2 + CALM * 5,
+}
+
+
+def measure(fn, text):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(text)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def tone_band(compound):
+    return 15 if compound <= -0.5 else 8 if -0.5 < compound < -0.2 else 0
+
+
+def main():
+    print(f"\n--- VADER Tone Scoring ({ROUNDS} calls per input) ---")
+    print(f"{'input':<26} {'full text':>10} {'chunked':>10} {'cached':>10}  band full/chunked")
+
+    for label, text in INPUTS.items():
+        full = measure(lambda t: sia.polarity_scores(t), text)
+
+        def cold(t):
+            sentiment_cache._entries.clear()
+            return vader_risk_score(t)
+
+        chunked = measure(cold, text)
+        vader_risk_score(text)
+        cached = measure(vader_risk_score, text)
+
+        full_band = tone_band(sia.polarity_scores(text)["compound"])
+        print(f"{label:<26} {full:8.3f}ms {chunked:8.3f}ms {cached:8.4f}ms  {full_band}/{vader_risk_score(text)[0]}")
+
+    print(f"✅ Cache: {sentiment_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import logging
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config
+from app.services.campaign_service import cluster_new_incidents, CAMPAIGN_COLLECTION
+
+
+def cluster_campaigns():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client["cyberguard"]
+        print("\n--- Scam Campaign Clustering ---")
+
+        assigned, campaigns = cluster_new_incidents(
+            db,
+            similarity=Config.CAMPAIGN_SIMILARITY,
+            active_days=Config.CAMPAIGN_ACTIVE_DAYS,
+            batch_size=Config.CAMPAIGN_BATCH_SIZE,
+            vocabulary_sample=Config.CAMPAIGN_VOCABULARY_SAMPLE,
+            logger=logging.getLogger("campaigns")
+        )
+
+        print(f"\n✅ Assigned {assigned} new incident(s); {campaigns} active campaign(s) in '{CAMPAIGN_COLLECTION}'")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    cluster_campaigns()
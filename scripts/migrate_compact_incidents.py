@@ -0,0 +1,83 @@
+import os
+import sys
+from pymongo import MongoClient, UpdateOne
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.incident_codec import compact_legacy_incident
+
+BATCH_SIZE = 500
+
+LEGACY_FILTER = {"$or": [
+    {"immediate_actions": {"$exists": True}},
+    {"ocr_extracted_text": {"$type": "string"}},
+    {"risk_reasons": {"$regex": " "}},
+    {"ocr_text_z": {"$exists": True}, "ocr_terms": {"$exists": False}}
+]}
+
+
+def average_size(db):
+    """Average incident document size in bytes, as reported by the server."""
+    try:
+        return db.command("collStats", "incidents").get("avgObjSize", 0)
+    except Exception:
+        return 0
+
+
+def migrate_compact_incidents():
+    load_dotenv()
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client["cyberguard"]
+        print("\n--- Compact Incident Migration ---")
+
+        before = average_size(db)
+        print(f"Average incident size before: {before} bytes")
+
+        last_id = None
+        rewritten = 0
+        while True:
+            query = dict(LEGACY_FILTER)
+            if last_id is not None:
+                query = {"$and": [LEGACY_FILTER, {"_id": {"$gt": last_id}}]}
+
+            batch = list(db.incidents.find(query).sort("_id", 1).limit(BATCH_SIZE))
+            if not batch:
+                break
+
+            ops = []
+            for incident in batch:
+                update = compact_legacy_incident(incident)
+                if update:
+                    ops.append(UpdateOne({"_id": incident["_id"]}, update))
+
+            if ops:
+                db.incidents.bulk_write(ops, ordered=False)
+
+            rewritten += len(ops)
+            last_id = batch[-1]["_id"]
+            print(f"  rewrote {rewritten} incident(s)...")
+
+        after = average_size(db)
+        print(f"Average incident size after:  {after} bytes")
+        if before:
+            print(f"\n✅ Reduced average document size by {round((1 - after / before) * 100, 1)}%")
+        else:
+            print(f"\n✅ Rewrote {rewritten} incident(s)")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    migrate_compact_incidents()
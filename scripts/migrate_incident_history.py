@@ -0,0 +1,76 @@
+import os
+import sys
+from pymongo import MongoClient, InsertOne, UpdateOne
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.timeline_service import TIMELINE_COLLECTION, TIMELINE_BUCKET_SIZE
+
+BATCH_SIZE = 500
+
+
+def build_buckets(incident_id, history):
+    """Split an embedded history array into timeline bucket documents."""
+    buckets = []
+    for i in range(0, len(history), TIMELINE_BUCKET_SIZE):
+        events = history[i:i + TIMELINE_BUCKET_SIZE]
+        times = [e.get("time") for e in events if e.get("time")]
+        buckets.append({
+            "incident_id": incident_id,
+            "events": events,
+            "count": len(events),
+            "start": min(times) if times else None,
+            "end": max(times) if times else None
+        })
+    return buckets
+
+
+def migrate_history():
+    load_dotenv()
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client["cyberguard"]
+        print("\n--- Incident History Migration ---")
+
+        migrated = 0
+        while True:
+            batch = list(db.incidents.find(
+                {"history": {"$exists": True}},
+                {"history": 1}
+            ).limit(BATCH_SIZE))
+
+            if not batch:
+                break
+
+            bucket_ops = []
+            unset_ops = []
+            for incident in batch:
+                for bucket in build_buckets(incident["_id"], incident.get("history") or []):
+                    bucket_ops.append(InsertOne(bucket))
+                unset_ops.append(UpdateOne({"_id": incident["_id"]}, {"$unset": {"history": ""}}))
+
+            if bucket_ops:
+                db[TIMELINE_COLLECTION].bulk_write(bucket_ops, ordered=False)
+            db.incidents.bulk_write(unset_ops, ordered=False)
+
+            migrated += len(batch)
+            print(f"  migrated {migrated} incident(s)...")
+
+        print(f"\n✅ History moved to '{TIMELINE_COLLECTION}' for {migrated} incident(s)")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    migrate_history()
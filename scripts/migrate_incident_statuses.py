@@ -0,0 +1,65 @@
+import os
+import sys
+from pymongo import MongoClient, UpdateOne
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.constants.incident_constants import WORKFLOW_TRANSITIONS
+from app.services.workflow_service import workflow_status
+
+BATCH_SIZE = 500
+
+
+def migrate_statuses():
+    load_dotenv()
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    client = MongoClient(mongo_uri)
+    try:
+        db = client["cyberguard"]
+        print("\n--- Incident Status Migration ---")
+
+        # Incidents outside the state machine could never be transitioned again
+        cursor = db.incidents.find(
+            {"status": {"$nin": list(WORKFLOW_TRANSITIONS)}},
+            {"status": 1, "analyst_reviewed": 1},
+            batch_size=BATCH_SIZE
+        )
+
+        migrated = 0
+        mapping = {}
+        ops = []
+        for incident in cursor:
+            old = incident.get("status")
+            new = workflow_status(old, incident.get("analyst_reviewed"))
+            mapping[(old, new)] = mapping.get((old, new), 0) + 1
+            # Filter on the old status so a concurrent transition is not overwritten
+            ops.append(UpdateOne(
+                {"_id": incident["_id"], "status": old},
+                {"$set": {"status": new}, "$inc": {"version": 1}}
+            ))
+            if len(ops) >= BATCH_SIZE:
+                migrated += db.incidents.bulk_write(ops, ordered=False).modified_count
+                ops = []
+                print(f"  migrated {migrated} incident(s)...")
+        if ops:
+            migrated += db.incidents.bulk_write(ops, ordered=False).modified_count
+
+        for (old, new), count in sorted(mapping.items(), key=lambda item: -item[1]):
+            print(f"  {old!r} -> {new}: {count}")
+        print(f"\n✅ {migrated} incident(s) moved onto workflow statuses")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    migrate_statuses()
@@ -60,6 +60,8 @@ def seed_admin():
             "role": role,
             "created_at": datetime.utcnow()
         })
+        # Running servers drop their cached copy of this user
+        db.versions.update_one({"_id": "users"}, {"$inc": {"v": 1}}, upsert=True)
 
         print(f"\n✅ {role.capitalize()} user '{username}' added successfully!")
         
@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import argparse
+import logging
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.shadow_scoring import shadow_score, LIVE_MODEL_PATH, LIVE_VECTORIZER_PATH
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay stored incidents against a candidate model/ruleset")
+    parser.add_argument("--model", default=LIVE_MODEL_PATH, help="candidate classifier (.joblib)")
+    parser.add_argument("--vectorizer", default=LIVE_VECTORIZER_PATH, help="candidate TF-IDF vectorizer (.joblib)")
+    parser.add_argument("--rules", help="JSON file overriding keyword lists/weights of the live ruleset")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=0, help="replay at most this many incidents")
+    parser.add_argument("--no-archive", action="store_true", help="skip incidents moved to incidents_archive")
+    parser.add_argument("--out", default="shadow_report.json")
+    return parser.parse_args()
+
+
+def run_shadow_scoring():
+    args = parse_args()
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("❌ Error: MONGO_URI not found in .env file")
+        return
+
+    ruleset = None
+    if args.rules:
+        with open(args.rules, encoding="utf-8") as f:
+            ruleset = json.load(f)
+
+    # Read-only replay: prefer a secondary so the primary keeps serving traffic
+    client = MongoClient(mongo_uri, readPreference="secondaryPreferred")
+    try:
+        db = client["cyberguard"]
+        print("\n--- Shadow Scoring ---")
+        print(f"Candidate model: {args.model}")
+        print(f"Candidate rules: {args.rules or 'live ruleset'}")
+
+        report = shadow_score(
+            db,
+            candidate={"model_path": args.model, "vectorizer_path": args.vectorizer, "ruleset": ruleset},
+            batch_size=args.batch_size,
+            workers=args.workers,
+            limit=args.limit,
+            include_archive=not args.no_archive,
+            logger=logging.getLogger("shadow")
+        )
+
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        throughput = report["throughput"]
+        print(f"\nScored {report['scored']} incident(s) at {throughput['incidents_per_second']}/s")
+        print(f"Risk level changes: {report['level_changes']} {report['level_transitions']}")
+        print(f"Analyst accuracy (live -> candidate): "
+              f"{report['analyst_accuracy']['live']} -> {report['analyst_accuracy']['candidate']}")
+        print(f"\n✅ Report written to {args.out}")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    run_shadow_scoring()
@@ -0,0 +1,97 @@
+"""
+Reference copy of the report analysis as it ran before AnalysisContext:
+every scorer re-joined, re-lowercased and re-scanned the text on its own and
+the classifier ran the forest twice. Used to prove scores did not change.
+"""
+from app.services import url_checker
+from app.services.ai_analysis import vader_risk_score
+from app.services.incident_codec import encode_reason
+from app.services.threat_classifier import get_threat_classifier
+from app.services.url_checker import extract_urls
+from app.constants.incident_constants import RiskReasons
+
+
+def legacy_risk_score(title, description, evidence):
+    score = 0
+    reasons = []
+    raw_text = title + " " + description + " " + evidence
+    text = raw_text.lower()
+
+    for word in ["password", "bank", "otp", "login", "verify", "account locked"]:
+        if word in text:
+            score += 25
+            reasons.append(encode_reason(RiskReasons.HIGH_KEYWORD, word))
+
+    for word in ["urgent", "click", "link", "security alert", "update"]:
+        if word in text:
+            score += 15
+            reasons.append(encode_reason(RiskReasons.MEDIUM_KEYWORD, word))
+
+    urls = extract_urls(raw_text)
+    if urls:
+        score += 20
+        reasons.append(RiskReasons.URL_DETECTED)
+        for url in urls:
+            if url_checker.is_malicious(url):
+                score += 40
+                reasons.append(encode_reason(RiskReasons.MALICIOUS_URL, url))
+                break
+
+    if evidence:
+        score += 10
+        reasons.append(RiskReasons.EVIDENCE)
+
+    for word in ["newsletter", "promotion", "discount", "offer"]:
+        if word in text:
+            score -= 10
+            reasons.append(encode_reason(RiskReasons.LOW_KEYWORD, word))
+
+    nlp_score, nlp_reasons = vader_risk_score(raw_text)
+    score += nlp_score
+    reasons.extend(nlp_reasons)
+
+    score = max(0, min(score, 100))
+    if score <= 25:
+        level = "LOW"
+    elif score <= 60:
+        level = "MEDIUM"
+    else:
+        level = "HIGH"
+    return score, level, reasons
+
+
+def legacy_predict(text):
+    classifier = get_threat_classifier()
+    X = classifier.vectorizer.transform([text.lower()])
+    prediction = classifier.model.predict(X)[0]
+    probabilities = classifier.model.predict_proba(X)[0]
+    class_index = list(classifier.model.classes_).index(prediction)
+    return prediction, float(probabilities[class_index])
+
+
+def legacy_threat_type(text, malicious_url_found, urgency_score):
+    ml_type, confidence = legacy_predict(text)
+    if confidence > 0.6:
+        return ml_type, confidence
+
+    text_lower = text.lower()
+    if malicious_url_found:
+        return "Malicious Link", 1.0
+    elif any(word in text_lower for word in ["otp", "password", "bank", "verify", "login"]):
+        return "Credential Theft", 0.9
+    elif urgency_score > 10:
+        return "Social Engineering", 0.8
+    return ml_type, confidence
+
+
+def legacy_analyze(narrative, ioc_indicators, ocr_text):
+    """(score, level, reasons, threat_type, confidence) the old report route produced."""
+    combined_text = narrative + " " + ioc_indicators
+    if ocr_text:
+        combined_text += " " + ocr_text
+
+    score, level, reasons = legacy_risk_score(combined_text, narrative, ioc_indicators + " " + ocr_text)
+    malicious_url_found = "http" in (ioc_indicators + " " + ocr_text).lower()
+    urgency_score = 15 if any(word in narrative.lower() for word in ["urgent", "immediately", "now"]) else 0
+    threat_type, confidence = legacy_threat_type(combined_text, malicious_url_found, urgency_score)
+    return score, level, reasons, threat_type, confidence
@@ -0,0 +1,47 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services import ai_analysis
+from app.services.ai_analysis import vader_risk_score, sentence_chunks, sentiment_cache, sia
+from app.constants.incident_constants import RiskReasons
+
+CALM = "Hello, the parcel arrived today and the delivery person was polite. Thanks again. "
+THREAT = "Police case filed against you. You will be arrested, jailed and your bank account frozen. Pay the penalty now or face prison! "
+
+
+def test_short_text_matches_plain_vader():
+    for text in [CALM, THREAT, "Please pay soon, it is a bit worrying"]:
+        compound = sia.polarity_scores(text)["compound"]
+        score, _ = vader_risk_score(text)
+        expected = 15 if compound <= -0.5 else 8 if -0.5 < compound < -0.2 else 0
+        assert score == expected
+
+
+def test_repeated_text_is_served_from_cache():
+    text = THREAT + "case 4411"
+    vader_risk_score(text)
+    hits = sentiment_cache.hits
+    assert vader_risk_score(text) == (15, [RiskReasons.FEAR_TONE])
+    assert sentiment_cache.hits == hits + 1
+
+
+def test_long_text_stops_at_first_fearful_chunk(monkeypatch):
+    text = CALM * 10 + THREAT + CALM * 200
+    chunks = list(sentence_chunks(text))
+    assert len(chunks) > 20 and "".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+    scored = []
+    polarity_scores = sia.polarity_scores
+    monkeypatch.setattr(ai_analysis.sia, "polarity_scores", lambda t: scored.append(t) or polarity_scores(t))
+
+    assert vader_risk_score(text)[0] == 15
+    assert len(scored) < len(chunks) / 4
+
+
+if __name__ == "__main__":
+    test_short_text_matches_plain_vader()
+    test_repeated_text_is_served_from_cache()
+    print("AI analysis tests passed.")
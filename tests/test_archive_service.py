@@ -0,0 +1,81 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from app.constants.incident_constants import IncidentStatus
+from app.services import archive_service
+from app.services.archive_service import ARCHIVE_COLLECTION, archive_batch, archive_closed_incidents, find_user_incidents
+
+OLD = datetime(2025, 1, 1)
+CUTOFF = OLD + timedelta(days=1)
+
+
+def _db():
+    mongomock = pytest.importorskip("mongomock")
+    return mongomock.MongoClient().db
+
+
+def test_closed_incidents_move_to_the_archive():
+    db = _db()
+    db.incidents.insert_many([
+        {"reported_by": "u1", "status": IncidentStatus.CLOSED, "updated_at": OLD, "version": 3},
+        {"reported_by": "u1", "status": IncidentStatus.OPEN, "updated_at": OLD, "version": 1}
+    ])
+    assert archive_batch(db, CUTOFF) == (1, 1)
+    assert db.incidents.count_documents({}) == 1
+    assert len(find_user_incidents(db, "u1")) == 2
+
+
+def test_incident_edited_while_being_copied_stays_live_once(monkeypatch):
+    db = _db()
+    incident_id = db.incidents.insert_one(
+        {"reported_by": "u1", "status": IncidentStatus.RESOLVED, "updated_at": OLD, "version": 2}
+    ).inserted_id
+
+    # Reopen (version bump) between the archive copy and the delete
+    real_archive_document = archive_service._archive_document
+
+    def copy_then_reopen(incident, now):
+        db.incidents.update_one({"_id": incident_id}, {"$set": {"status": IncidentStatus.RESOLVED}, "$inc": {"version": 1}})
+        return real_archive_document(incident, now)
+
+    monkeypatch.setattr(archive_service, "_archive_document", copy_then_reopen)
+    assert archive_batch(db, CUTOFF) == (1, 0)
+    assert db.incidents.find_one({"_id": incident_id})["version"] == 3
+    assert db[ARCHIVE_COLLECTION].count_documents({}) == 0
+    assert len(find_user_incidents(db, "u1")) == 1
+
+
+def test_incidents_that_stay_live_do_not_end_the_run(monkeypatch):
+    db = _db()
+    ids = db.incidents.insert_many([
+        {"reported_by": "u1", "status": IncidentStatus.CLOSED, "updated_at": OLD, "version": 1}
+        for _ in range(3)
+    ]).inserted_ids
+
+    # The first incident is edited mid-batch, so the first full batch moves only one
+    real_archive_document = archive_service._archive_document
+    edited = []
+
+    def copy_then_edit(incident, now):
+        if not edited:
+            edited.append(incident["_id"])
+            db.incidents.update_one({"_id": incident["_id"]}, {"$inc": {"version": 1}})
+        return real_archive_document(incident, now)
+
+    monkeypatch.setattr(archive_service, "_archive_document", copy_then_edit)
+    assert archive_closed_incidents(db, batch_size=2, pause_seconds=0) == 3
+    assert db.incidents.count_documents({"_id": {"$in": ids}}) == 0
+
+
+if __name__ == "__main__":
+    test_closed_incidents_move_to_the_archive()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_incident_edited_while_being_copied_stays_live_once(monkeypatch)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_incidents_that_stay_live_do_not_end_the_run(monkeypatch)
+    print("Archive service tests passed.")
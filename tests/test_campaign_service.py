@@ -0,0 +1,122 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from bson import ObjectId
+from app.services.campaign_service import (
+    CAMPAIGN_COLLECTION, CampaignClusterer, cluster_new_incidents, fit_campaign_vectorizer, is_shared_infrastructure
+)
+
+KYC_SCAM = "sbi kyc expired account blocked click link update pan card within 24 hours"
+LOTTERY_SCAM = "kbc lottery winner 25 lakh prize pay processing fee claim amount"
+JOB_SCAM = "part time youtube like task job daily earning telegram group deposit"
+# Filler every report shares; must not decide the clustering on its own
+GENERIC = "received message phone please help suspicious fraud"
+
+
+def _incident(text, *ioc_keys):
+    return {"_id": ObjectId(), "narrative": f"{GENERIC} {text}", "ioc_keys": list(ioc_keys),
+            "created_at": datetime.utcnow(), "risk_level": "HIGH"}
+
+
+def _cluster(incidents):
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().db
+    db.incidents.insert_many(incidents)
+    assigned, _ = cluster_new_incidents(db, similarity=0.6)
+    assert assigned == len(incidents)
+    return {doc["_id"]: doc["campaign_id"] for doc in db.incidents.find()}, db
+
+
+def test_same_scam_clusters_and_generic_wording_does_not():
+    incidents = [_incident(text) for text in (KYC_SCAM, LOTTERY_SCAM, JOB_SCAM, KYC_SCAM + " today", LOTTERY_SCAM)]
+    campaign_of, db = _cluster(incidents)
+
+    kyc, lottery, job, kyc_again, lottery_again = (campaign_of[i["_id"]] for i in incidents)
+    assert kyc == kyc_again and lottery == lottery_again
+    assert len({kyc, lottery, job}) == 3
+
+    campaign = db[CAMPAIGN_COLLECTION].find_one({"_id": kyc})
+    assert campaign["size"] == 2
+    assert all(set(entry) == {"key", "count"} for entry in campaign["ioc_counts"])
+    assert not set(GENERIC.split()) & set(campaign["top_terms"])
+
+
+def test_shared_infrastructure_domains_do_not_join_campaigns():
+    incidents = [
+        _incident(KYC_SCAM, "domain:bit.ly", "url:https://bit.ly/sbi-kyc"),
+        _incident(LOTTERY_SCAM, "domain:bit.ly", "domain:chat.whatsapp.com"),
+        _incident(JOB_SCAM, "phone:919876543210"),
+        _incident("completely different story about a refund", "phone:919876543210")
+    ]
+    campaign_of, _ = _cluster(incidents)
+    kyc, lottery, job, refund = (campaign_of[i["_id"]] for i in incidents)
+    assert kyc != lottery
+    assert job == refund  # a real indicator still joins outright
+
+
+def test_ioc_counts_survive_a_reload():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().db
+    db.incidents.insert_one(_incident(KYC_SCAM, "domain:sbi-kyc.tk", "url:https://sbi-kyc.tk/$pay"))
+    cluster_new_incidents(db, similarity=0.6)
+
+    clusterer = CampaignClusterer(db, fit_campaign_vectorizer(db), similarity=0.6)
+    assert clusterer.load() == 1
+    campaign = next(iter(clusterer.campaigns.values()))
+    assert campaign.iocs == {"domain:sbi-kyc.tk": 1, "url:https://sbi-kyc.tk/$pay": 1}
+
+
+def test_shared_infrastructure_matches_subdomains_only():
+    assert is_shared_infrastructure("domain:wa.me")
+    assert is_shared_infrastructure("domain:chat.whatsapp.com")
+    assert not is_shared_infrastructure("domain:sbi-kyc.tk")
+    assert not is_shared_infrastructure("domain:notbit.ly")
+    assert not is_shared_infrastructure("url:https://bit.ly/abc")
+
+
+def test_idle_campaigns_are_dropped_relative_to_the_chunk():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().db
+    old = _incident(KYC_SCAM, "phone:919876543210")
+    old["created_at"] = datetime.utcnow() - timedelta(days=200)
+    recent = _incident(KYC_SCAM, "phone:919876543210")
+    db.incidents.insert_many([old, recent])
+
+    assigned, active = cluster_new_incidents(db, similarity=0.6, active_days=90, batch_size=1)
+    assert assigned == 2 and active == 1
+    campaign_of = {doc["_id"]: doc["campaign_id"] for doc in db.incidents.find()}
+    assert campaign_of[old["_id"]] != campaign_of[recent["_id"]]
+
+
+def test_centroid_rows_track_their_campaigns():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().db
+    texts = [KYC_SCAM, LOTTERY_SCAM, JOB_SCAM, KYC_SCAM + " aadhaar", LOTTERY_SCAM + " whatsapp"]
+    db.incidents.insert_many([_incident(text) for text in texts])
+
+    clusterer = CampaignClusterer(db, fit_campaign_vectorizer(db), similarity=0.6)
+    for incident in db.incidents.find():
+        clusterer.assign_chunk([incident])
+    clusterer._refresh_centroids()
+
+    matrix = clusterer._centroids.matrix().toarray()
+    for row, campaign_id in enumerate(clusterer._centroids.ids):
+        campaign = clusterer.campaigns[campaign_id]
+        for term, weight in campaign.centroid.items():
+            assert matrix[row, term] == pytest.approx(weight / campaign.centroid_norm())
+    assert len(matrix) == len(clusterer.campaigns)
+
+
+if __name__ == "__main__":
+    test_same_scam_clusters_and_generic_wording_does_not()
+    test_shared_infrastructure_domains_do_not_join_campaigns()
+    test_ioc_counts_survive_a_reload()
+    test_shared_infrastructure_matches_subdomains_only()
+    test_idle_campaigns_are_dropped_relative_to_the_chunk()
+    test_centroid_rows_track_their_campaigns()
+    print("Campaign service tests passed.")
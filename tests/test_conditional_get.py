@@ -0,0 +1,78 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required
+from werkzeug.test import Client
+from app.helpers.conditional_helpers import conditional_get
+from app.services.version_service import VersionRegistry, VersionScopes, bump_versions
+
+
+def _db():
+    mongomock = pytest.importorskip("mongomock")
+    return mongomock.MongoClient().db
+
+
+def test_workers_never_share_a_version_number():
+    db = _db()
+    worker_a, worker_b = VersionRegistry(db), VersionRegistry(db)
+
+    worker_a.bump(VersionScopes.INCIDENTS)
+    worker_b.bump(VersionScopes.INCIDENTS)
+    assert worker_a.current(VersionScopes.INCIDENTS) == (1,)
+    assert worker_b.current(VersionScopes.INCIDENTS) == (2,)
+
+    worker_a.sync()
+    assert worker_a.current(VersionScopes.INCIDENTS) == (2,)
+
+
+def _app(calls):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-that-is-long-enough-123"
+    JWTManager(app)
+    app.versions = VersionRegistry(_db())
+
+    @app.route("/stats")
+    @jwt_required()
+    @conditional_get(VersionScopes.INCIDENTS)
+    def stats():
+        calls.append(1)
+        return jsonify({"calls": len(calls)})
+
+    @app.route("/write", methods=["POST"])
+    def write():
+        bump_versions(VersionScopes.INCIDENTS)
+        return "", 204
+
+    return app
+
+
+def test_unchanged_version_answers_304_without_running_the_handler():
+    calls = []
+    app = _app(calls)
+    with app.app_context():
+        headers = {"Authorization": "Bearer " + create_access_token("analyst1", additional_claims={"role": "analyst"})}
+    client = Client(app)
+
+    first = client.get("/stats", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith("W/")
+
+    again = client.get("/stats", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["ETag"] == etag
+    assert len(calls) == 1
+
+    client.post("/write")
+    changed = client.get("/stats", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    test_workers_never_share_a_version_number()
+    test_unchanged_version_answers_304_without_running_the_handler()
+    print("Conditional GET tests passed.")
@@ -0,0 +1,89 @@
+import sys
+import os
+import io
+from datetime import datetime, timedelta
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from app.services.dedup_service import (
+    SIGNATURE_COLLECTION, DuplicateIndex, attachments_digest, band_key, report_signature, similarity
+)
+
+SCAM = "Dear customer your SBI account will be blocked today. Click http://sbi-kyc.tk to update your KYC immediately and share OTP"
+SCAM_COPY = "Dear customer, your SBI account will be blocked today! Click http://sbi-kyc.tk to update your KYC immediately and share the OTP"
+OTHER = "Someone posing as my unit officer asked for my login password on WhatsApp and threatened me with action"
+
+
+def test_reworded_copy_is_a_near_duplicate():
+    a, a_bands = report_signature(SCAM)
+    b, b_bands = report_signature(SCAM_COPY)
+    assert similarity(a, b) >= 0.85
+    assert set(a_bands) & set(b_bands)
+
+
+def test_unrelated_reports_do_not_match():
+    a, _ = report_signature(SCAM)
+    b, _ = report_signature(OTHER)
+    assert similarity(a, b) < 0.2
+
+
+def test_short_generic_text_is_not_fingerprinted():
+    assert report_signature("see attached screenshot") is None
+
+
+class Upload:
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.stream = io.BytesIO(data)
+
+
+def test_different_attachments_never_share_a_band():
+    screenshot = [Upload("a.png", b"first screenshot")]
+    digest = attachments_digest(screenshot)
+    assert screenshot[0].stream.read() == b"first screenshot"  # rewound for OCR
+
+    _, plain = report_signature(SCAM)
+    _, with_image = report_signature(SCAM, digest)
+    _, other_image = report_signature(SCAM, attachments_digest([Upload("a.png", b"another screenshot")]))
+    _, same_image = report_signature(SCAM_COPY, attachments_digest([Upload("b.png", b"first screenshot")]))
+
+    assert not set(plain) & set(with_image)
+    assert not set(with_image) & set(other_image)
+    assert set(with_image) & set(same_image)
+    assert attachments_digest([]) is None
+
+
+def test_band_keys_are_8_byte_ints():
+    _, bands = report_signature(SCAM)
+    assert all(isinstance(band, int) and -2 ** 63 <= band < 2 ** 63 for band in bands)
+
+
+def test_index_holds_only_recent_canonicals():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().db
+    signature, bands = report_signature(SCAM)
+    now = datetime.utcnow()
+    db[SIGNATURE_COLLECTION].insert_many([
+        {"_id": "old", "signature": [int(v) for v in signature], "bands": bands, "created_at": now - timedelta(days=40)},
+        # Written before band keys were ints
+        {"_id": "legacy", "signature": [int(v) for v in signature], "created_at": now - timedelta(days=1),
+         "bands": [f"legacy-{n}" for n in range(16)]},
+        {"_id": "new", "signature": [int(v) for v in signature], "bands": bands, "created_at": now}
+    ])
+
+    index = DuplicateIndex(db, max_entries=10, max_age_days=30)
+    index.sync()  # first sync (startup load failed) is bounded like a load
+    assert index.size() == 2
+    assert index.find(signature, bands, 0.85)[0] == "new"
+    assert index.find(signature, [band_key("legacy-3")], 0.85)[0] == "legacy"
+
+
+if __name__ == "__main__":
+    test_reworded_copy_is_a_near_duplicate()
+    test_unrelated_reports_do_not_match()
+    test_short_generic_text_is_not_fingerprinted()
+    test_different_attachments_never_share_a_band()
+    test_band_keys_are_8_byte_ints()
+    test_index_holds_only_recent_canonicals()
@@ -0,0 +1,44 @@
+import sys
+import os
+import logging
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.event_stream import EventTypes, HubFull, IncidentEventHub, build_event
+
+
+def _hub(**kwargs):
+    return IncidentEventHub(db=None, logger=logging.getLogger(__name__), **kwargs)
+
+
+def test_reconnect_gets_missed_events_or_a_reset():
+    hub = _hub(buffer_size=3)
+    for i in range(5):
+        hub.publish(build_event(EventTypes.INCIDENT_CREATED, {"_id": i}))
+    ids = [event_id for event_id, _ in hub._buffer]
+
+    _, backlog = hub.subscribe(ids[0])
+    assert [event["id"] for _, event in backlog] == ["3", "4"]
+    _, backlog = hub.subscribe("gone-1")
+    assert backlog[0][1]["type"] == EventTypes.RESET
+
+
+def test_streams_are_capped_per_worker():
+    hub = _hub(max_subscribers=2)
+    first, _ = hub.subscribe()
+    hub.subscribe()
+    try:
+        hub.subscribe()
+        assert False, "expected HubFull"
+    except HubFull:
+        pass
+    hub.unsubscribe(first)
+    hub.subscribe()
+    assert hub.subscriber_count() == 2
+
+
+if __name__ == "__main__":
+    test_reconnect_gets_missed_events_or_a_reset()
+    test_streams_are_capped_per_worker()
+    print("Event stream tests passed.")
@@ -0,0 +1,77 @@
+import sys
+import os
+import copy
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.constants.incident_constants import PLAYBOOK, RiskReasons
+from app.services.incident_codec import (
+    compact_legacy_incident, compress_text, decompress_text, encode_reason, expand_incident,
+    ocr_terms, playbook_ref
+)
+
+OCR_TEXT = "Dear customer, your KYC expires TODAY.\nShare OTP 482913 now. ₹ refund pending"
+
+
+def _legacy_incident(threat_type="Credential Theft"):
+    guidance = PLAYBOOK[threat_type]
+    return {
+        "threat_type_suggested": threat_type,
+        "risk_reasons": ["high risk keyword: otp", "URL detected", "malicious URL identified: http://x.tk/a:b", "custom note"],
+        "immediate_actions": list(guidance["immediate"]),
+        "preventive_advice": list(guidance["preventive"]),
+        "ocr_extracted_text": OCR_TEXT,
+        "analyst_reviewed": False
+    }
+
+
+def _apply(incident, update):
+    stored = copy.deepcopy(incident)
+    stored.update(update.get("$set", {}))
+    for field in update.get("$unset", {}):
+        stored.pop(field, None)
+    return stored
+
+
+def test_compact_text_round_trips():
+    assert decompress_text(compress_text(OCR_TEXT)) == OCR_TEXT
+    assert compress_text("") is None and decompress_text(None) is None
+    assert ocr_terms("OTP otp Share share now") == "otp share now"
+
+
+def test_legacy_incident_compacts_and_expands_to_the_same_read_shape():
+    legacy = _legacy_incident()
+    stored = _apply(legacy, compact_legacy_incident(legacy))
+
+    assert stored["risk_reasons"][:3] == [
+        encode_reason(RiskReasons.HIGH_KEYWORD, "otp"),
+        RiskReasons.URL_DETECTED,
+        encode_reason(RiskReasons.MALICIOUS_URL, "http://x.tk/a:b")
+    ]
+    assert stored["playbook"] == playbook_ref("Credential Theft")
+    assert "immediate_actions" not in stored and "ocr_extracted_text" not in stored
+    assert "kyc" in stored["ocr_terms"].split()
+
+    # Nothing left to do on a second pass
+    assert compact_legacy_incident(stored) is None
+
+    expanded = expand_incident(copy.deepcopy(stored))
+    for field in ("risk_reasons", "immediate_actions", "preventive_advice", "ocr_extracted_text"):
+        assert expanded[field] == legacy[field]
+    assert "ocr_terms" not in expanded and "playbook" not in expanded
+
+
+def test_edited_guidance_is_kept():
+    legacy = _legacy_incident()
+    legacy["immediate_actions"] = legacy["immediate_actions"] + ["Call the branch"]
+    update = compact_legacy_incident(legacy)
+    assert "immediate_actions" not in update.get("$unset", {})
+    assert "playbook" not in update.get("$set", {})
+
+
+if __name__ == "__main__":
+    test_compact_text_round_trips()
+    test_legacy_incident_compacts_and_expands_to_the_same_read_shape()
+    test_edited_guidance_is_kept()
+    print("Incident codec tests passed.")
@@ -0,0 +1,54 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.ioc_extractor import extract_iocs
+
+
+def keys(*texts):
+    return [ioc["key"] for ioc in extract_iocs(*texts)]
+
+
+def test_phone_formats_share_one_key():
+    assert keys("call +91 98765 43210", "or 09876543210", "or 9876543210") == ["phone:919876543210"]
+
+
+def test_url_also_indexes_its_domain():
+    assert keys("visit http://Evil-Bank.tk/login/.") == ["url:http://evil-bank.tk/login", "domain:evil-bank.tk"]
+
+
+def test_upi_email_ip_and_hash():
+    found = keys("pay scam@okaxis, mail a.b@gmail.com from 10.0.0.1 file d41d8cd98f00b204e9800998ecf8427e")
+    assert found == [
+        "upi:scam@okaxis",
+        "email:a.b@gmail.com",
+        "ip:10.0.0.1",
+        "hash:d41d8cd98f00b204e9800998ecf8427e",
+    ]
+
+
+def test_dates_amounts_and_abbreviations_are_not_indicators():
+    assert keys("On 22-02-2026 at 10.30 e.g. mr.john paid 5000 rs, file.txt") == []
+
+
+def test_urls_with_unusual_or_broken_hosts_do_not_raise():
+    found = keys(
+        "http://localhost/x http://intranet:8080/ http://my_host.example.com/ http://[::1]/a "
+        "http://[abc/x http://192.168.1.5/login"
+    )
+    assert "url:http://localhost/x" in found
+    assert "url:http://intranet" in found
+    assert "domain:my_host.example.com" in found
+    assert "url:http://[::1]/a" in found
+    assert not any(key.startswith("domain:") and key != "domain:my_host.example.com" for key in found)
+    assert "url:http://192.168.1.5/login" in found
+
+
+if __name__ == "__main__":
+    test_phone_formats_share_one_key()
+    test_url_also_indexes_its_domain()
+    test_upi_email_ip_and_hash()
+    test_dates_amounts_and_abbreviations_are_not_indicators()
+    test_urls_with_unusual_or_broken_hosts_do_not_raise()
@@ -0,0 +1,64 @@
+import sys
+import os
+import json
+from datetime import datetime
+from decimal import Decimal
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from flask import Flask
+from app.utils import json_encoder
+from app.utils.json_encoder import NDJSON_MIMETYPE, stream_documents, to_json
+
+OID = ObjectId("65f000000000000000000001")
+
+
+def _docs(n):
+    return [{"_id": OID, "n": i, "at": datetime(2026, 1, 2, 3, 4, 5), "amount": Decimal128(Decimal("10.50"))}
+            for i in range(n)]
+
+
+def _body(response):
+    return b"".join(response.response)
+
+
+def test_mongo_types_render_as_plain_json():
+    assert json.loads(to_json(_docs(1)[0])) == {
+        "_id": str(OID), "n": 0, "at": "2026-01-02T03:04:05Z", "amount": "10.50"
+    }
+
+
+def test_streamed_array_is_valid_json_across_chunks(monkeypatch):
+    monkeypatch.setattr(json_encoder, "STREAM_CHUNK_SIZE", 3)
+    app = Flask(__name__)
+    for n in (0, 1, 3, 7):
+        with app.test_request_context("/"):
+            response = stream_documents(iter(_docs(n)), transform=lambda d: {**d, "x": True})
+        items = json.loads(_body(response))
+        assert [item["n"] for item in items] == list(range(n))
+        assert all(item["x"] for item in items)
+
+
+def test_ndjson_by_query_or_accept_header():
+    app = Flask(__name__)
+    for path, headers in (("/?format=ndjson", {}), ("/", {"Accept": NDJSON_MIMETYPE})):
+        with app.test_request_context(path, headers=headers):
+            response = stream_documents(iter(_docs(2)))
+        assert response.mimetype == NDJSON_MIMETYPE
+        lines = _body(response).decode().splitlines()
+        assert [json.loads(line)["n"] for line in lines] == [0, 1]
+
+    with app.test_request_context("/", headers={"Accept": "application/json"}):
+        assert stream_documents(iter(_docs(1))).mimetype == "application/json"
+
+
+if __name__ == "__main__":
+    import pytest
+    test_mongo_types_render_as_plain_json()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_streamed_array_is_valid_json_across_chunks(monkeypatch)
+    test_ndjson_by_query_or_accept_header()
+    print("JSON encoder tests passed.")
@@ -0,0 +1,117 @@
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services import ocr_backends
+from app.services.ocr_backends import (
+    EnginePoolBackend, OcrDeadline, OcrError, SubprocessBackend, create_ocr_backend
+)
+
+
+class FakeEngine:
+    """Just enough of tesserocr.PyTessBaseAPI."""
+    created = 0
+
+    def __init__(self, lang="eng"):
+        FakeEngine.created += 1
+        self.image = None
+
+    def SetImage(self, image):
+        self.image = image
+
+    def Recognize(self, timeout=0):
+        if self.image == "slow":
+            time.sleep(timeout / 1000 if timeout else 0.01)
+            return False
+        time.sleep(0.01)
+        return self.image != "broken"
+
+    def GetUTF8Text(self):
+        return f"text of {self.image}"
+
+    def Clear(self):
+        self.image = None
+
+
+class FakeTesserocr:
+    PyTessBaseAPI = FakeEngine
+
+
+def test_pool_reuses_at_most_size_engines(monkeypatch):
+    monkeypatch.setattr(ocr_backends, "tesserocr", FakeTesserocr)
+    FakeEngine.created = 0
+    pool = create_ocr_backend("auto", size=2)
+    assert isinstance(pool, EnginePoolBackend)
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(pool.recognize(f"img{i}"))) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == sorted(f"text of img{i}" for i in range(8))
+    assert FakeEngine.created == 2
+    assert pool.stats()["engines"] == 2 and pool.stats()["idle"] == 2
+
+
+def test_engine_timeout_raises_deadline_and_returns_engine(monkeypatch):
+    monkeypatch.setattr(ocr_backends, "tesserocr", FakeTesserocr)
+    pool = EnginePoolBackend(size=1)
+    try:
+        pool.recognize("slow", deadline=time.monotonic() + 0.05)
+        assert False, "expected OcrDeadline"
+    except OcrDeadline:
+        pass
+    assert pool.stats()["idle"] == 1
+    assert pool.recognize("img") == "text of img"
+
+
+def test_failed_recognition_is_not_a_deadline(monkeypatch):
+    monkeypatch.setattr(ocr_backends, "tesserocr", FakeTesserocr)
+    pool = EnginePoolBackend(size=1)
+    for deadline in (None, time.monotonic() + 5):
+        try:
+            pool.recognize("broken", deadline=deadline)
+            assert False, "expected OcrError"
+        except OcrError:
+            pass
+    assert pool.stats()["idle"] == 1
+
+
+def test_thread_limit_is_set_before_tesserocr_loads(monkeypatch):
+    monkeypatch.delenv("OMP_THREAD_LIMIT", raising=False)
+    seen = []
+
+    def load():
+        seen.append(os.environ.get("OMP_THREAD_LIMIT"))
+        return None
+
+    monkeypatch.setattr(ocr_backends, "load_tesserocr", load)
+    create_ocr_backend("auto", size=4)
+    assert seen == ["1"]
+
+
+def test_falls_back_to_subprocess_without_tesserocr(monkeypatch):
+    monkeypatch.setattr(ocr_backends, "tesserocr", None)
+    assert isinstance(create_ocr_backend("auto"), SubprocessBackend)
+    assert isinstance(create_ocr_backend("tesserocr"), SubprocessBackend)
+
+    monkeypatch.setattr(ocr_backends, "tesserocr", FakeTesserocr)
+    assert isinstance(create_ocr_backend("subprocess"), SubprocessBackend)
+
+
+if __name__ == "__main__":
+    import pytest
+    for test in (test_pool_reuses_at_most_size_engines,
+                 test_engine_timeout_raises_deadline_and_returns_engine,
+                 test_failed_recognition_is_not_a_deadline,
+                 test_thread_limit_is_set_before_tesserocr_loads,
+                 test_falls_back_to_subprocess_without_tesserocr):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            test(monkeypatch)
+    print("OCR backend tests passed.")
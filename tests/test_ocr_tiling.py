@@ -0,0 +1,61 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from PIL import Image, ImageDraw
+from app.services.ocr_service import tile_bounds, merge_strip_texts
+
+LINE_HEIGHT = 30
+
+
+def _chat_screenshot(lines=200, width=400):
+    image = Image.new("RGB", (width, lines * LINE_HEIGHT), "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(lines):
+        draw.text((10, i * LINE_HEIGHT + 8), f"message number {i} from scammer", fill="black")
+    return image
+
+
+def test_tall_image_is_cut_into_overlapping_strips_at_blank_rows():
+    image = _chat_screenshot()
+    bounds = tile_bounds(image, tile_height=1000, overlap=100)
+    activity = np.asarray(image.convert("L"), dtype=np.float32).std(axis=1)
+
+    assert len(bounds) >= 6
+    assert bounds[0][0] == 0 and bounds[-1][1] == image.size[1]
+    for (top, bottom), (next_top, _) in zip(bounds, bounds[1:]):
+        assert next_top < bottom  # strips overlap
+        assert activity[bottom - 1] == 0 and activity[next_top] == 0  # no text line sliced
+
+
+def test_short_or_wide_images_are_not_tiled():
+    assert tile_bounds(_chat_screenshot(lines=20), 1000, 100) == [(0, 600)]
+    assert tile_bounds(Image.new("RGB", (3000, 4000), "white"), 1000, 100) == [(0, 4000)]
+
+
+def test_overlapping_lines_are_stitched_once():
+    first = "Hi sir\nYour KYC is pending\nClick the link below\n"
+    second = "Click the Iink below\nhttp://kyc-update.example\nShare the OTP\n"
+    third = "Share the OTP\n\nor your account is blocked"
+
+    merged = merge_strip_texts([first, second, third])
+    assert merged.splitlines() == [
+        "Hi sir", "Your KYC is pending", "Click the link below",
+        "http://kyc-update.example", "Share the OTP", "or your account is blocked"
+    ]
+
+
+def test_lines_differing_in_numbers_are_kept():
+    merged = merge_strip_texts(["Paid Rs 1500 to agent\n", "Paid Rs 1800 to agent\n"])
+    assert merged.splitlines() == ["Paid Rs 1500 to agent", "Paid Rs 1800 to agent"]
+
+
+if __name__ == "__main__":
+    test_tall_image_is_cut_into_overlapping_strips_at_blank_rows()
+    test_short_or_wide_images_are_not_tiled()
+    test_overlapping_lines_are_stitched_once()
+    test_lines_differing_in_numbers_are_kept()
+    print("OCR tiling tests passed.")
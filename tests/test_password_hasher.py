@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask import Flask
+from werkzeug.security import generate_password_hash
+from app.services.auth_service import authenticate_user
+from app.services.password_hasher import HasherBusy, PasswordHasher
+
+
+def _app(max_pending):
+    mongomock = pytest.importorskip("mongomock")
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-that-is-long-enough-123"
+    app.db = mongomock.MongoClient().db
+    app.db.users.insert_one({"username": "analyst1", "password": generate_password_hash("right"), "role": "analyst"})
+    app.password_hasher = PasswordHasher(max_workers=1, max_pending=max_pending)
+    return app
+
+
+def test_unknown_user_is_verified_on_the_pool():
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+    assert hasher.reject_unknown("guess") is False
+    assert hasher.stats()["completed"] == 1
+    assert hasher.stats()["verify_ms"] is not None
+
+
+def test_saturated_pool_refuses_known_and_unknown_users_alike():
+    hasher = PasswordHasher(max_workers=1, max_pending=0)
+    with pytest.raises(HasherBusy):
+        hasher.verify(generate_password_hash("right"), "guess")
+    with pytest.raises(HasherBusy):
+        hasher.reject_unknown("guess")
+    assert hasher.stats()["rejected"] == 2
+
+
+def test_login_responses_do_not_reveal_which_users_exist():
+    app = _app(max_pending=4)
+    with app.test_request_context("/api/auth/login", method="POST"):
+        _, known = authenticate_user("analyst1", "wrong", None)
+        _, unknown = authenticate_user("ghost", "wrong", None)
+    assert known == unknown == 401
+
+    app = _app(max_pending=0)
+    with app.test_request_context("/api/auth/login", method="POST"):
+        _, known = authenticate_user("analyst1", "wrong", None)
+        _, unknown = authenticate_user("ghost", "wrong", None)
+    assert known == unknown == 503
+
+
+if __name__ == "__main__":
+    test_unknown_user_is_verified_on_the_pool()
+    test_saturated_pool_refuses_known_and_unknown_users_alike()
+    test_login_responses_do_not_reveal_which_users_exist()
+    print("Password hasher tests passed.")
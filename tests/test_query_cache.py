@@ -0,0 +1,90 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask import Flask, jsonify, request
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required
+from werkzeug.test import Client
+from app.helpers.cache_helpers import cached_query
+from app.services.query_cache import QueryCache
+from app.services.version_service import VersionRegistry, VersionScopes, bump_versions
+from app.utils.json_encoder import NDJSON_MIMETYPE, stream_documents
+
+
+def _app(calls):
+    mongomock = pytest.importorskip("mongomock")
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-that-is-long-enough-123"
+    JWTManager(app)
+    app.versions = VersionRegistry(mongomock.MongoClient().db)
+    app.query_cache = QueryCache()
+
+    @app.route("/high-risk")
+    @jwt_required()
+    @cached_query(VersionScopes.INCIDENTS)
+    def high_risk():
+        calls.append(1)
+        if request.args.get("fail"):
+            return jsonify({"error": "Database error"}), 500
+        return stream_documents(iter([{"n": 1}, {"n": 2}]))
+
+    @app.route("/write", methods=["POST"])
+    def write():
+        bump_versions(VersionScopes.INCIDENTS)
+        return "", 204
+
+    with app.app_context():
+        token = create_access_token("admin1", additional_claims={"role": "admin"})
+    return app, {"Authorization": "Bearer " + token}
+
+
+def test_json_and_ndjson_are_cached_separately():
+    calls = []
+    app, headers = _app(calls)
+    client = Client(app)
+
+    as_json = client.get("/high-risk", headers=headers)
+    as_ndjson = client.get("/high-risk", headers={**headers, "Accept": NDJSON_MIMETYPE})
+    assert as_json.mimetype == "application/json" and as_json.get_json() == [{"n": 1}, {"n": 2}]
+    assert as_ndjson.mimetype == NDJSON_MIMETYPE and as_ndjson.get_data(as_text=True).count("\n") == 2
+    assert "Accept" in as_json.headers["Vary"]
+    assert len(calls) == 2
+
+    assert client.get("/high-risk", headers=headers).get_json() == [{"n": 1}, {"n": 2}]
+    assert client.get("/high-risk", headers={**headers, "Accept": NDJSON_MIMETYPE}).mimetype == NDJSON_MIMETYPE
+    assert len(calls) == 2
+
+
+def test_version_bump_invalidates():
+    calls = []
+    app, headers = _app(calls)
+    client = Client(app)
+
+    client.get("/high-risk", headers=headers)
+    client.get("/high-risk", headers=headers)
+    assert len(calls) == 1
+
+    client.post("/write")
+    client.get("/high-risk", headers=headers)
+    assert len(calls) == 2
+
+
+def test_errors_are_not_cached():
+    calls = []
+    app, headers = _app(calls)
+    client = Client(app)
+
+    for _ in range(2):
+        assert client.get("/high-risk?fail=1", headers=headers).status_code == 500
+    assert len(calls) == 2
+    assert app.query_cache.stats()["entries"] == 0
+
+
+if __name__ == "__main__":
+    test_json_and_ndjson_are_cached_separately()
+    test_version_bump_invalidates()
+    test_errors_are_not_cached()
+    print("Query cache tests passed.")
@@ -0,0 +1,107 @@
+import sys
+import os
+import io
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask import Flask, jsonify, request
+from werkzeug.test import Client
+from app.helpers.rate_limit_helpers import rate_limit, spend_rate_limit
+from app.services.rate_limiter import MemoryBucketStore, MongoBucketStore, RateLimiter
+
+BUCKETS = {"report": (4, 1 / 60)}
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.services.rate_limiter.time.monotonic", lambda: now[0])
+    limiter = RateLimiter(MemoryBucketStore(), {"login": (2, 1.0)})
+
+    assert limiter.check("login", ["ip:a"]) == (True, 0)
+    assert limiter.check("login", ["ip:a"]) == (True, 0)
+    allowed, retry_after = limiter.check("login", ["ip:a"])
+    assert not allowed and retry_after == pytest.approx(1.0)
+
+    now[0] += 1.0
+    assert limiter.check("login", ["ip:a"]) == (True, 0)
+
+
+def test_full_table_evicts_only_the_least_recently_used():
+    limiter = RateLimiter(MemoryBucketStore(max_keys=3), {"login": (1, 1 / 60)})
+    assert limiter.check("login", ["ip:victim"])[0]
+
+    # A flood of fresh keys must not hand the victim a new bucket while it is active
+    for n in range(10):
+        assert not limiter.check("login", ["ip:victim"])[0]
+        limiter.check("login", [f"ip:attacker{n}"])
+    assert not limiter.check("login", ["ip:victim"])[0]
+
+
+def _refused_identity_keeps_the_ip_bucket(store):
+    limiter = RateLimiter(store, BUCKETS)
+
+    # The identity has used up its bucket from another address
+    assert limiter.check("report", ["ip:other", "id:alice"], 4)[0]
+
+    # Refused by the identity bucket: the shared IP bucket must not pay for it
+    assert not limiter.check("report", ["ip:office", "id:alice"], 3)[0]
+    assert limiter.check("report", ["ip:office", "id:bob"], 4)[0]
+
+
+def test_refused_request_is_not_charged_to_other_buckets():
+    _refused_identity_keeps_the_ip_bucket(MemoryBucketStore())
+
+
+def test_shared_store_refunds_too():
+    mongomock = pytest.importorskip("mongomock")
+    store = MongoBucketStore(mongomock.MongoClient().db)
+    try:
+        store.take("probe", 1, 1, 1.0)
+    except Exception:
+        pytest.skip("mongomock cannot run update pipelines")
+    _refused_identity_keeps_the_ip_bucket(store)
+
+
+def _app():
+    app = Flask(__name__)
+    app.rate_limiter = RateLimiter(MemoryBucketStore(), {"report": (10, 1 / 60)})
+    calls = []
+
+    @app.route("/report", methods=["POST"])
+    @rate_limit("report", identity=None)
+    def report():
+        calls.append(1)
+        files = request.files.getlist("files")
+        refused = spend_rate_limit("report", 4 * len(files), identity=None)
+        if refused:
+            return refused
+        return jsonify({"files": len(files)})
+
+    return app, calls
+
+
+def test_image_surcharge_is_charged_after_the_base_cost():
+    app, calls = _app()
+    client = Client(app)
+
+    def post(images):
+        files = [(io.BytesIO(b"x"), f"f{i}.png") for i in range(images)]
+        return client.post("/report", data={"files": files}, content_type="multipart/form-data")
+
+    assert post(2).status_code == 200    # 1 + 8
+    response = post(2)                   # base cost fits (1 left), surcharge does not
+    assert response.status_code == 429 and int(response.headers["Retry-After"]) > 0
+    assert post(0).status_code == 429    # no tokens left for the base cost
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_bucket_refills_over_time(monkeypatch)
+    test_full_table_evicts_only_the_least_recently_used()
+    test_refused_request_is_not_charged_to_other_buckets()
+    test_shared_store_refunds_too()
+    test_image_surcharge_is_charged_after_the_base_cost()
+    print("Rate limiter tests passed.")
@@ -0,0 +1,176 @@
+import sys
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.safe_browsing import SafeBrowsingClient, CircuitBreaker, LookupOutcomes
+
+
+class FakeSafeBrowsing(BaseHTTPRequestHandler):
+    """Flags URLs containing "evil"; `server.delay` / `server.status` inject faults."""
+
+    def do_POST(self):
+        self.server.hits += 1
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.delay)
+
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.end_headers()
+            return
+
+        entries = body["threatInfo"]["threatEntries"]
+        matches = [{"threat": {"url": e["url"]}} for e in entries if "evil" in e["url"]]
+        payload = json.dumps({"matches": matches} if matches else {}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _fake_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSafeBrowsing)
+    server.hits, server.delay, server.status = 0, 0.0, 200
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _client(server, **overrides):
+    options = dict(timeout=0.3, retries=1, backoff=0.01, failure_threshold=2, reset_seconds=0.2)
+    options.update(overrides)
+    return SafeBrowsingClient("test-key", f"http://127.0.0.1:{server.server_port}/v4/threatMatches:find", **options)
+
+
+def test_all_urls_checked_in_one_request():
+    server = _fake_server()
+    client = _client(server)
+
+    assert client.check(["http://ok.example", "http://evil.example"]) == {"http://evil.example"}
+    assert server.hits == 1
+    server.shutdown()
+
+
+def test_outage_opens_circuit_then_half_open_probe_recovers():
+    server = _fake_server()
+    server.status = 503
+    client = _client(server)
+
+    # Two failed lookups (each retried once) open the circuit
+    assert client.check(["http://a.example"]) is None
+    assert client.check(["http://a.example"]) is None
+    assert client.breaker.state == CircuitBreaker.OPEN
+    hits = server.hits
+
+    started = time.perf_counter()
+    assert client.check(["http://a.example"]) is None
+    assert time.perf_counter() - started < 0.01
+    assert server.hits == hits
+
+    server.status = 200
+    time.sleep(0.25)
+    assert client.check(["http://evil.example"]) == {"http://evil.example"}
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    assert client.stats()["outcomes"][LookupOutcomes.SHORT_CIRCUITED]["count"] == 1
+    server.shutdown()
+
+
+def test_slow_upstream_is_cut_at_the_callers_budget():
+    server = _fake_server()
+    server.delay = 1.0
+    client = _client(server, failure_threshold=5)
+
+    started = time.perf_counter()
+    assert client.check(["http://a.example"], timeout=0.1) is None
+    assert time.perf_counter() - started < 0.5
+    assert LookupOutcomes.TIMEOUT in client.stats()["outcomes"]
+    server.shutdown()
+
+
+def test_only_upstream_failures_trip_the_breaker():
+    server = _fake_server()
+    server.delay = 0.5
+    client = _client(server, failure_threshold=2)
+
+    # The caller's short budget ran out, not the upstream: no failures counted
+    for _ in range(3):
+        assert client.check(["http://a.example"], timeout=0.05) is None
+    assert client.check(["http://a.example"], timeout=0) is None
+    assert client.breaker.failures == 0 and client.breaker.state == CircuitBreaker.CLOSED
+
+    # Timing out at the client's own timeout does count
+    assert client.check(["http://a.example"]) is None
+    assert client.check(["http://a.example"]) is None
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # A half-open probe cut short by its caller does not block the next probe
+    time.sleep(0.25)
+    assert client.check(["http://a.example"], timeout=0.05) is None
+    server.delay = 0.0
+    assert client.check(["http://evil.example"]) == {"http://evil.example"}
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    server.shutdown()
+
+
+def test_first_attempt_leaves_the_retry_its_share():
+    server = _fake_server()
+    server.delay = 1.0
+    client = _client(server, timeout=0.4, backoff=0.0, failure_threshold=5)
+
+    assert client.check(["http://a.example"]) is None
+    assert server.hits == 2
+    server.shutdown()
+
+
+def test_unexpected_error_still_reaches_the_breaker():
+    server = _fake_server()
+    client = _client(server, failure_threshold=1)
+    real_post = client._post
+
+    def broken(urls, timeout):
+        raise RuntimeError("unexpected")
+
+    client._post = broken
+    assert client.check(["http://a.example"]) is None
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # The failed half-open probe reopens the circuit instead of leaving it stuck
+    time.sleep(0.25)
+    assert client.check(["http://a.example"]) is None
+    client._post = real_post
+    time.sleep(0.25)
+    assert client.check(["http://evil.example"]) == {"http://evil.example"}
+    server.shutdown()
+
+
+def test_concurrency_cap_sheds_excess_lookups():
+    server = _fake_server()
+    server.delay = 0.2
+    client = _client(server, max_concurrency=1, timeout=1.0)
+
+    slow = threading.Thread(target=client.check, args=(["http://a.example"],))
+    slow.start()
+    time.sleep(0.05)
+    assert client.check(["http://b.example"]) is None
+    slow.join()
+    assert client.stats()["outcomes"][LookupOutcomes.REJECTED]["count"] == 1
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    test_all_urls_checked_in_one_request()
+    test_outage_opens_circuit_then_half_open_probe_recovers()
+    test_slow_upstream_is_cut_at_the_callers_budget()
+    test_only_upstream_failures_trip_the_breaker()
+    test_first_attempt_leaves_the_retry_its_share()
+    test_unexpected_error_still_reaches_the_breaker()
+    test_concurrency_cap_sheds_excess_lookups()
+    print("Safe Browsing client tests passed.")
@@ -0,0 +1,106 @@
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.incident_codec import compress_text
+from app.services.search_service import (
+    _highlight_pattern, build_search_filter, build_snippet, query_terms, search_incidents
+)
+
+
+class FakeCursor:
+    """Records the cursor chain; $text ranking itself is MongoDB's job."""
+
+    def __init__(self, docs, calls):
+        self.docs = docs
+        self.calls = calls
+
+    def sort(self, spec):
+        self.calls["sort"] = spec
+        return self
+
+    def skip(self, n):
+        self.calls["skip"] = n
+        return self
+
+    def limit(self, n):
+        self.calls["limit"] = n
+        return self
+
+    def __iter__(self):
+        return iter(self.docs[self.calls["skip"]:self.calls["skip"] + self.calls["limit"]])
+
+
+class FakeIncidents:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = {}
+
+    def find(self, query, projection):
+        self.calls.update(query=query, projection=projection)
+        return FakeCursor(self.docs, self.calls)
+
+
+class FakeDb:
+    def __init__(self, docs):
+        self.incidents = FakeIncidents(docs)
+
+
+def test_query_terms_skip_negations_and_keep_phrases():
+    assert query_terms('otp "kyc update" -refund -"gift card" paytm') == ["otp", "kyc update", "paytm"]
+
+
+def test_snippets_highlight_stems_and_escape_html():
+    pattern = _highlight_pattern(["verify"])
+    text = "x" * 100 + " <b>Verified</b> the account, then verifying again " + "y" * 100
+    snippet = build_snippet(text, pattern, radius=40)
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "<mark>Verified</mark>" in snippet and "<mark>verifying</mark>" in snippet
+    assert "&lt;b&gt;" in snippet and "<b>" not in snippet
+    assert build_snippet("nothing here", pattern) is None
+
+
+def test_filters_make_the_end_date_exclusive():
+    query = build_search_filter("otp", risk_level="high", status="open",
+                                date_from=datetime(2026, 1, 1), date_to=datetime(2026, 2, 1))
+    assert query == {
+        "$text": {"$search": "otp"},
+        "risk_level": "HIGH",
+        "status": "open",
+        "created_at": {"$gte": datetime(2026, 1, 1), "$lt": datetime(2026, 2, 1)}
+    }
+
+
+def test_search_pages_without_counting_and_highlights_ocr_text():
+    docs = [
+        {"_id": i, "narrative": f"caller asked for the OTP #{i}", "score": 1.23456,
+         "ocr_text_z": compress_text("Share your OTP now")}
+        for i in range(5)
+    ]
+    db = FakeDb(docs)
+
+    first = search_incidents(db, "otp -refund", page=1, limit=2)
+    assert [hit["_id"] for hit in first["results"]] == [0, 1] and first["has_more"]
+    assert db.incidents.calls["limit"] == 3  # one extra row instead of a count
+    assert db.incidents.calls["sort"] == [("score", {"$meta": "textScore"})]
+
+    hit = first["results"][0]
+    assert hit["score"] == 1.235 and "ocr_text_z" not in hit
+    assert hit["highlights"]["ocr_extracted_text"] == "Share your <mark>OTP</mark> now"
+    assert "<mark>OTP</mark>" in hit["highlights"]["narrative"]
+
+    last = search_incidents(db, "otp", page=3, limit=2)
+    assert [hit["_id"] for hit in last["results"]] == [4] and not last["has_more"]
+
+    assert search_incidents(db, "otp", limit=1000)["limit"] == 50
+
+
+if __name__ == "__main__":
+    test_query_terms_skip_negations_and_keep_phrases()
+    test_snippets_highlight_stems_and_escape_html()
+    test_filters_make_the_end_date_exclusive()
+    test_search_pages_without_counting_and_highlights_ocr_text()
+    print("Search service tests passed.")
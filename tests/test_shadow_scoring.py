@@ -0,0 +1,68 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from datetime import datetime
+from flask import Flask
+from app.services import risk_engine
+from app.services.analysis_context import AnalysisContext
+from app.services.risk_engine import calculate_risk_score, detect_threat_type
+from app.services.archive_service import ARCHIVE_COLLECTION, _archive_document
+from app.services.shadow_scoring import Scorer, ShadowReport, shadow_score
+
+TEXTS = [
+    "Verify your bank login now at http://kyc.example",
+    "Got a newsletter with a discount offer",
+    "Urgent: the officer said share the OTP or face arrest",
+    "Install this update to remove the virus from your phone",
+]
+
+
+def test_live_scorer_matches_report_pipeline(monkeypatch):
+    monkeypatch.setattr(risk_engine, "find_malicious_urls", lambda urls, timeout=None: set())
+    contexts = [AnalysisContext(text) for text in TEXTS]
+    batch = Scorer().score(contexts, [False] * len(contexts))
+
+    app = Flask(__name__)
+    with app.app_context():
+        for context, (score, level, threat_type) in zip(contexts, batch):
+            assert calculate_risk_score(context)[:2] == (score, level)
+            assert detect_threat_type(context)[0] == threat_type
+
+
+def test_candidate_ruleset_changes_are_reported():
+    contexts = [AnalysisContext(text) for text in TEXTS]
+    flags = [False] * len(contexts)
+    live = Scorer().score(contexts, flags)
+    candidate = Scorer(ruleset={"high_risk_weight": 0, "medium_risk_weight": 0}).score(contexts, flags)
+
+    report = ShadowReport()
+    for i, (a, b) in enumerate(zip(live, candidate)):
+        report.add({"id": str(i), "analyst_threat_type": "Phishing", "final_verdict": None}, a, b)
+    result = report.to_dict(1.0, 1, len(contexts))
+
+    assert result["scored"] == len(TEXTS)
+    assert result["level_changes"] >= 1
+    assert result["mean_score_delta"] < 0
+    assert sum(result["analyst_confusion"]["live"]["Phishing"].values()) == len(TEXTS)
+
+
+def test_archived_incidents_are_replayed():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().db
+    live, archived = ({"_id": n, "narrative": text} for n, text in enumerate(TEXTS[:2]))
+    db.incidents.insert_one(live)
+    db[ARCHIVE_COLLECTION].insert_one(_archive_document(archived, datetime.utcnow()))
+
+    assert shadow_score(db, workers=1)["scored"] == 2
+    assert shadow_score(db, workers=1, include_archive=False)["scored"] == 1
+    assert shadow_score(db, workers=1, limit=1)["scored"] == 1
+
+
+if __name__ == "__main__":
+    test_candidate_ruleset_changes_are_reported()
+    test_archived_incidents_are_replayed()
+    print("Shadow scoring tests passed.")
@@ -0,0 +1,92 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import create_access_token, get_jwt, jwt_required
+from werkzeug.test import Client
+from app.extensions import jwt
+from app.services.token_revocation import RevocationList, revoke_token
+
+
+def _db():
+    mongomock = pytest.importorskip("mongomock")
+    return mongomock.MongoClient().db
+
+
+def _app(revocations):
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-that-is-long-enough-123"
+    jwt.init_app(app)
+    if revocations is not None:
+        app.revocations = revocations
+
+    @app.route("/me")
+    @jwt_required()
+    def me():
+        return jsonify({"ok": True})
+
+    @app.route("/logout", methods=["POST"])
+    @jwt_required()
+    def logout():
+        revoke_token(get_jwt())
+        return jsonify({"ok": True})
+
+    with app.app_context():
+        token = create_access_token("analyst1")
+    return app, {"Authorization": "Bearer " + token}
+
+
+def test_logged_out_token_is_refused():
+    revocations = RevocationList(_db())
+    revocations.sync()
+    app, headers = _app(revocations)
+    client = Client(app)
+
+    assert client.get("/me", headers=headers).status_code == 200
+    assert client.post("/logout", headers=headers).status_code == 200
+    assert client.get("/me", headers=headers).status_code == 401
+
+
+def test_revocations_from_other_workers_arrive_on_sync():
+    db = _db()
+    worker_a, worker_b = RevocationList(db), RevocationList(db)
+    worker_a.sync()
+    worker_b.sync()
+
+    worker_a.revoke("jti-1", datetime.utcnow() + timedelta(hours=1))
+    worker_a.revoke("jti-old", datetime.utcnow() - timedelta(seconds=1))
+    assert not worker_b.is_revoked("jti-1")
+
+    worker_b.sync()
+    assert worker_b.is_revoked("jti-1")
+    assert not worker_b.is_revoked("jti-old")
+
+
+def test_denylist_fails_closed():
+    # Never synced (e.g. MongoDB down at startup): every token is refused
+    revocations = RevocationList(_db())
+    assert revocations.is_revoked("any")
+    assert revocations.stats()["degraded"]
+
+    app, headers = _app(revocations)
+    assert Client(app).get("/me", headers=headers).status_code == 401
+
+    # No denylist at all
+    app, headers = _app(None)
+    assert Client(app).get("/me", headers=headers).status_code == 401
+
+    revocations.sync()
+    assert not revocations.is_revoked("any")
+    assert not revocations.stats()["degraded"]
+
+
+if __name__ == "__main__":
+    test_logged_out_token_is_refused()
+    test_revocations_from_other_workers_arrive_on_sync()
+    test_denylist_fails_closed()
+    print("Token revocation tests passed.")
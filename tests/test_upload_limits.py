@@ -0,0 +1,127 @@
+import sys
+import os
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask, request, jsonify
+from PIL import Image
+from werkzeug.test import Client
+from app.helpers.upload_limits import setup_upload_limits
+from app.utils.error_handler import register_error_handlers
+from app.services import ocr_service
+from app.services.ocr_service import extract_text_from_images, BUDGET_REASON, TOO_LARGE_REASON
+
+KB = 1024
+
+
+def _app():
+    app = Flask(__name__)
+    app.config.update(MAX_CONTENT_LENGTH=300 * KB, UPLOAD_MAX_FILE_MB=0, UPLOAD_SPOOL_KB=16)
+    setup_upload_limits(app)
+    register_error_handlers(app)
+
+    @app.route("/upload", methods=["POST"])
+    def upload():
+        return jsonify([
+            {"size": len(f.read()), "on_disk": f.stream._rolled} for f in request.files.getlist("files")
+        ])
+
+    return app
+
+
+def _post(app, *sizes):
+    files = [(io.BytesIO(b"x" * size), f"f{i}.png") for i, size in enumerate(sizes)]
+    return Client(app).post("/upload", data={"files": files}, content_type="multipart/form-data")
+
+
+def test_small_files_stay_in_memory_and_large_ones_spill_to_disk():
+    response = _post(_app(), 4 * KB, 64 * KB)
+    assert response.status_code == 200
+    assert response.get_json() == [{"size": 4 * KB, "on_disk": False}, {"size": 64 * KB, "on_disk": True}]
+
+
+def test_file_and_request_caps_are_enforced_while_reading():
+    app = _app()
+    app.config["UPLOAD_MAX_FILE_MB"] = 1
+    response = _post(app, 2 * 1024 * KB)
+    assert response.status_code == 413  # whole request over MAX_CONTENT_LENGTH
+
+    app.config["MAX_CONTENT_LENGTH"] = 4 * 1024 * KB
+    response = _post(app, 100 * KB, 1536 * KB)
+    assert response.status_code == 413
+    assert "f1.png" in response.get_json()["message"]
+
+
+def test_file_count_is_capped_while_reading():
+    app = _app()
+    app.config.update(UPLOAD_MAX_FILES=2, UPLOAD_MAX_FILE_MB=1)
+    assert _post(app, KB, KB).status_code == 200
+    response = _post(app, KB, KB, KB)
+    assert response.status_code == 413
+    assert "2 files" in response.get_json()["message"]
+
+
+class Upload:
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.stream = io.BytesIO(data)
+
+
+def test_oversized_image_is_refused_before_decoding():
+    buffer = io.BytesIO()
+    Image.new("L", (4000, 4000), "white").save(buffer, "PNG")  # ~50 KB file, 16 MP
+
+    app = _app()
+    app.config["OCR_MAX_IMAGE_PIXELS"] = 1_000_000
+    with app.app_context():
+        text, results = extract_text_from_images([Upload("bomb.png", buffer.getvalue())])
+    assert text == ""
+    assert results == [{"filename": "bomb.png", "status": "skipped", "reason": TOO_LARGE_REASON}]
+
+
+
+def _png(width, height):
+    buffer = io.BytesIO()
+    Image.new("L", (width, height), "white").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FakeBackend:
+    def recognize(self, image, deadline=None):
+        return f"{image.size[0]}x{image.size[1]}"
+
+
+def test_images_are_decoded_in_their_ocr_job_within_the_report_budget(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-test")
+    monkeypatch.setattr(ocr_service, "_get_runtime", lambda: (executor, FakeBackend(), 2))
+    decoded_on = []
+
+    app = _app()
+    app.config.update(OCR_MAX_IMAGE_PIXELS=1_000_000, OCR_MAX_REPORT_PIXELS=1_000_000, OCR_TILING=False)
+    uploads = [Upload("a.png", _png(600, 800)), Upload("b.png", _png(800, 800)), Upload("c.png", _png(300, 300))]
+    with app.app_context():
+        text, results = extract_text_from_images(
+            uploads, on_decoded=lambda: decoded_on.append(threading.current_thread().name)
+        )
+
+    assert text == "600x800 300x300"
+    assert [r["status"] for r in results] == ["success", "skipped", "success"]
+    assert results[1]["reason"] == BUDGET_REASON
+    # Only the images actually OCR'd were decoded, each on an OCR thread
+    assert len(decoded_on) == 2 and all(name.startswith("ocr-test") for name in decoded_on)
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    import pytest
+    test_small_files_stay_in_memory_and_large_ones_spill_to_disk()
+    test_file_and_request_caps_are_enforced_while_reading()
+    test_file_count_is_capped_while_reading()
+    test_oversized_image_is_refused_before_decoding()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_images_are_decoded_in_their_ocr_job_within_the_report_budget(monkeypatch)
+    print("Upload limit tests passed.")
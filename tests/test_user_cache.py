@@ -0,0 +1,92 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask import Flask
+from app.services.user_cache import UserCache, find_user, invalidate_user
+from app.services.version_service import VersionRegistry, VersionScopes
+
+
+class CountingUsers:
+    """Wraps db.users and counts the lookups that reach Mongo."""
+
+    def __init__(self, users):
+        self.users = users
+        self.queries = 0
+
+    def find_one(self, *args, **kwargs):
+        self.queries += 1
+        return self.users.find_one(*args, **kwargs)
+
+
+class CountingDb:
+    def __init__(self, db):
+        self.users = CountingUsers(db.users)
+
+
+def _app():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient().db
+    db.users.insert_one({"username": "analyst1", "password": "x", "role": "analyst"})
+
+    app = Flask(__name__)
+    app.db = CountingDb(db)
+    app.versions = VersionRegistry(db)
+    app.user_cache = UserCache(app.db, ttl=60)
+    return app, db
+
+
+def test_repeated_lookups_hit_the_cache():
+    app, _ = _app()
+    with app.app_context():
+        for _ in range(3):
+            assert find_user("analyst1")["role"] == "analyst"
+            assert find_user("ghost") is None  # negative entries are cached too
+    assert app.db.users.queries == 2
+    assert app.user_cache.stats()["hits"] == 4
+
+
+def test_register_invalidates_the_negative_entry():
+    app, db = _app()
+    with app.app_context():
+        assert find_user("newuser") is None
+        db.users.insert_one({"username": "newuser", "password": "x", "role": "user"})
+        invalidate_user("newuser")
+        assert find_user("newuser")["role"] == "user"
+
+
+def test_users_version_bump_from_another_worker_invalidates():
+    app, db = _app()
+    with app.app_context():
+        assert find_user("analyst1")["role"] == "analyst"
+        db.users.update_one({"username": "analyst1"}, {"$set": {"role": "admin"}})
+
+        # Another worker bumps the shared counter; this one sees it on its next sync
+        VersionRegistry(db).bump(VersionScopes.USERS)
+        assert find_user("analyst1")["role"] == "analyst"
+        app.versions.sync()
+        assert find_user("analyst1")["role"] == "admin"
+
+
+def test_entries_expire_and_are_bounded():
+    app, _ = _app()
+    app.user_cache = UserCache(app.db, ttl=0, max_entries=2)
+    with app.app_context():
+        find_user("analyst1")
+        find_user("analyst1")
+        assert app.db.users.queries == 2
+
+        for name in ("a", "b", "c"):
+            find_user(name)
+        assert app.user_cache.stats()["entries"] == 2
+
+
+if __name__ == "__main__":
+    test_repeated_lookups_hit_the_cache()
+    test_register_invalidates_the_negative_entry()
+    test_users_version_bump_from_another_worker_invalidates()
+    test_entries_expire_and_are_bounded()
+    print("User cache tests passed.")
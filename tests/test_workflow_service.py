@@ -0,0 +1,128 @@
+import sys
+import os
+
+# Add parent directory to path to allow imports from app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from flask import Flask
+from app.constants.audit_constants import AuditEvents
+from app.constants.incident_constants import IncidentStatus, WORKFLOW_TRANSITIONS
+from app.services.timeline_service import TIMELINE_COLLECTION
+from app.services.work_queue_service import UNCLAIMED
+from app.services.workflow_service import allowed_sources, apply_transition, cascade_review, workflow_status
+
+
+def _app():
+    mongomock = pytest.importorskip("mongomock")
+    app = Flask(__name__)
+    app.db = mongomock.MongoClient().db
+    return app
+
+
+def _transition(app, incident_id, target):
+    with app.app_context():
+        return apply_transition(incident_id, target, "analyst1", f"Moved to {target}", AuditEvents.STATUS_CHANGED)
+
+
+def test_review_can_start_from_open_resolved_or_closed():
+    assert allowed_sources(IncidentStatus.UNDER_REVIEW) == [
+        IncidentStatus.OPEN, IncidentStatus.RESOLVED, IncidentStatus.CLOSED
+    ]
+
+
+def test_under_review_is_not_a_source_of_itself():
+    # A second analyst starting review on the same incident must conflict
+    assert IncidentStatus.UNDER_REVIEW not in allowed_sources(IncidentStatus.UNDER_REVIEW)
+
+
+def test_every_target_is_a_declared_status():
+    for targets in WORKFLOW_TRANSITIONS.values():
+        for target in targets:
+            assert target in WORKFLOW_TRANSITIONS
+
+
+def test_legacy_statuses_map_onto_the_state_machine():
+    assert workflow_status("Under Review") == IncidentStatus.UNDER_REVIEW
+    assert workflow_status("in_progress") == IncidentStatus.UNDER_REVIEW
+    assert workflow_status("pending") == IncidentStatus.OPEN
+    assert workflow_status(None) == IncidentStatus.OPEN
+    assert workflow_status("done?", analyst_reviewed=True) == IncidentStatus.RESOLVED
+
+
+def test_rejected_transition_leaves_no_timeline_bucket():
+    app = _app()
+    closed = app.db.incidents.insert_one({"status": IncidentStatus.CLOSED, "version": 0}).inserted_id
+
+    _, code = _transition(app, closed, IncidentStatus.RESOLVED)
+    assert code == 409
+    _, code = _transition(app, ObjectId(), IncidentStatus.UNDER_REVIEW)
+    assert code == 404
+    assert app.db[TIMELINE_COLLECTION].count_documents({}) == 0
+
+    _, code = _transition(app, closed, IncidentStatus.UNDER_REVIEW)
+    assert code == 200
+    assert app.db[TIMELINE_COLLECTION].count_documents({"incident_id": closed}) == 1
+
+
+def test_timeline_event_is_written_before_the_transition_returns():
+    app = _app()
+    incident_id = app.db.incidents.insert_one({"status": IncidentStatus.OPEN, "version": 0}).inserted_id
+
+    _transition(app, incident_id, IncidentStatus.UNDER_REVIEW)
+    bucket = app.db[TIMELINE_COLLECTION].find_one({"incident_id": incident_id})
+    incident = app.db.incidents.find_one({"_id": incident_id})
+    assert bucket["events"][0]["time"] == incident["last_event"]["time"]
+
+
+def test_reopened_incident_returns_to_the_work_queue():
+    app = _app()
+    incident_id = app.db.incidents.insert_one({
+        "status": IncidentStatus.OPEN, "version": 0, "risk_score": 40,
+        "created_at": datetime(2026, 1, 1), "queue_rank": datetime(2026, 1, 1),
+        "lease_expires_at": datetime(2030, 1, 1), "claimed_by": "analyst2"
+    }).inserted_id
+
+    _transition(app, incident_id, IncidentStatus.UNDER_REVIEW)
+    incident = app.db.incidents.find_one({"_id": incident_id})
+    assert incident["claimed_by"] == "analyst2"  # still in the queue, lease untouched
+
+    _transition(app, incident_id, IncidentStatus.RESOLVED)
+    assert "queue_rank" not in app.db.incidents.find_one({"_id": incident_id})
+
+    _transition(app, incident_id, IncidentStatus.UNDER_REVIEW)
+    incident = app.db.incidents.find_one({"_id": incident_id})
+    assert incident["queue_rank"] < incident["created_at"]
+    assert incident["claimed_by"] is None and incident["lease_expires_at"] == UNCLAIMED
+
+
+def test_review_verdict_cascades_to_unreviewed_duplicates():
+    app = _app()
+    canonical = app.db.incidents.insert_one({"status": IncidentStatus.OPEN, "version": 0}).inserted_id
+    duplicate = {"status": IncidentStatus.OPEN, "version": 0, "analyst_reviewed": False, "canonical_incident_id": canonical}
+    pending = app.db.incidents.insert_one(dict(duplicate)).inserted_id
+    reviewed = app.db.incidents.insert_one(dict(duplicate, analyst_reviewed=True, final_verdict="own")).inserted_id
+
+    verdict = {"analyst_reviewed": True, "final_verdict": "scam"}
+    with app.app_context():
+        assert cascade_review(canonical, IncidentStatus.RESOLVED, verdict, "analyst1") == 1
+
+    incident = app.db.incidents.find_one({"_id": pending})
+    assert incident["status"] == IncidentStatus.RESOLVED and incident["final_verdict"] == "scam"
+    assert incident["version"] == 1
+    assert app.db[TIMELINE_COLLECTION].count_documents({"incident_id": pending}) == 1
+    assert app.db.incidents.find_one({"_id": reviewed})["final_verdict"] == "own"
+
+
+if __name__ == "__main__":
+    test_review_can_start_from_open_resolved_or_closed()
+    test_under_review_is_not_a_source_of_itself()
+    test_every_target_is_a_declared_status()
+    test_legacy_statuses_map_onto_the_state_machine()
+    test_rejected_transition_leaves_no_timeline_bucket()
+    test_timeline_event_is_written_before_the_transition_returns()
+    test_reopened_incident_returns_to_the_work_queue()
+    test_review_verdict_cascades_to_unreviewed_duplicates()
+    print("Workflow state machine checks passed.")